@@ -0,0 +1,203 @@
+"""
+Server-side statistics over ``float8[]`` columns.
+
+Ad-hoc statistics of array columns such as ``DataSet.values`` would
+otherwise need every array shipped to the client. The SQL functions
+defined here reduce an array inside PostgreSQL, so queries only return
+scalars and the planner may evaluate them in parallel workers.
+
+The functions are created with the rest of the schema by
+``LCDBModel.metadata.create_all`` and dropped by ``drop_all``. Existing
+databases can install them with :func:`install_array_functions`.
+
+Like :meth:`~lightcurvedb.models.DataSetStatistics.compute`, every
+statistic except :class:`array_nan_count` ignores NaN, infinite and
+``NULL`` elements.
+
+Examples
+--------
+>>> from lightcurvedb.core.array_functions import array_median, array_mad
+>>> q = sa.select(
+...     DataSet.target_id,
+...     array_median(DataSet.values),
+...     array_mad(DataSet.values),
+... ).where(DataSet.observation_id == obs.id)
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy import event, orm
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.functions import GenericFunction
+
+from lightcurvedb.core.base_model import LCDBModel
+from lightcurvedb.core.types import NumpyArrayType
+
+# PostgreSQL orders NaN above Infinity, so this range excludes NaN as well
+# as both infinities.
+_FINITE = (
+    "SELECT v FROM unnest($1) AS v WHERE v > '-Infinity' AND v < 'Infinity'"
+)
+
+_FUNCTIONS = {
+    "lcdb_array_mean(float8[])": (
+        "float8",
+        f"WITH finite AS ({_FINITE}) SELECT avg(v) FROM finite",
+    ),
+    "lcdb_array_median(float8[])": (
+        "float8",
+        f"WITH finite AS ({_FINITE}) "
+        "SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY v) FROM finite",
+    ),
+    "lcdb_array_mad(float8[])": (
+        "float8",
+        f"WITH finite AS ({_FINITE}), "
+        "center AS ("
+        "SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY v) AS m "
+        "FROM finite) "
+        "SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY abs(v - m)) "
+        "FROM finite, center",
+    ),
+    "lcdb_array_percentile(float8[], float8)": (
+        "float8",
+        f"WITH finite AS ({_FINITE}) "
+        "SELECT percentile_cont($2) WITHIN GROUP (ORDER BY v) FROM finite",
+    ),
+    "lcdb_array_percentiles(float8[], float8[])": (
+        "float8[]",
+        f"WITH finite AS ({_FINITE}) "
+        "SELECT percentile_cont($2) WITHIN GROUP (ORDER BY v) FROM finite",
+    ),
+    "lcdb_array_nan_count(float8[])": (
+        "bigint",
+        "SELECT count(*) FROM unnest($1) AS v WHERE v = 'NaN'",
+    ),
+}
+
+_CREATE = [
+    sa.DDL(
+        f"CREATE OR REPLACE FUNCTION {signature} RETURNS {returns} "
+        f"LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $${body}$$"
+    )
+    for signature, (returns, body) in _FUNCTIONS.items()
+]
+_DROP = [
+    sa.DDL(f"DROP FUNCTION IF EXISTS {signature}") for signature in _FUNCTIONS
+]
+
+for _ddl in _CREATE:
+    event.listen(LCDBModel.metadata, "after_create", _ddl)
+for _ddl in _DROP:
+    event.listen(LCDBModel.metadata, "before_drop", _ddl)
+
+
+def install_array_functions(session: orm.Session) -> None:
+    """
+    Create or replace the array statistics functions.
+
+    Only needed for databases created before these functions existed;
+    ``create_all`` installs them with the schema.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session. The functions are created in its current
+        transaction.
+    """
+    for ddl in _CREATE:
+        session.execute(ddl)
+
+
+class array_mean(GenericFunction):
+    """
+    Mean of the finite elements of a ``float8[]``.
+
+    ``NULL`` if the array has no finite elements.
+    """
+
+    type = sa.Float()
+    name = "lcdb_array_mean"
+    package = "lcdb"
+    identifier = "array_mean"
+    inherit_cache = True
+
+
+class array_median(GenericFunction):
+    """
+    Median of the finite elements of a ``float8[]``.
+
+    ``NULL`` if the array has no finite elements.
+    """
+
+    type = sa.Float()
+    name = "lcdb_array_median"
+    package = "lcdb"
+    identifier = "array_median"
+    inherit_cache = True
+
+
+class array_mad(GenericFunction):
+    """
+    Median absolute deviation from the median of a ``float8[]``.
+
+    Unscaled, matching ``DataSetStatistics.mad``. ``NULL`` if the array
+    has no finite elements.
+    """
+
+    type = sa.Float()
+    name = "lcdb_array_mad"
+    package = "lcdb"
+    identifier = "array_mad"
+    inherit_cache = True
+
+
+class array_percentile(GenericFunction):
+    """
+    Linearly interpolated percentile of the finite elements of a
+    ``float8[]``.
+
+    The second argument is the fraction in ``[0, 1]``, as for
+    PostgreSQL's ``percentile_cont``.
+    """
+
+    type = sa.Float()
+    name = "lcdb_array_percentile"
+    package = "lcdb"
+    identifier = "array_percentile"
+    inherit_cache = True
+
+
+class array_percentiles(GenericFunction):
+    """
+    Several percentiles of the finite elements of a ``float8[]`` at once.
+
+    The array is sorted once for all fractions. Python sequences of
+    fractions are bound as ``float8[]`` and the result is returned as a
+    ``float64`` ndarray.
+    """
+
+    type = NumpyArrayType(sa.Float)
+    name = "lcdb_array_percentiles"
+    package = "lcdb"
+    identifier = "array_percentiles"
+    inherit_cache = True
+
+    def __init__(self, values, fractions, **kwargs):
+        if isinstance(fractions, (Sequence, np.ndarray)):
+            fractions = sa.literal(
+                np.asarray(fractions, dtype=np.float64).tolist(),
+                postgresql.ARRAY(sa.Float),
+            )
+        super().__init__(values, fractions, **kwargs)
+
+
+class array_nan_count(GenericFunction):
+    """Number of NaN elements of a ``float8[]``."""
+
+    type = sa.BigInteger()
+    name = "lcdb_array_nan_count"
+    package = "lcdb"
+    identifier = "array_nan_count"
+    inherit_cache = True
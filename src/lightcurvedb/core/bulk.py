@@ -0,0 +1,228 @@
+"""
+Bulk loading helpers built on PostgreSQL ``COPY``.
+
+The ORM issues one ``INSERT`` parameter set per object, which dominates
+runtime when loading millions of rows. These helpers stream column arrays
+through psycopg's ``COPY`` support into a transaction-local staging table,
+from which a single ``INSERT ... SELECT`` can apply conflict handling.
+"""
+
+import uuid
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+
+import numpy as np
+import sqlalchemy as sa
+from numpy import typing as npt
+from sqlalchemy import orm
+
+
+def _quote(session: orm.Session, identifier: str) -> str:
+    preparer = session.get_bind().dialect.identifier_preparer
+    return preparer.quote(identifier)
+
+
+def copy_columns(
+    session: orm.Session,
+    table: str,
+    columns: Sequence[str],
+    arrays: Sequence[npt.ArrayLike],
+) -> int:
+    """
+    Stream aligned column arrays into a table with ``COPY FROM STDIN``.
+
+    Runs on the session's current connection and transaction, so the
+    rows are visible to subsequent statements in the same session. The
+    session is flushed first so that pending objects referenced by the
+    copied rows exist.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session.
+    table : str
+        Name of the destination table.
+    columns : sequence of str
+        Destination column names, aligned with ``arrays``.
+    arrays : sequence of array-like
+        One array per column, all sharing the same length. Two dimensional
+        arrays are written as one PostgreSQL array per row.
+
+    Returns
+    -------
+    int
+        The number of rows copied.
+
+    Raises
+    ------
+    ValueError
+        If the number of arrays does not match the number of columns, or
+        the arrays differ in length.
+    """
+    if len(columns) != len(arrays):
+        raise ValueError("Expected one array per column")
+    values = [np.asarray(array) for array in arrays]
+    lengths = {len(array) for array in values}
+    if len(lengths) > 1:
+        raise ValueError("Column arrays must share the same length")
+
+    session.flush()
+    column_list = ", ".join(_quote(session, column) for column in columns)
+    statement = f"COPY {_quote(session, table)} ({column_list}) FROM STDIN"
+    # One dimensional columns are converted up front, two dimensional
+    # blocks one row at a time so the whole block is never held as nested
+    # Python floats
+    streams = [array.tolist() if array.ndim < 2 else array for array in values]
+    driver_connection = session.connection().connection.driver_connection
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in zip(*streams):
+                copy.write_row(
+                    [
+                        value.tolist()
+                        if isinstance(value, np.ndarray)
+                        else value
+                        for value in row
+                    ]
+                )
+    return lengths.pop() if lengths else 0
+
+
+@contextmanager
+def staging_table(
+    session: orm.Session, like: str, columns: Sequence[str]
+) -> Generator[str, None, None]:
+    """
+    Create a temporary table shaped like some columns of ``like``.
+
+    The staging table is dropped when the context exits, or at the end of
+    the transaction at the latest.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session.
+    like : str
+        Name of the table whose column types should be mirrored.
+    columns : sequence of str
+        The columns of ``like`` to mirror.
+
+    Yields
+    ------
+    str
+        The name of the staging table.
+    """
+    name = f"lcdb_staging_{uuid.uuid4().hex}"
+    column_list = ", ".join(_quote(session, column) for column in columns)
+    session.execute(
+        sa.text(
+            f"CREATE TEMPORARY TABLE {name} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {_quote(session, like)} "
+            "WITH NO DATA"
+        )
+    )
+    try:
+        yield name
+    finally:
+        session.execute(sa.text(f"DROP TABLE IF EXISTS {name}"))
+
+
+def copy_insert_ignore(
+    session: orm.Session,
+    table: str,
+    columns: Sequence[str],
+    arrays: Sequence[npt.ArrayLike],
+    conflict_target: str = "",
+) -> int:
+    """
+    Bulk insert column arrays, skipping rows which already exist.
+
+    Rows are copied into a staging table and moved into ``table`` with
+    ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``, so duplicates, both
+    against existing rows and within the input, are dropped instead of
+    aborting the transaction.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session.
+    table : str
+        Name of the destination table.
+    columns : sequence of str
+        Destination column names, aligned with ``arrays``.
+    arrays : sequence of array-like
+        One array per column, all sharing the same length.
+    conflict_target : str, optional
+        An explicit conflict target such as ``"(a, b)"``. By default any
+        unique violation is ignored.
+
+    Returns
+    -------
+    int
+        The number of rows actually inserted.
+    """
+    column_list = ", ".join(_quote(session, column) for column in columns)
+    with staging_table(session, table, columns) as staging:
+        copy_columns(session, staging, columns, arrays)
+        result = session.execute(
+            sa.text(
+                f"INSERT INTO {_quote(session, table)} ({column_list}) "
+                f"SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT {conflict_target} DO NOTHING"
+            )
+        )
+    return result.rowcount
+
+
+def copy_upsert(
+    session: orm.Session,
+    table: str,
+    columns: Sequence[str],
+    arrays: Sequence[npt.ArrayLike],
+    conflict_columns: Sequence[str],
+) -> int:
+    """
+    Bulk insert column arrays, overwriting rows which already exist.
+
+    Like :func:`copy_insert_ignore`, but conflicting rows are updated with
+    ``ON CONFLICT (...) DO UPDATE`` so that recomputed values replace the
+    stored ones. The input must not repeat a conflict key.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session.
+    table : str
+        Name of the destination table.
+    columns : sequence of str
+        Destination column names, aligned with ``arrays``.
+    arrays : sequence of array-like
+        One array per column, all sharing the same length.
+    conflict_columns : sequence of str
+        The columns of the unique key identifying existing rows. Every
+        other column is overwritten.
+
+    Returns
+    -------
+    int
+        The number of rows inserted or updated.
+    """
+    column_list = ", ".join(_quote(session, column) for column in columns)
+    conflict_list = ", ".join(
+        _quote(session, column) for column in conflict_columns
+    )
+    assignments = ", ".join(
+        f"{_quote(session, column)} = EXCLUDED.{_quote(session, column)}"
+        for column in columns
+        if column not in conflict_columns
+    )
+    with staging_table(session, table, columns) as staging:
+        copy_columns(session, staging, columns, arrays)
+        result = session.execute(
+            sa.text(
+                f"INSERT INTO {_quote(session, table)} ({column_list}) "
+                f"SELECT {column_list} FROM {staging} "
+                f"ON CONFLICT ({conflict_list}) DO UPDATE SET {assignments}"
+            )
+        )
+    return result.rowcount
@@ -0,0 +1,214 @@
+"""
+Process-wide caching of small reference tables.
+
+Tables such as ``photometric_source`` and ``processing_method`` hold a
+handful of rows which change rarely yet are consulted for every dataset
+ingested. This module keeps an immutable name/id snapshot of each such
+table per database so hot loops can translate between names and ids
+without issuing queries.
+
+Snapshots expire after ``REFERENCE_TABLE_TTL`` seconds and are dropped
+whenever this process flushes a change to a cached table.
+"""
+
+import threading
+from collections.abc import Iterable
+from typing import Any, NamedTuple, Optional
+
+import cachetools
+import numpy as np
+import sqlalchemy as sa
+from numpy import typing as npt
+from sqlalchemy import event, orm
+
+# Seconds a cached snapshot may be served before it is reloaded, bounding
+# staleness from changes made by other processes.
+REFERENCE_TABLE_TTL = 600
+
+_TABLES: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=32, ttl=REFERENCE_TABLE_TTL
+)
+_TABLE_LOCK = threading.RLock()
+_CACHED_MODELS: set[type] = set()
+
+
+class ReferenceRow(NamedTuple):
+    """A single cached reference table row."""
+
+    id: int
+    name: str
+    description: str
+
+
+class ReferenceTable:
+    """
+    An immutable snapshot of a name and description keyed table.
+
+    Parameters
+    ----------
+    rows : iterable of ReferenceRow
+        Every row of the table.
+
+    Notes
+    -----
+    Names are not required to be unique. When several rows share a name
+    the one with the smallest id is reported by :meth:`id_of`.
+    """
+
+    def __init__(self, rows: Iterable[ReferenceRow]):
+        self.rows: dict[int, ReferenceRow] = {row.id: row for row in rows}
+        self.ids_by_name: dict[str, int] = {}
+        for row in sorted(self.rows.values(), reverse=True):
+            self.ids_by_name[row.name] = row.id
+
+    @classmethod
+    def from_session(cls, session: orm.Session, model) -> "ReferenceTable":
+        """Load every row of ``model``'s table visible to ``session``."""
+        rows = session.execute(
+            sa.select(model.id, model.name, model.description)
+        )
+        return cls(ReferenceRow(*row) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, id_: Any) -> bool:
+        return id_ in self.rows
+
+    def id_of(self, name: str) -> int:
+        """
+        Return the id of the row with the given name.
+
+        Raises
+        ------
+        KeyError
+            If no row has this name.
+        """
+        return self.ids_by_name[name]
+
+    def name_of(self, id_: int) -> str:
+        """
+        Return the name of the row with the given id.
+
+        Raises
+        ------
+        KeyError
+            If no row has this id.
+        """
+        return self.rows[id_].name
+
+    def ids_of(self, names: Iterable[str]) -> npt.NDArray[np.int64]:
+        """
+        Map many names to ids.
+
+        Raises
+        ------
+        KeyError
+            If any name is unknown.
+        """
+        return np.array(
+            [self.ids_by_name[name] for name in names], dtype=np.int64
+        )
+
+
+def _database_key(session: orm.Session) -> str:
+    return session.get_bind().url.render_as_string(hide_password=True)
+
+
+def _cache_key(session: orm.Session, model) -> tuple[str, str]:
+    return _database_key(session), model.__tablename__
+
+
+def reference_table(
+    session: orm.Session, model, refresh: bool = False
+) -> ReferenceTable:
+    """
+    Return the cached snapshot of a reference table.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session, used to load the table on a cache miss.
+    model : type
+        A mapped class with ``id``, ``name`` and ``description`` columns,
+        e.g. :class:`~lightcurvedb.models.PhotometricSource`.
+    refresh : bool, optional
+        Force a reload from the database.
+
+    Returns
+    -------
+    ReferenceTable
+        The table snapshot for the session's database.
+    """
+    key = _cache_key(session, model)
+    with _TABLE_LOCK:
+        table: Optional[ReferenceTable] = None if refresh else _TABLES.get(key)
+        if table is None:
+            table = ReferenceTable.from_session(session, model)
+            _TABLES[key] = table
+            _CACHED_MODELS.add(model)
+        return table
+
+
+def reference_id(session: orm.Session, model, name: str) -> int:
+    """
+    Resolve a reference table name to its id.
+
+    Served from the cached snapshot; on a miss the snapshot is reloaded
+    once before giving up, so rows created by other processes are found.
+
+    Raises
+    ------
+    KeyError
+        If no row of ``model`` has this name.
+    """
+    try:
+        return reference_table(session, model).id_of(name)
+    except KeyError:
+        return reference_table(session, model, refresh=True).id_of(name)
+
+
+def invalidate_reference_tables(
+    session: Optional[orm.Session] = None, model=None
+) -> None:
+    """
+    Drop cached reference table snapshots.
+
+    Parameters
+    ----------
+    session : orm.Session, optional
+        Only drop snapshots of this session's database.
+    model : type, optional
+        Only drop snapshots of this model's table.
+    """
+    with _TABLE_LOCK:
+        if session is None and model is None:
+            _TABLES.clear()
+            return
+        url = None if session is None else _database_key(session)
+        tablename = None if model is None else model.__tablename__
+        for key in list(_TABLES):
+            if url in (None, key[0]) and tablename in (None, key[1]):
+                del _TABLES[key]
+
+
+_REFERENCE_CHANGES = "lcdb_reference_changes"
+
+
+@event.listens_for(orm.Session, "after_flush")
+def _invalidate_on_reference_flush(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    models = {type(instance) for instance in changed} & _CACHED_MODELS
+    if models:
+        # Uncommitted rows may be cached before the transaction ends, so
+        # invalidate again once it commits or rolls back.
+        session.info.setdefault(_REFERENCE_CHANGES, set()).update(models)
+        for model in models:
+            invalidate_reference_tables(session, model)
+
+
+@event.listens_for(orm.Session, "after_commit")
+@event.listens_for(orm.Session, "after_rollback")
+def _invalidate_on_transaction_end(session):
+    for model in session.info.pop(_REFERENCE_CHANGES, ()):
+        invalidate_reference_tables(session, model)
@@ -1,3 +1,30 @@
+from lightcurvedb.io.alias_graph import (
+    AliasGraph,
+    alias_graph,
+    invalidate_alias_graph,
+)
 from lightcurvedb.io.pipeline import db_scope
+from lightcurvedb.io.quality_masks import QualityMaskCache
+from lightcurvedb.io.scanner import (
+    ManifestEntry,
+    ScanManifest,
+    scan_directory,
+    scan_for_changes,
+)
+from lightcurvedb.io.target_cache import TargetIdCache
+from lightcurvedb.io.time_conversion import TargetTimeCache, convert_times
 
-__all__ = ["db_scope"]
+__all__ = [
+    "AliasGraph",
+    "alias_graph",
+    "invalidate_alias_graph",
+    "db_scope",
+    "QualityMaskCache",
+    "ManifestEntry",
+    "ScanManifest",
+    "scan_directory",
+    "scan_for_changes",
+    "TargetIdCache",
+    "TargetTimeCache",
+    "convert_times",
+]
@@ -0,0 +1,222 @@
+"""Bulk resolution of alias equivalence classes.
+
+:class:`~lightcurvedb.models.Alias` rows are deliberately non-transitive,
+yet cross-match and deduplication jobs need every target reachable through
+any chain of aliases. Walking ``Target.aliased_targets`` level by level
+costs a query per hop, so this module loads the ``alias`` table once as
+compact edge arrays and labels its connected components with
+``scipy.sparse.csgraph``.
+
+Components are identified by their smallest member target id, which keeps
+labels stable across reloads of an unchanged alias table.
+"""
+
+import threading
+from typing import Optional
+
+import cachetools
+import numpy as np
+import sqlalchemy as sa
+from numpy import typing as npt
+from scipy import sparse
+from scipy.sparse import csgraph
+from sqlalchemy import event, orm
+
+from lightcurvedb.models.target import Alias
+
+# Seconds a cached graph may be served before it is reloaded, bounding
+# staleness from alias changes made by other processes.
+ALIAS_GRAPH_TTL = 600
+
+_GRAPHS: cachetools.TTLCache = cachetools.TTLCache(
+    maxsize=8, ttl=ALIAS_GRAPH_TTL
+)
+_GRAPH_LOCK = threading.RLock()
+
+
+class AliasGraph:
+    """
+    Connected components of the alias relation.
+
+    Parameters
+    ----------
+    target_ids : array-like of int
+        One side of every alias pairing.
+    counterpart_ids : array-like of int
+        The other side of every alias pairing, aligned with
+        ``target_ids``.
+
+    Attributes
+    ----------
+    nodes : ndarray[int64]
+        Sorted ids of every target participating in at least one alias.
+    representatives : ndarray[int64]
+        The component representative (smallest member id) of each node.
+
+    Examples
+    --------
+    >>> graph = AliasGraph([1, 2, 10], [2, 3, 11])
+    >>> graph.component_of([3, 11, 99])
+    array([ 1, 10, 99])
+    """
+
+    def __init__(
+        self, target_ids: npt.ArrayLike, counterpart_ids: npt.ArrayLike
+    ):
+        targets = np.asarray(target_ids, dtype=np.int64)
+        counterparts = np.asarray(counterpart_ids, dtype=np.int64)
+        if targets.shape != counterparts.shape:
+            raise ValueError("Alias edge arrays must be aligned")
+
+        self.nodes = np.unique(np.concatenate([targets, counterparts]))
+        n_nodes = len(self.nodes)
+        rows = np.searchsorted(self.nodes, targets)
+        columns = np.searchsorted(self.nodes, counterparts)
+        adjacency = sparse.coo_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, columns)),
+            shape=(n_nodes, n_nodes),
+        )
+        n_components, labels = csgraph.connected_components(
+            adjacency, directed=False
+        )
+
+        # Label each component by its smallest member id
+        minimums = np.full(n_components, np.iinfo(np.int64).max)
+        np.minimum.at(minimums, labels, self.nodes)
+        self.representatives = minimums[labels]
+        self.n_components = n_components
+
+    @classmethod
+    def from_session(cls, session: orm.Session) -> "AliasGraph":
+        """Load every alias pairing visible to ``session``."""
+        rows = session.execute(
+            sa.select(Alias.target_id, Alias.counterpart_id)
+        ).all()
+        edges = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return cls(edges[:, 0], edges[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def component_of(self, target_ids: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """
+        Map target ids to the representative of their alias component.
+
+        Parameters
+        ----------
+        target_ids : array-like of int
+            Target ids to resolve.
+
+        Returns
+        -------
+        ndarray[int64]
+            The smallest target id reachable from each input through any
+            chain of aliases. Targets without aliases map to themselves.
+        """
+        ids = np.asarray(target_ids, dtype=np.int64)
+        if len(self.nodes) == 0:
+            return ids.copy()
+        positions = np.searchsorted(self.nodes, ids)
+        positions = np.minimum(positions, len(self.nodes) - 1)
+        found = self.nodes[positions] == ids
+        return np.where(found, self.representatives[positions], ids)
+
+    def members(self, target_id: int) -> npt.NDArray[np.int64]:
+        """
+        Return every target id in the same alias component as
+        ``target_id``, including itself.
+        """
+        (representative,) = self.component_of([target_id])
+        members = self.nodes[self.representatives == representative]
+        if len(members) == 0:
+            return np.array([target_id], dtype=np.int64)
+        return members
+
+
+def _cache_key(session: orm.Session) -> str:
+    return session.get_bind().url.render_as_string(hide_password=True)
+
+
+def alias_graph(session: orm.Session, refresh: bool = False) -> AliasGraph:
+    """
+    Return the cached :class:`AliasGraph` for the session's database.
+
+    Graphs are cached per database for up to ``ALIAS_GRAPH_TTL`` seconds
+    and dropped whenever this process flushes a change to an ``Alias`` or
+    executes an ORM-enabled insert, update or delete against it. Changes
+    made elsewhere, including cascades from deleted targets, are picked up
+    once the TTL lapses or after :func:`invalidate_alias_graph`.
+
+    Parameters
+    ----------
+    session : orm.Session
+        Active database session, used to load the graph on a cache miss.
+    refresh : bool, optional
+        Force a reload from the database.
+
+    Returns
+    -------
+    AliasGraph
+        The alias components for the session's database.
+    """
+    key = _cache_key(session)
+    with _GRAPH_LOCK:
+        graph: Optional[AliasGraph] = None if refresh else _GRAPHS.get(key)
+        if graph is None:
+            graph = AliasGraph.from_session(session)
+            _GRAPHS[key] = graph
+        return graph
+
+
+def invalidate_alias_graph(session: Optional[orm.Session] = None) -> None:
+    """
+    Drop cached alias graphs.
+
+    Parameters
+    ----------
+    session : orm.Session, optional
+        Only drop the graph for this session's database. By default all
+        cached graphs are dropped.
+    """
+    with _GRAPH_LOCK:
+        if session is None:
+            _GRAPHS.clear()
+        else:
+            _GRAPHS.pop(_cache_key(session), None)
+
+
+_ALIAS_CHANGES = "lcdb_alias_changes"
+
+
+def _mark_alias_change(session: orm.Session) -> None:
+    # Uncommitted aliases may be loaded into a graph before the
+    # transaction ends, so invalidate again once it commits or rolls back.
+    session.info[_ALIAS_CHANGES] = True
+    invalidate_alias_graph(session)
+
+
+@event.listens_for(orm.Session, "after_flush")
+def _invalidate_on_alias_flush(session, flush_context):
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(instance, Alias) for instance in changed):
+        _mark_alias_change(session)
+
+
+@event.listens_for(orm.Session, "do_orm_execute")
+def _invalidate_on_alias_statement(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    # Core DML against the table has no bind mapper
+    table = getattr(orm_execute_state.statement, "table", None)
+    if (mapper is not None and mapper.class_ is Alias) or (
+        table is Alias.__table__
+    ):
+        _mark_alias_change(orm_execute_state.session)
+
+
+@event.listens_for(orm.Session, "after_commit")
+@event.listens_for(orm.Session, "after_rollback")
+def _invalidate_on_transaction_end(session):
+    if session.info.pop(_ALIAS_CHANGES, False):
+        invalidate_alias_graph(session)
@@ -0,0 +1,195 @@
+"""
+Materialized effective quality masks.
+
+The effective mask of a target is the OR of the observation-wide flag
+arrays and its own target-specific arrays. Sector-wide masking needs these
+for every target of an observation, so they are built once per
+observation as an ``(n_targets, n_cadences)`` matrix by
+:meth:`~lightcurvedb.models.QualityFlagArray.effective_masks` and served
+from memory afterwards.
+"""
+
+import threading
+import weakref
+from collections.abc import Iterable
+from typing import NamedTuple, Optional
+
+import cachetools
+import numpy as np
+import sqlalchemy as sa
+from numpy import typing as npt
+from sqlalchemy import event, orm
+
+from lightcurvedb.models.quality_flag import QualityFlagArray
+
+
+class _ObservationMasks(NamedTuple):
+    target_ids: npt.NDArray[np.int64]
+    masks: npt.NDArray[np.int32]
+    base: npt.NDArray[np.int32]
+
+
+class QualityMaskCache:
+    """
+    An LRU cache of effective quality masks per observation.
+
+    Each entry holds the masks of every target with flags of its own and
+    the observation-wide mask used for all other targets. Returned arrays
+    are read-only.
+
+    Flag arrays flushed or changed with ORM statements in any session
+    invalidate the observations they belong to in every cache. Changes
+    made by raw SQL or other processes are only noticed after
+    :meth:`invalidate`.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of observations to keep. Defaults to 64.
+
+    Examples
+    --------
+    >>> cache = QualityMaskCache()
+    >>> ids, masks = cache.get(session, obs.id, target_ids)
+    >>> good = (masks & bad_bits) == 0
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self._observations: cachetools.LRUCache = cachetools.LRUCache(maxsize)
+        self._lock = threading.RLock()
+        _CACHES.add(self)
+
+    def __len__(self) -> int:
+        return len(self._observations)
+
+    def get(
+        self,
+        session: orm.Session,
+        observation_id: int,
+        target_ids: Optional[npt.ArrayLike] = None,
+        types: Optional[Iterable[str]] = None,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int32]]:
+        """
+        Return effective masks for targets of an observation.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session, used on a cache miss.
+        observation_id : int
+            The observation to mask.
+        target_ids : array-like of int, optional
+            Targets to return masks for. By default every target with
+            target-specific flags.
+        types : iterable of str, optional
+            Only combine flag arrays of these polymorphic types.
+
+        Returns
+        -------
+        target_ids : ndarray[int64]
+            The targets, in ascending order.
+        masks : ndarray[int32]
+            Effective flag words of shape ``(len(target_ids), n_cadences)``.
+        """
+        key = (
+            int(observation_id),
+            None if types is None else frozenset(types),
+        )
+        with self._lock:
+            entry = self._observations.get(key)
+        if entry is None:
+            entry = self._load(session, *key)
+            with self._lock:
+                self._observations[key] = entry
+
+        if target_ids is None:
+            return entry.target_ids, entry.masks
+
+        # Targets without flags of their own share the base row
+        ids = np.unique(np.asarray(target_ids, dtype=np.int64))
+        masks = np.broadcast_to(entry.base, (len(ids), len(entry.base)))
+        found = np.isin(ids, entry.target_ids)
+        if found.any():
+            masks = masks.copy()
+            rows = np.searchsorted(entry.target_ids, ids[found])
+            masks[found] = entry.masks[rows]
+            masks.flags.writeable = False
+        return ids, masks
+
+    def invalidate(self, observation_id: Optional[int] = None) -> None:
+        """
+        Drop cached masks.
+
+        Parameters
+        ----------
+        observation_id : int, optional
+            Only drop masks of this observation. By default the whole
+            cache is cleared.
+        """
+        with self._lock:
+            if observation_id is None:
+                self._observations.clear()
+                return
+            stale = [
+                key for key in self._observations if key[0] == observation_id
+            ]
+            for key in stale:
+                del self._observations[key]
+
+    @staticmethod
+    def _load(session, observation_id, types) -> _ObservationMasks:
+        ids, masks, base = QualityFlagArray._combine_flags(
+            session, observation_id, None, types
+        )
+        masks.flags.writeable = False
+        base.flags.writeable = False
+        return _ObservationMasks(ids, masks, base)
+
+
+_CACHES: "weakref.WeakSet[QualityMaskCache]" = weakref.WeakSet()
+_FLAG_CHANGES = "lcdb_quality_flag_changes"
+
+
+def _invalidate_caches(observation_ids: Iterable[Optional[int]]) -> None:
+    # None stands for an unknown observation and clears whole caches
+    for cache in list(_CACHES):
+        for observation_id in observation_ids:
+            cache.invalidate(observation_id)
+
+
+def _mark_flag_changes(
+    session: orm.Session, observation_ids: set[Optional[int]]
+) -> None:
+    # Uncommitted flags may be cached before the transaction ends, so
+    # invalidate again once it commits or rolls back.
+    session.info.setdefault(_FLAG_CHANGES, set()).update(observation_ids)
+    _invalidate_caches(observation_ids)
+
+
+@event.listens_for(orm.Session, "after_flush")
+def _invalidate_on_flag_flush(session, flush_context):
+    changed = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, QualityFlagArray):
+            state = sa.inspect(instance)
+            changed.add(state.dict.get("observation_id"))
+            changed.update(state.attrs.observation_id.history.deleted)
+    if changed:
+        _mark_flag_changes(session, changed)
+
+
+@event.listens_for(orm.Session, "do_orm_execute")
+def _invalidate_on_flag_statement(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, QualityFlagArray):
+        _mark_flag_changes(orm_execute_state.session, {None})
+
+
+@event.listens_for(orm.Session, "after_commit")
+@event.listens_for(orm.Session, "after_rollback")
+def _invalidate_on_transaction_end(session):
+    changed = session.info.pop(_FLAG_CHANGES, None)
+    if changed:
+        _invalidate_caches(changed)
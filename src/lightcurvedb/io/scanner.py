@@ -0,0 +1,306 @@
+"""Incremental scanning of PDO directory trees.
+
+This module walks PDO trees with ``os.scandir`` across a thread pool,
+interprets every matching file with the registered path contexts and keeps
+a persistent manifest of what has been seen. Re-running a scan against the
+manifest yields only the files which are new or have changed since, so
+repeated ingests no longer pay for a full tree walk through Python.
+"""
+
+import json
+import os
+import pathlib
+import sqlite3
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple, Optional
+
+from lightcurvedb.util.contexts import compiled_extractor
+
+
+class ManifestEntry(NamedTuple):
+    """A single scanned file and its interpreted path context."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    context: dict[str, str]
+
+
+def _normalize(root: os.PathLike | str) -> str:
+    return os.path.abspath(os.path.expanduser(os.fspath(root)))
+
+
+def _scan_one(directory: str, suffix: str):
+    """
+    List a single directory, returning matching files, subdirectories and
+    the error which interrupted the listing, if any.
+    """
+    files, subdirectories = [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.name.endswith(suffix) and entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+    except OSError as error:
+        # Directories may vanish or be unreadable mid-walk, skip them
+        return files, subdirectories, error
+    return files, subdirectories, None
+
+
+def scan_directory(
+    root: os.PathLike | str,
+    suffix: str = ".h5",
+    max_workers: Optional[int] = None,
+    onerror: Optional[Callable[[OSError], None]] = None,
+) -> Generator[ManifestEntry, None, None]:
+    """
+    Walk a directory tree in parallel yielding files with a given suffix.
+
+    Each directory is listed with ``os.scandir`` on a worker thread and
+    subdirectories are submitted as they are discovered, so listing is
+    bound by filesystem latency rather than by a serial walk. Symbolic
+    links to directories are not followed.
+
+    Parameters
+    ----------
+    root : path-like
+        The top of the tree to scan.
+    suffix : str, optional
+        Only files whose name ends with this suffix are yielded.
+        Defaults to ``".h5"``.
+    max_workers : int, optional
+        Number of listing threads, defaults to the ``ThreadPoolExecutor``
+        default.
+    onerror : callable, optional
+        Called with the ``OSError`` of every directory, including
+        ``root``, which could not be listed. Such directories are skipped
+        either way, as with :func:`os.walk`.
+
+    Yields
+    ------
+    ManifestEntry
+        Every matching file with its size, modification time and the
+        context parsed by the compiled path context extractor. Paths are
+        absolute. Ordering is not guaranteed.
+    """
+    extractor = compiled_extractor()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_one, _normalize(root), suffix)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories, error = future.result()
+                if error is not None and onerror is not None:
+                    onerror(error)
+                for subdirectory in subdirectories:
+                    pending.add(
+                        executor.submit(_scan_one, subdirectory, suffix)
+                    )
+                for path, size, mtime_ns in files:
+                    yield ManifestEntry(
+                        path, size, mtime_ns, extractor.extract(path)
+                    )
+
+
+class ScanManifest:
+    """
+    A persistent record of previously scanned files.
+
+    The manifest is a SQLite database keyed by file path storing the size,
+    modification time and parsed context of every recorded file. A file
+    is considered changed if either its size or modification time differs
+    from the recorded values.
+
+    Parameters
+    ----------
+    path : path-like
+        Location of the manifest database. Created if it does not exist.
+
+    Examples
+    --------
+    >>> with ScanManifest("~/.cache/lcdb/pdo.manifest") as manifest:
+    ...     for entry in scan_for_changes("/pdo/orbit-9", manifest):
+    ...         ingest(entry.path)
+    """
+
+    def __init__(self, path: os.PathLike | str):
+        self.path = pathlib.Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "context TEXT NOT NULL)"
+        )
+        self._connection.commit()
+
+    def __enter__(self) -> "ScanManifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute(
+            "SELECT count(*) FROM manifest"
+        ).fetchone()
+        return count
+
+    def __contains__(self, path) -> bool:
+        row = self._connection.execute(
+            "SELECT 1 FROM manifest WHERE path = ?", (os.fspath(path),)
+        ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    def get(self, path: os.PathLike | str) -> Optional[ManifestEntry]:
+        """Return the recorded entry for ``path`` or None if unrecorded."""
+        row = self._connection.execute(
+            "SELECT path, size, mtime_ns, context FROM manifest "
+            "WHERE path = ?",
+            (os.fspath(path),),
+        ).fetchone()
+        if row is None:
+            return None
+        path, size, mtime_ns, context = row
+        return ManifestEntry(path, size, mtime_ns, json.loads(context))
+
+    def signatures(self) -> dict[str, tuple[int, int]]:
+        """Load ``{path: (size, mtime_ns)}`` for every recorded file."""
+        rows = self._connection.execute(
+            "SELECT path, size, mtime_ns FROM manifest"
+        )
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def diff(
+        self, entries: Iterable[ManifestEntry]
+    ) -> Generator[ManifestEntry, None, None]:
+        """
+        Yield entries which are new or changed relative to the manifest.
+
+        The recorded signatures are loaded once up front so diffing costs
+        a dictionary lookup per entry.
+        """
+        recorded = self.signatures()
+        for entry in entries:
+            if recorded.get(entry.path) != (entry.size, entry.mtime_ns):
+                yield entry
+
+    def update(self, entries: Iterable[ManifestEntry]) -> int:
+        """
+        Record the given entries, replacing any previous records.
+
+        Returns
+        -------
+        int
+            The number of entries recorded.
+        """
+        rows = [
+            (entry.path, entry.size, entry.mtime_ns, json.dumps(entry.context))
+            for entry in entries
+        ]
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO manifest "
+                "(path, size, mtime_ns, context) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def forget(self, paths: Iterable[os.PathLike | str]) -> None:
+        """Remove the given paths so they are reported on the next scan."""
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM manifest WHERE path = ?",
+                ((os.fspath(path),) for path in paths),
+            )
+
+
+def scan_for_changes(
+    root: os.PathLike | str,
+    manifest: ScanManifest,
+    suffix: str = ".h5",
+    max_workers: Optional[int] = None,
+    record: bool = True,
+    batchsize: int = 10000,
+) -> Generator[ManifestEntry, None, None]:
+    """
+    Scan a PDO tree, yielding only files new or changed since last scan.
+
+    Parameters
+    ----------
+    root : path-like
+        The top of the tree to scan.
+    manifest : ScanManifest
+        The manifest to diff against.
+    suffix : str, optional
+        Only files whose name ends with this suffix are considered.
+        Defaults to ``".h5"``.
+    max_workers : int, optional
+        Number of listing threads.
+    record : bool, optional
+        If True (default), yielded entries are written to the manifest in
+        batches of ``batchsize`` once the consumer has moved past them,
+        and files recorded under ``root`` which the completed walk did not
+        find are forgotten. Entries already moved past are also recorded
+        if the consumer stops early, the entry in hand when it stopped is
+        not. Set to False to defer recording, e.g. until an ingest has
+        committed, and call :meth:`ScanManifest.update` and
+        :meth:`ScanManifest.forget` explicitly.
+    batchsize : int, optional
+        Number of consumed entries to buffer between manifest writes.
+
+    Yields
+    ------
+    ManifestEntry
+        Files not present in, or differing from, the manifest.
+
+    Notes
+    -----
+    Directories which cannot be listed are skipped. If any directory,
+    including ``root`` itself, could not be listed, nothing is forgotten,
+    so a missing or unmounted tree never empties the manifest.
+    """
+    root = _normalize(root)
+    if not record:
+        yield from manifest.diff(scan_directory(root, suffix, max_workers))
+        return
+
+    seen, errors = set(), []
+
+    def walk():
+        for entry in scan_directory(
+            root, suffix, max_workers, onerror=errors.append
+        ):
+            seen.add(entry.path)
+            yield entry
+
+    consumed = []
+    try:
+        for entry in manifest.diff(walk()):
+            yield entry
+            consumed.append(entry)
+            if len(consumed) >= batchsize:
+                manifest.update(consumed)
+                consumed = []
+    finally:
+        manifest.update(consumed)
+
+    # Only a completed, error free walk has seen every remaining file
+    if errors:
+        return
+    prefix = os.path.join(root, "")
+    manifest.forget(
+        path
+        for path in manifest.signatures()
+        if path.startswith(prefix) and path not in seen
+    )
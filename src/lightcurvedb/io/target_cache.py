@@ -0,0 +1,209 @@
+"""Catalog-scoped resolution of target names to target ids.
+
+Pipelines usually begin by mapping catalog identifiers (e.g. TIC ids,
+``Target.name``) to ``Target.id`` within a
+:class:`~lightcurvedb.models.MissionCatalog`. Doing so one row at a time
+costs a round trip per target. :class:`TargetIdCache` resolves whole arrays
+of names at once, either against a fully preloaded catalog held as sorted
+NumPy arrays or against an LRU cache backed by a single batched query for
+any names it has not seen.
+"""
+
+import threading
+from itertools import repeat
+from typing import Optional, Union
+
+import cachetools
+import numpy as np
+import sqlalchemy as sa
+from numpy import typing as npt
+from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
+
+from lightcurvedb.models.target import MissionCatalog, Target
+
+CatalogLike = Union[MissionCatalog, int]
+
+
+def _catalog_id(catalog: CatalogLike) -> int:
+    return catalog.id if isinstance(catalog, MissionCatalog) else int(catalog)
+
+
+def _lookup(
+    sorted_names: npt.NDArray[np.int64],
+    sorted_ids: npt.NDArray[np.int64],
+    names: npt.NDArray[np.int64],
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.int64]]:
+    """
+    Find ``names`` within a sorted name array.
+
+    Returns a mask of the names found and the ids of those names.
+    """
+    if len(sorted_names) == 0:
+        return np.zeros(len(names), dtype=bool), np.empty(0, dtype=np.int64)
+    positions = np.searchsorted(sorted_names, names)
+    positions = np.minimum(positions, len(sorted_names) - 1)
+    found = sorted_names[positions] == names
+    return found, sorted_ids[positions[found]]
+
+
+class TargetIdCache:
+    """
+    An in-process cache mapping ``(catalog, Target.name)`` to ``Target.id``.
+
+    Catalogs may be preloaded in full with :meth:`preload`, after which
+    resolution is a vectorized ``searchsorted`` over sorted arrays. Names
+    from catalogs which are not preloaded are kept in an LRU cache of
+    bounded size. Names missing from both are fetched from the database
+    with one query per :meth:`resolve` call and then cached.
+
+    A cache is tied to the database it was filled from. Targets created
+    after a name was found missing are picked up on the next lookup, but
+    deleted or renamed targets are only noticed after :meth:`invalidate`.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of individually cached names across all catalogs
+        which are not preloaded. Defaults to 1,000,000.
+
+    Examples
+    --------
+    >>> cache = TargetIdCache()
+    >>> cache.preload(session, tic_catalog)
+    >>> ids = cache.resolve(session, tic_catalog, tic_ids)
+    """
+
+    def __init__(self, maxsize: int = 1_000_000):
+        self._catalogs: dict[
+            int, tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]
+        ] = {}
+        self._names: cachetools.LRUCache = cachetools.LRUCache(maxsize)
+        self._lock = threading.RLock()
+
+    def __contains__(self, catalog: CatalogLike) -> bool:
+        """Whether the catalog has been preloaded."""
+        return _catalog_id(catalog) in self._catalogs
+
+    def preload(self, session: orm.Session, catalog: CatalogLike) -> int:
+        """
+        Load every target name and id of a catalog into sorted arrays.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        catalog : MissionCatalog or int
+            The catalog, or its id, to load.
+
+        Returns
+        -------
+        int
+            The number of targets loaded.
+        """
+        catalog_id = _catalog_id(catalog)
+        rows = session.execute(
+            sa.select(Target.name, Target.id)
+            .where(Target.catalog_id == catalog_id)
+            .order_by(Target.name)
+        ).all()
+        pairs = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        with self._lock:
+            self._catalogs[catalog_id] = (
+                np.ascontiguousarray(pairs[:, 0]),
+                np.ascontiguousarray(pairs[:, 1]),
+            )
+        return len(pairs)
+
+    def resolve(
+        self,
+        session: Optional[orm.Session],
+        catalog: CatalogLike,
+        names: npt.ArrayLike,
+        missing: int = -1,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Map target names within a catalog to target ids.
+
+        Parameters
+        ----------
+        session : orm.Session or None
+            Session used to fetch names absent from the cache. If None,
+            only cached names are resolved.
+        catalog : MissionCatalog or int
+            The catalog, or its id, the names belong to.
+        names : array-like of int
+            Catalog identifiers to resolve.
+        missing : int, optional
+            Id reported for names which do not exist. Defaults to -1.
+
+        Returns
+        -------
+        ndarray[int64]
+            Target ids aligned with ``names``.
+        """
+        catalog_id = _catalog_id(catalog)
+        names = np.asarray(names, dtype=np.int64)
+        ids = np.full(len(names), missing, dtype=np.int64)
+        unresolved = np.ones(len(names), dtype=bool)
+
+        with self._lock:
+            preloaded = self._catalogs.get(catalog_id)
+            if preloaded is not None:
+                found, found_ids = _lookup(*preloaded, names)
+                ids[found] = found_ids
+                unresolved &= ~found
+            else:
+                for i in np.flatnonzero(unresolved):
+                    target_id = self._names.get((catalog_id, int(names[i])))
+                    if target_id is not None:
+                        ids[i] = target_id
+                        unresolved[i] = False
+
+        if session is None or not unresolved.any():
+            return ids
+
+        queried = np.unique(names[unresolved])
+        rows = session.execute(
+            sa.select(Target.name, Target.id)
+            .where(
+                Target.catalog_id == catalog_id,
+                Target.name
+                == sa.any_(
+                    sa.literal(
+                        queried.tolist(), postgresql.ARRAY(sa.BigInteger)
+                    )
+                ),
+            )
+            .order_by(Target.name)
+        ).all()
+        fetched = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        found, found_ids = _lookup(fetched[:, 0], fetched[:, 1], names)
+        fill = unresolved & found
+        ids[fill] = found_ids[unresolved[found]]
+
+        if preloaded is None:
+            keys = zip(repeat(catalog_id), fetched[:, 0].tolist())
+            with self._lock:
+                self._names.update(zip(keys, fetched[:, 1].tolist()))
+        return ids
+
+    def invalidate(self, catalog: Optional[CatalogLike] = None) -> None:
+        """
+        Drop cached names.
+
+        Parameters
+        ----------
+        catalog : MissionCatalog or int, optional
+            Only drop names of this catalog. By default the whole cache is
+            cleared.
+        """
+        with self._lock:
+            if catalog is None:
+                self._catalogs.clear()
+                self._names.clear()
+                return
+            catalog_id = _catalog_id(catalog)
+            self._catalogs.pop(catalog_id, None)
+            for key in [key for key in self._names if key[0] == catalog_id]:
+                del self._names[key]
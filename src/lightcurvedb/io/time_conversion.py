@@ -0,0 +1,231 @@
+"""Vectorized conversion of stored timestamps between time scales.
+
+Constructing an astropy ``Time`` carries a fixed overhead which dominates
+when thousands of short lightcurves are converted one at a time. The
+helpers here convert whole arrays, or 2D batches of equal length series,
+with a single ``Time`` construction and cache converted
+``TargetSpecificTime`` series per ``(observation_id, target_id)``.
+"""
+
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Optional
+
+import cachetools
+import numpy as np
+import sqlalchemy as sa
+from astropy import time
+from numpy import typing as npt
+from sqlalchemy import orm
+
+from lightcurvedb.models.observation import (
+    TargetSpecificTime,
+    TargetTimeBasis,
+)
+from lightcurvedb.models.target import Mission
+
+TimeKey = tuple[int, int]
+
+
+def convert_times(
+    values: npt.ArrayLike,
+    mission: Optional[Mission] = None,
+    scale: str = "utc",
+    format: str = "jd",
+) -> npt.NDArray[np.float64]:
+    """
+    Convert an array or 2D batch of timestamps with one ``Time`` object.
+
+    Parameters
+    ----------
+    values : array-like of float
+        Timestamps of any shape, e.g. ``(n_targets, n_cadences)``. These
+        are mission timestamps if ``mission`` is given and barycentric
+        Julian dates (``jd`` in the ``tdb`` scale) otherwise.
+    mission : Mission, optional
+        Interpret ``values`` in this mission's registered time format.
+    scale : str, optional
+        Output time scale, defaults to ``"utc"``.
+    format : str, optional
+        Output time format, defaults to ``"jd"``. Registered mission
+        formats may be used, e.g. ``mission.time_format_name``.
+
+    Returns
+    -------
+    ndarray[float64]
+        The converted timestamps, shaped like ``values``.
+    """
+    if mission is not None:
+        times = mission.to_time(values)
+    else:
+        times = time.Time(
+            np.asarray(values, dtype=np.float64),
+            format="jd",
+            scale="tdb",
+            copy=False,
+        )
+    converted = getattr(times, scale).to_value(format)
+    return np.asarray(converted, dtype=np.float64)
+
+
+class TargetTimeCache:
+    """
+    An LRU cache of converted ``TargetSpecificTime`` series.
+
+    Series are keyed by ``(observation_id, target_id)`` together with the
+    requested output scale and format. Misses are loaded with a single
+    query, compressed rows are reconstructed with one matrix product per
+    observation, and series of equal length are converted with one
+    ``Time`` construction. Cached arrays are read-only.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of converted series to keep. Defaults to 4096.
+
+    Examples
+    --------
+    >>> cache = TargetTimeCache()
+    >>> utc = cache.get(session, [(obs.id, t.id) for t in targets])
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self._series: cachetools.LRUCache = cachetools.LRUCache(maxsize)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def get(
+        self,
+        session: orm.Session,
+        keys: Iterable[TimeKey],
+        scale: str = "utc",
+        format: str = "jd",
+    ) -> dict[TimeKey, npt.NDArray[np.float64]]:
+        """
+        Return converted barycentric times for many target observations.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session, used to load series on a cache miss.
+        keys : iterable of (int, int)
+            ``(observation_id, target_id)`` pairs to convert.
+        scale : str, optional
+            Output time scale, defaults to ``"utc"``.
+        format : str, optional
+            Output time format, defaults to ``"jd"``.
+
+        Returns
+        -------
+        dict[(int, int), ndarray[float64]]
+            Converted series keyed by ``(observation_id, target_id)``.
+            Keys without a stored ``TargetSpecificTime`` are omitted.
+
+        Raises
+        ------
+        ValueError
+            If a compressed series belongs to an observation without a
+            ``TargetTimeBasis``.
+        """
+        keys = list(dict.fromkeys((int(o), int(t)) for o, t in keys))
+        result, misses = {}, []
+        with self._lock:
+            for key in keys:
+                series = self._series.get((*key, scale, format))
+                if series is None:
+                    misses.append(key)
+                else:
+                    result[key] = series
+        if not misses:
+            return result
+
+        rows = session.execute(
+            sa.select(
+                TargetSpecificTime.observation_id,
+                TargetSpecificTime.target_id,
+                TargetSpecificTime.barycentric_julian_dates,
+                TargetSpecificTime.time_coefficients,
+                TargetSpecificTime.time_residuals,
+            ).where(
+                sa.tuple_(
+                    TargetSpecificTime.observation_id,
+                    TargetSpecificTime.target_id,
+                ).in_(misses)
+            )
+        ).all()
+
+        stored, compressed = [], defaultdict(list)
+        for observation_id, target_id, dates, coefficients, residuals in rows:
+            key = (observation_id, target_id)
+            if dates is None:
+                compressed[observation_id].append(
+                    (key, coefficients, residuals)
+                )
+            else:
+                stored.append((key, dates))
+        if compressed:
+            bases = session.scalars(
+                sa.select(TargetTimeBasis).where(
+                    TargetTimeBasis.observation_id.in_(list(compressed))
+                )
+            )
+            missing = set(compressed)
+            for basis in bases:
+                missing.discard(basis.observation_id)
+                group = compressed[basis.observation_id]
+                dates = basis.reconstruct(
+                    np.stack([coefficients for _, coefficients, _ in group])
+                )
+                for (key, _, residuals), row in zip(group, dates):
+                    if residuals is not None:
+                        row += residuals
+                    stored.append((key, row))
+            if missing:
+                raise ValueError(
+                    f"Observations {sorted(missing)} have compressed target "
+                    "times but no time basis"
+                )
+
+        by_length = defaultdict(list)
+        for key, dates in stored:
+            by_length[len(dates)].append((key, dates))
+
+        converted = {}
+        for group in by_length.values():
+            batch = convert_times(
+                np.stack([dates for _, dates in group]),
+                scale=scale,
+                format=format,
+            )
+            # Copy each row so an evicted series does not pin its batch
+            for (key, _), series in zip(group, batch):
+                series = series.copy()
+                series.flags.writeable = False
+                converted[key] = series
+
+        with self._lock:
+            for key, series in converted.items():
+                self._series[(*key, scale, format)] = series
+        result.update(converted)
+        return result
+
+    def invalidate(self, observation_id: Optional[int] = None) -> None:
+        """
+        Drop cached series.
+
+        Parameters
+        ----------
+        observation_id : int, optional
+            Only drop series of this observation. By default the whole
+            cache is cleared.
+        """
+        with self._lock:
+            if observation_id is None:
+                self._series.clear()
+                return
+            stale = [key for key in self._series if key[0] == observation_id]
+            for key in stale:
+                del self._series[key]
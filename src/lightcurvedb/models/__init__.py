@@ -1,12 +1,20 @@
+from lightcurvedb.core import array_functions  # noqa: F401 (schema DDL)
+
 from .dataset import (
     DataSet,
     DataSetHierarchy,
+    DataSetStatistics,
     PhotometricSource,
     ProcessingMethod,
 )
 from .frame import FITSFrame
 from .instrument import Instrument
-from .observation import Observation, TargetSpecificTime
+from .observation import (
+    CadenceGrid,
+    Observation,
+    TargetSpecificTime,
+    TargetTimeBasis,
+)
 from .quality_flag import QualityFlagArray
 from .target import Alias, Mission, MissionCatalog, Target
 
@@ -16,14 +24,17 @@ __all__ = [
     "PhotometricSource",
     "ProcessingMethod",
     "Observation",
+    "CadenceGrid",
     "Alias",
     "Mission",
     "MissionCatalog",
     "Target",
     "TargetSpecificTime",
+    "TargetTimeBasis",
     "DataSet",
     "QualityFlagArray",
     "DataSetHierarchy",
+    "DataSetStatistics",
 ]
 
 DEFINED_MODELS = __all__
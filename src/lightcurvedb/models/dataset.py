@@ -1,18 +1,65 @@
 import typing
+import warnings
 from typing import TYPE_CHECKING, ClassVar
 
 import numpy as np
 import sqlalchemy as sa
 from numpy import typing as npt
 from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from lightcurvedb.core.base_model import LCDBModel, NameAndDescriptionMixin
+from lightcurvedb.core.bulk import copy_insert_ignore, copy_upsert
+from lightcurvedb.core.types import NumpyArrayType
+from lightcurvedb.models.observation import (
+    CadenceGrid,
+    Observation,
+    TargetSpecificTime,
+)
 
 if TYPE_CHECKING:
-    from lightcurvedb.models.observation import Observation
     from lightcurvedb.models.target import Target
 
+# Columns composing a DataSet's primary key, in key order
+KEY_COLUMNS = (
+    "observation_id",
+    "target_id",
+    "photometric_method_id",
+    "processing_method_id",
+)
+
+
+def _window_bounds(reference, start, end):
+    """
+    A lateral subquery of the 1-based, inclusive bounds ``lo`` and ``hi``
+    of the elements of the sorted array ``reference`` within
+    ``[start, end]``, as taken by a PostgreSQL slice ``array[lo:hi]``.
+
+    Evaluated once per joined row, so only use it when ``reference``
+    differs between rows.
+    """
+    element = sa.func.unnest(reference).column_valued("element")
+    lo = sa.select(sa.func.count() + 1).where(element < start)
+    hi = sa.select(sa.func.count()).where(element <= end)
+    return sa.select(
+        lo.scalar_subquery().label("lo"), hi.scalar_subquery().label("hi")
+    ).lateral("bounds")
+
+
+def _observation_cadences():
+    # Inline or shared cadence grid, requires an outer join to CadenceGrid
+    return sa.func.coalesce(
+        Observation.cadence_reference,
+        CadenceGrid.cadences,
+        type_=postgresql.ARRAY(sa.BigInteger),
+    )
+
+
+def _window_slice(array, lo, hi, item_type=sa.Float):
+    # 1-based, inclusive bounds, an empty array if lo > hi
+    return sa.type_coerce(array[slice(lo, hi)], NumpyArrayType(item_type))
+
 
 class PhotometricSource(LCDBModel, NameAndDescriptionMixin):
     """
@@ -36,6 +83,12 @@ class PhotometricSource(LCDBModel, NameAndDescriptionMixin):
     datasets : list[DataSet]
         Datasets using this photometric source
 
+    Notes
+    -----
+    This table is small and read-mostly. Hot loops should resolve names
+    with :func:`~lightcurvedb.core.reference_cache.reference_id`, which is
+    served from a process-wide cache.
+
     Examples
     --------
     >>> aperture_2px = PhotometricSource(name="Aperture_2px",
@@ -63,6 +116,9 @@ class PhotometricSource(LCDBModel, NameAndDescriptionMixin):
         """
         Get or create the unspecified sentinel record.
 
+        The row is looked up with :meth:`orm.Session.get` before creating
+        it, which costs no query once the sentinel is in the session.
+
         Parameters
         ----------
         session : orm.Session
@@ -74,14 +130,16 @@ class PhotometricSource(LCDBModel, NameAndDescriptionMixin):
             The sentinel record with id=0.
         """
         sentinel = session.get(cls, cls.UNSPECIFIED_ID)
-        if sentinel is None:
-            sentinel = cls(
-                id=cls.UNSPECIFIED_ID,
-                name="Unspecified",
-                description="No photometric source specified",
-            )
-            session.add(sentinel)
-            session.flush()
+        if sentinel is not None:
+            return sentinel
+
+        sentinel = cls(
+            id=cls.UNSPECIFIED_ID,
+            name="Unspecified",
+            description="No photometric source specified",
+        )
+        session.add(sentinel)
+        session.flush()
         return sentinel
 
     def __repr__(self) -> str:
@@ -112,6 +170,12 @@ class ProcessingMethod(LCDBModel, NameAndDescriptionMixin):
     description : str
         Detailed description (inherited from mixin)
 
+    Notes
+    -----
+    This table is small and read-mostly. Hot loops should resolve names
+    with :func:`~lightcurvedb.core.reference_cache.reference_id`, which is
+    served from a process-wide cache.
+
     Examples
     --------
     >>> pdc = ProcessingMethod(name="PDC-SAP",
@@ -139,6 +203,9 @@ class ProcessingMethod(LCDBModel, NameAndDescriptionMixin):
         """
         Get or create the unspecified sentinel record.
 
+        The row is looked up with :meth:`orm.Session.get` before creating
+        it, which costs no query once the sentinel is in the session.
+
         Parameters
         ----------
         session : orm.Session
@@ -150,14 +217,16 @@ class ProcessingMethod(LCDBModel, NameAndDescriptionMixin):
             The sentinel record with id=0.
         """
         sentinel = session.get(cls, cls.UNSPECIFIED_ID)
-        if sentinel is None:
-            sentinel = cls(
-                id=cls.UNSPECIFIED_ID,
-                name="Unspecified",
-                description="No processing method applied (raw data)",
-            )
-            session.add(sentinel)
-            session.flush()
+        if sentinel is not None:
+            return sentinel
+
+        sentinel = cls(
+            id=cls.UNSPECIFIED_ID,
+            name="Unspecified",
+            description="No processing method applied (raw data)",
+        )
+        session.add(sentinel)
+        session.flush()
         return sentinel
 
     def __repr__(self) -> str:
@@ -291,6 +360,71 @@ class DataSetHierarchy(LCDBModel):
         nullable=False
     )
 
+    @classmethod
+    def link_datasets(
+        cls,
+        session: orm.Session,
+        source_keys: npt.ArrayLike,
+        child_keys: npt.ArrayLike,
+    ) -> int:
+        """
+        Create many hierarchy links at once.
+
+        A vectorized counterpart to :meth:`DataSet.add_derived_dataset`.
+        Edges are streamed with ``COPY`` into a staging table and inserted
+        with ``ON CONFLICT DO NOTHING``, so links which already exist (or
+        are repeated in the input) are skipped rather than aborting the
+        transaction. Rows are grouped by source observation so that
+        partition routing stays local.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        source_keys : array-like, shape (n, 4)
+            Composite keys ``(observation_id, target_id,
+            photometric_method_id, processing_method_id)`` of the source
+            datasets.
+        child_keys : array-like, shape (n, 4)
+            Composite keys of the derived datasets, aligned with
+            ``source_keys``.
+
+        Returns
+        -------
+        int
+            The number of links created.
+
+        Raises
+        ------
+        ValueError
+            If the key arrays are not aligned ``(n, 4)`` arrays.
+
+        Examples
+        --------
+        >>> DataSetHierarchy.link_datasets(
+        ...     session,
+        ...     [raw.key for raw in raw_datasets],
+        ...     [detrended.key for detrended in detrended_datasets],
+        ... )
+        """
+        sources = np.asarray(source_keys, dtype=np.int64)
+        children = np.asarray(child_keys, dtype=np.int64)
+        if sources.size == 0 and children.size == 0:
+            return 0
+        if (
+            sources.ndim != 2
+            or sources.shape[1] != len(KEY_COLUMNS)
+            or sources.shape != children.shape
+        ):
+            raise ValueError("Expected aligned (n, 4) composite key arrays")
+
+        order = np.argsort(sources[:, 0], kind="stable")
+        columns = [f"source_{column}" for column in KEY_COLUMNS] + [
+            f"child_{column}" for column in KEY_COLUMNS
+        ]
+        arrays = [*sources[order].T, *children[order].T]
+        return copy_insert_ignore(session, cls.__tablename__, columns, arrays)
+
     def __repr__(self) -> str:
         return (
             f"<DataSetHierarchy("
@@ -351,6 +485,8 @@ class DataSet(LCDBModel):
     derived_datasets : list[DataSet]
         Child datasets that were derived from this dataset. Allows viewing
         all downstream processing results.
+    statistics : DataSetStatistics or None
+        Persisted summary statistics of ``values``, if computed.
 
     Notes
     -----
@@ -500,6 +636,14 @@ class DataSet(LCDBModel):
         viewonly=True,
     )
 
+    statistics: orm.Mapped[
+        typing.Optional["DataSetStatistics"]
+    ] = orm.relationship(
+        back_populates="dataset",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
     @hybrid_property
     def has_photometric_source(self) -> bool:
         """Return True if a specific photometric source is set."""
@@ -575,6 +719,199 @@ class DataSet(LCDBModel):
         """
         return source.add_derived_dataset(self, session)
 
+    @property
+    def key(self) -> tuple[int, int, int, int]:
+        """
+        The composite primary key ``(observation_id, target_id,
+        photometric_method_id, processing_method_id)``.
+        """
+        return tuple(getattr(self, column) for column in KEY_COLUMNS)
+
+    @classmethod
+    def lineage_query(
+        cls,
+        roots: typing.Iterable[tuple[int, int, int, int]],
+        direction: typing.Literal["up", "down"] = "down",
+        max_depth: typing.Optional[int] = None,
+    ) -> sa.Select:
+        """
+        Build a recursive query walking the hierarchy from many roots.
+
+        The traversal is a single ``WITH RECURSIVE`` over
+        ``datasethierarchy`` joined on the composite keys. Each result row
+        is one hierarchy edge reached from a root, labelled with the root's
+        key (``root_*`` columns), the edge's ``source_*`` and ``child_*``
+        keys and its shortest ``depth`` (1 for edges touching the root).
+        Every edge is reported once per root, even when a diamond reaches
+        it along several paths.
+
+        Parameters
+        ----------
+        roots : iterable of tuple[int, int, int, int]
+            Composite keys of the datasets to start from.
+        direction : {"up", "down"}, optional
+            ``"down"`` (default) follows derived datasets, ``"up"`` follows
+            source datasets.
+        max_depth : int, optional
+            Stop after this many levels. Unbounded by default.
+
+        Returns
+        -------
+        sa.Select
+            A select over the recursive CTE, ordered by root and depth.
+
+        Raises
+        ------
+        ValueError
+            For an unknown direction or a ``max_depth`` < 1.
+
+        Notes
+        -----
+        Each level keeps a single row per root and edge, so converging
+        paths are expanded once rather than once per path. The kept row
+        carries the path of visited keys only to prune edges leading back
+        into it, so a cyclic hierarchy terminates.
+        """
+        if direction == "down":
+            near, far = "source", "child"
+        elif direction == "up":
+            near, far = "child", "source"
+        else:
+            raise ValueError(f"Unknown lineage direction {direction!r}")
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+
+        keys = np.asarray(list(roots), dtype=np.int64).reshape(-1, 4)
+        root_table = (
+            sa.func.unnest(
+                *(
+                    sa.bindparam(
+                        f"root_{column}",
+                        keys[:, i].tolist(),
+                        type_=postgresql.ARRAY(sa.BigInteger),
+                    )
+                    for i, column in enumerate(KEY_COLUMNS)
+                )
+            )
+            .table_valued(*(f"root_{column}" for column in KEY_COLUMNS))
+            .render_derived(name="roots")
+        )
+        hierarchy = DataSetHierarchy.__table__
+
+        def _columns(table, prefix):
+            return [table.c[f"{prefix}_{column}"] for column in KEY_COLUMNS]
+
+        def _node(table, prefix):
+            return sa.func.concat_ws(
+                ":", *_columns(table, prefix), type_=sa.Text
+            )
+
+        def _joined(left, right):
+            return sa.and_(*(a == b for a, b in zip(left, right)))
+
+        anchor = sa.select(
+            *_columns(root_table, "root"),
+            *_columns(hierarchy, "source"),
+            *_columns(hierarchy, "child"),
+            sa.literal(1).label("depth"),
+            postgresql.array(
+                [_node(hierarchy, near), _node(hierarchy, far)]
+            ).label("path"),
+        ).join_from(
+            root_table,
+            hierarchy,
+            _joined(_columns(hierarchy, near), _columns(root_table, "root")),
+        )
+        lineage = anchor.cte("lineage", recursive=True)
+
+        step = (
+            sa.select(
+                *_columns(lineage, "root"),
+                *_columns(hierarchy, "source"),
+                *_columns(hierarchy, "child"),
+                (lineage.c.depth + 1).label("depth"),
+                lineage.c.path.op("||")(_node(hierarchy, far)),
+            )
+            .join_from(
+                lineage,
+                hierarchy,
+                _joined(_columns(hierarchy, near), _columns(lineage, far)),
+            )
+            .where(_node(hierarchy, far) != sa.all_(lineage.c.path))
+            .distinct(
+                *_columns(lineage, "root"),
+                *_columns(hierarchy, "source"),
+                *_columns(hierarchy, "child"),
+            )
+        )
+        if max_depth is not None:
+            step = step.where(lineage.c.depth < max_depth)
+        lineage = lineage.union_all(step)
+
+        edge = [
+            *_columns(lineage, "root"),
+            *_columns(lineage, "source"),
+            *_columns(lineage, "child"),
+        ]
+        # Paths of differing length may still reach an edge at several
+        # depths, report the shortest
+        depth = sa.func.min(lineage.c.depth).label("depth")
+        return (
+            sa.select(*edge, depth)
+            .group_by(*edge)
+            .order_by(*_columns(lineage, "root"), depth)
+        )
+
+    @classmethod
+    def bulk_lineage(
+        cls,
+        session: orm.Session,
+        roots: typing.Iterable[tuple[int, int, int, int]],
+        direction: typing.Literal["up", "down"] = "down",
+        max_depth: typing.Optional[int] = None,
+    ) -> list[sa.Row]:
+        """
+        Fetch the lineage of many datasets in a single query.
+
+        See :meth:`lineage_query` for the parameters and row layout.
+        """
+        query = cls.lineage_query(roots, direction, max_depth)
+        return list(session.execute(query))
+
+    def lineage(
+        self,
+        session: orm.Session,
+        direction: typing.Literal["up", "down"] = "down",
+        max_depth: typing.Optional[int] = None,
+    ) -> list[sa.Row]:
+        """
+        Fetch every ancestor or descendant edge of this dataset.
+
+        Unlike :attr:`source_datasets` and :attr:`derived_datasets`, which
+        cover a single level, this walks the full hierarchy in one query.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        direction : {"up", "down"}, optional
+            ``"down"`` (default) for descendants, ``"up"`` for ancestors.
+        max_depth : int, optional
+            Stop after this many levels. Unbounded by default.
+
+        Returns
+        -------
+        list[sa.Row]
+            Hierarchy edges with their ``depth``, see
+            :meth:`lineage_query`.
+
+        Examples
+        --------
+        >>> for edge in raw_dataset.lineage(session, "down"):
+        ...     print(edge.depth, edge.child_processing_method_id)
+        """
+        return self.bulk_lineage(session, [self.key], direction, max_depth)
+
     def align_to_observation(
         self,
         dataset_cadences: npt.NDArray[np.integer],
@@ -667,6 +1004,179 @@ class DataSet(LCDBModel):
                 fill_value=fill_value,
             )
 
+    @classmethod
+    def cadence_window(
+        cls,
+        observation: Observation,
+        start: int,
+        end: int,
+        target_ids: typing.Optional[npt.ArrayLike] = None,
+        photometric_method_id: typing.Optional[int] = None,
+        processing_method_id: typing.Optional[int] = None,
+    ) -> sa.Select:
+        """
+        Build a query of dataset arrays sliced to a cadence window.
+
+        The window is mapped to array positions once, in Python, through
+        :meth:`Observation.cadence_slice`, and the arrays are sliced by
+        PostgreSQL with those literal bounds, so only the cadences within
+        the window are transferred.
+
+        Parameters
+        ----------
+        observation : Observation
+            The observation to select datasets of. Its cadence grid is
+            read through the cached
+            :attr:`~Observation.cadence_lookup`.
+        start, end : int
+            First and last cadence of the window, inclusive.
+        target_ids : array-like of int, optional
+            Only select datasets of these targets.
+        photometric_method_id, processing_method_id : int, optional
+            Only select datasets of this photometry or processing.
+
+        Returns
+        -------
+        sa.Select
+            A select of the key columns followed by ``cadences``,
+            ``values`` and ``errors`` as ndarrays holding only the window.
+            Arrays are empty when no cadence falls within the window.
+
+        Notes
+        -----
+        ``values`` and ``errors`` must be aligned to the observation's
+        cadence grid, see :meth:`align_to_observation`.
+
+        Examples
+        --------
+        >>> q = DataSet.cadence_window(obs, 1200, 1500, target_ids=[42])
+        >>> for row in session.execute(q):
+        ...     plot(row.cadences, row.values)
+        """
+        window = observation.cadence_slice(start, end)
+        lo, hi = window.start + 1, window.stop
+        statement = sa.select(
+            *(getattr(cls, column) for column in KEY_COLUMNS),
+            sa.literal(
+                observation.cadences[window], NumpyArrayType(sa.BigInteger)
+            ).label("cadences"),
+            _window_slice(cls.values, lo, hi).label("values"),
+            _window_slice(cls.errors, lo, hi).label("errors"),
+        )
+        return cls._filter_window(
+            statement,
+            observation.id,
+            target_ids,
+            photometric_method_id,
+            processing_method_id,
+        )
+
+    @classmethod
+    def time_window(
+        cls,
+        observation_id: int,
+        start: float,
+        end: float,
+        target_ids: typing.Optional[npt.ArrayLike] = None,
+        photometric_method_id: typing.Optional[int] = None,
+        processing_method_id: typing.Optional[int] = None,
+    ) -> sa.Select:
+        """
+        Build a query of dataset arrays sliced to a time window.
+
+        Like :meth:`cadence_window`, with the window mapped to array
+        positions through each target's barycentric Julian dates. The
+        positions may differ between targets, so they are searched
+        server-side for every row.
+
+        Parameters
+        ----------
+        observation_id : int
+            The observation to select datasets of.
+        start, end : float
+            Window bounds in BJD, inclusive.
+        target_ids : array-like of int, optional
+            Only select datasets of these targets.
+        photometric_method_id, processing_method_id : int, optional
+            Only select datasets of this photometry or processing.
+
+        Returns
+        -------
+        sa.Select
+            A select of the key columns followed by ``cadences``,
+            ``barycentric_julian_dates``, ``values`` and ``errors`` as
+            ndarrays holding only the window.
+
+        Notes
+        -----
+        Only targets with stored ``barycentric_julian_dates`` are selected.
+        Times kept solely as basis coefficients, see
+        :meth:`TargetSpecificTime.compress_observation`, can not be
+        searched server-side; use :meth:`TargetSpecificTime.load_dates`
+        and :meth:`cadence_window` for those.
+        """
+        dates = TargetSpecificTime.barycentric_julian_dates
+        bounds = _window_bounds(dates, start, end)
+        lo, hi = bounds.c.lo, bounds.c.hi
+        statement = (
+            sa.select(
+                *(getattr(cls, column) for column in KEY_COLUMNS),
+                _window_slice(
+                    _observation_cadences(), lo, hi, sa.BigInteger
+                ).label("cadences"),
+                _window_slice(dates, lo, hi).label("barycentric_julian_dates"),
+                _window_slice(cls.values, lo, hi).label("values"),
+                _window_slice(cls.errors, lo, hi).label("errors"),
+            )
+            .join(Observation, Observation.id == cls.observation_id)
+            .outerjoin(Observation.cadence_grid)
+            .join(
+                TargetSpecificTime,
+                sa.and_(
+                    TargetSpecificTime.observation_id == cls.observation_id,
+                    TargetSpecificTime.target_id == cls.target_id,
+                ),
+            )
+            .join(bounds, sa.true())
+            .where(dates.is_not(None))
+        )
+        return cls._filter_window(
+            statement,
+            observation_id,
+            target_ids,
+            photometric_method_id,
+            processing_method_id,
+        )
+
+    @classmethod
+    def _filter_window(
+        cls,
+        statement,
+        observation_id,
+        target_ids,
+        photometric_method_id,
+        processing_method_id,
+    ):
+        # The literal observation id lets PostgreSQL prune partitions
+        statement = statement.where(
+            cls.observation_id == observation_id
+        ).order_by(*(getattr(cls, column) for column in KEY_COLUMNS))
+        if target_ids is not None:
+            ids = np.asarray(target_ids, dtype=np.int64).tolist()
+            statement = statement.where(
+                cls.target_id
+                == sa.any_(sa.literal(ids, postgresql.ARRAY(sa.BigInteger)))
+            )
+        if photometric_method_id is not None:
+            statement = statement.where(
+                cls.photometric_method_id == photometric_method_id
+            )
+        if processing_method_id is not None:
+            statement = statement.where(
+                cls.processing_method_id == processing_method_id
+            )
+        return statement
+
     def __repr__(self) -> str:
         return (
             f"<DataSet(obs={self.observation_id}, target={self.target_id}, "
@@ -679,3 +1189,362 @@ class DataSet(LCDBModel):
         yield "target", self.target_id
         yield "phot", self.photometric_method_id
         yield "proc", self.processing_method_id
+
+
+class DataSetStatistics(LCDBModel):
+    """
+    Summary statistics of one DataSet's values.
+
+    Stored alongside the dataset under the same composite key and
+    partitioned the same way, so lightcurves can be ranked and filtered
+    by scatter or brightness with index scans instead of loading every
+    ``values`` array. All statistics ignore NaN values and are NULL when
+    a dataset has no finite values.
+
+    Attributes
+    ----------
+    observation_id : int
+        Part of the composite key, and the partition key.
+    target_id : int
+        Part of the composite key.
+    photometric_method_id : int
+        Part of the composite key.
+    processing_method_id : int
+        Part of the composite key.
+    n_points : int
+        Number of finite values.
+    nan_fraction : float or None
+        Fraction of values which are NaN.
+    mean : float or None
+        Mean of the finite values.
+    median : float or None
+        Median of the finite values.
+    rms : float or None
+        Root mean square deviation about the mean (standard deviation).
+    mad : float or None
+        Median absolute deviation about the median.
+    p2p_scatter : float or None
+        Median absolute difference between adjacent cadences, a noise
+        estimate insensitive to slow trends.
+    dataset : DataSet
+        The summarized dataset.
+
+    Examples
+    --------
+    Compute statistics while ingesting, or backfill existing datasets:
+
+    >>> DataSetStatistics.bulk_load(session, keys, values)
+    >>> DataSetStatistics.backfill(session, observation_id=sector.id)
+
+    Select the quietest 1% of lightcurves of an observation:
+
+    >>> quiet = session.scalars(
+    ...     DataSetStatistics.ranked(sector.id, "rms", fraction=0.01)
+    ... ).all()
+    """
+
+    __tablename__ = "dataset_statistics"
+
+    STATISTICS: ClassVar[tuple[str, ...]] = (
+        "n_points",
+        "nan_fraction",
+        "mean",
+        "median",
+        "rms",
+        "mad",
+        "p2p_scatter",
+    )
+
+    __table_args__ = (
+        sa.PrimaryKeyConstraint(*KEY_COLUMNS, name="pk_dataset_statistics"),
+        sa.ForeignKeyConstraint(
+            list(KEY_COLUMNS),
+            [f"dataset.{column}" for column in KEY_COLUMNS],
+            name="fk_dataset_statistics_dataset",
+            ondelete="CASCADE",
+        ),
+        sa.Index("ix_dataset_statistics_rms", "observation_id", "rms"),
+        sa.Index("ix_dataset_statistics_median", "observation_id", "median"),
+        sa.Index(
+            "ix_dataset_statistics_p2p_scatter",
+            "observation_id",
+            "p2p_scatter",
+        ),
+        sa.Index(
+            "ix_dataset_statistics_nan_fraction",
+            "observation_id",
+            "nan_fraction",
+        ),
+        {"postgresql_partition_by": "LIST (observation_id)"},
+    )
+
+    observation_id: orm.Mapped[int]
+    target_id: orm.Mapped[int]
+    photometric_method_id: orm.Mapped[int]
+    processing_method_id: orm.Mapped[int]
+
+    n_points: orm.Mapped[int]
+    nan_fraction: orm.Mapped[typing.Optional[float]]
+    mean: orm.Mapped[typing.Optional[float]]
+    median: orm.Mapped[typing.Optional[float]]
+    rms: orm.Mapped[typing.Optional[float]]
+    mad: orm.Mapped[typing.Optional[float]]
+    p2p_scatter: orm.Mapped[typing.Optional[float]]
+
+    dataset: orm.Mapped["DataSet"] = orm.relationship(
+        back_populates="statistics"
+    )
+
+    @staticmethod
+    def compute(
+        values: typing.Union[npt.ArrayLike, typing.Sequence[npt.ArrayLike]],
+    ) -> dict[str, np.ndarray]:
+        """
+        Compute the statistics of many value arrays at once.
+
+        Arrays of equal length are stacked and reduced along the cadence
+        axis together, so a whole observation takes a handful of NumPy
+        calls per distinct length.
+
+        Parameters
+        ----------
+        values : array-like or sequence of array-like
+            A ``(n_datasets, n_cadences)`` matrix, or a sequence of 1D
+            arrays which may differ in length.
+
+        Returns
+        -------
+        dict[str, ndarray]
+            One array of ``n_datasets`` results per name in
+            :attr:`STATISTICS`; statistics without any finite value are
+            NaN.
+        """
+        if isinstance(values, np.ndarray) and values.ndim == 2:
+            groups = [(np.arange(len(values)), values.astype(np.float64))]
+        else:
+            arrays = [np.asarray(row, dtype=np.float64) for row in values]
+            lengths = np.array([len(row) for row in arrays], dtype=np.int64)
+            order = np.argsort(lengths, kind="stable")
+            splits = np.flatnonzero(np.diff(lengths[order])) + 1
+            groups = [
+                (group, np.stack([arrays[i] for i in group]))
+                for group in np.split(order, splits)
+                if len(group)
+            ]
+
+        n_datasets = sum(len(index) for index, _ in groups)
+        results = {
+            name: np.empty(n_datasets, dtype=np.float64)
+            for name in DataSetStatistics.STATISTICS
+        }
+        for index, matrix in groups:
+            for name, result in DataSetStatistics._reduce(matrix).items():
+                results[name][index] = result
+        results["n_points"] = results["n_points"].astype(np.int64)
+        return results
+
+    @staticmethod
+    def _reduce(matrix: npt.NDArray[np.float64]) -> dict[str, np.ndarray]:
+        finite = np.isfinite(matrix)
+        # Rows without finite values yield NaN; silence all-NaN warnings
+        with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            clean = np.where(finite, matrix, np.nan)
+            median = np.nanmedian(clean, axis=1)
+            return {
+                "n_points": finite.sum(axis=1),
+                "nan_fraction": (
+                    np.isnan(matrix).sum(axis=1) / matrix.shape[1]
+                    if matrix.shape[1]
+                    else np.full(len(matrix), np.nan)
+                ),
+                "mean": np.nanmean(clean, axis=1),
+                "median": median,
+                "rms": np.nanstd(clean, axis=1),
+                "mad": np.nanmedian(np.abs(clean - median[:, None]), axis=1),
+                "p2p_scatter": np.nanmedian(
+                    np.abs(np.diff(clean, axis=1)), axis=1
+                ),
+            }
+
+    @classmethod
+    def bulk_load(
+        cls,
+        session: orm.Session,
+        keys: npt.ArrayLike,
+        values: typing.Union[npt.ArrayLike, typing.Sequence[npt.ArrayLike]],
+    ) -> int:
+        """
+        Compute and store statistics for many datasets.
+
+        Rows are streamed with ``COPY`` and upserted, so recomputing the
+        statistics of a dataset replaces the stored ones.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        keys : array-like of int
+            ``(n_datasets, 4)`` composite dataset keys.
+        values : array-like or sequence of array-like
+            The values of each dataset, aligned with ``keys``, see
+            :meth:`compute`.
+
+        Returns
+        -------
+        int
+            The number of rows written.
+        """
+        keys = np.asarray(keys, dtype=np.int64).reshape(-1, 4)
+        statistics = cls.compute(values)
+        if len(statistics["n_points"]) != len(keys):
+            raise ValueError("Expected one value array per dataset key")
+        columns = [
+            # NaN statistics are stored as NULL
+            np.where(np.isnan(result), None, result)
+            if result.dtype.kind == "f"
+            else result
+            for result in statistics.values()
+        ]
+        return copy_upsert(
+            session,
+            cls.__tablename__,
+            [*KEY_COLUMNS, *statistics],
+            [*keys.T, *columns],
+            conflict_columns=KEY_COLUMNS,
+        )
+
+    @classmethod
+    def backfill(
+        cls,
+        session: orm.Session,
+        observation_id: typing.Optional[int] = None,
+        chunksize: int = 1000,
+        recompute: bool = False,
+    ) -> int:
+        """
+        Compute statistics for stored datasets which lack them.
+
+        Datasets are read in key order, ``chunksize`` at a time, so
+        memory stays bounded and an interrupted backfill resumes where it
+        stopped.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int, optional
+            Restrict the backfill to one observation (partition).
+        chunksize : int, optional
+            Number of datasets read per batch.
+        recompute : bool, optional
+            Also recompute datasets which already have statistics.
+
+        Returns
+        -------
+        int
+            The number of datasets summarized.
+        """
+        key = [getattr(DataSet, column) for column in KEY_COLUMNS]
+        statement = sa.select(*key, DataSet.values).order_by(*key)
+        if observation_id is not None:
+            statement = statement.where(
+                DataSet.observation_id == observation_id
+            )
+        if not recompute:
+            statement = statement.where(~DataSet.statistics.has())
+
+        total = 0
+        last = None
+        while True:
+            page = statement
+            if last is not None:
+                page = page.where(sa.tuple_(*key) > sa.tuple_(*last))
+            rows = session.execute(page.limit(chunksize)).all()
+            if not rows:
+                return total
+            total += cls.bulk_load(
+                session,
+                [row[:4] for row in rows],
+                [row.values for row in rows],
+            )
+            last = tuple(rows[-1][:4])
+
+    @classmethod
+    def ranked(
+        cls,
+        observation_id: int,
+        statistic: str = "rms",
+        fraction: typing.Optional[float] = None,
+        limit: typing.Optional[int] = None,
+        descending: bool = False,
+        photometric_method_id: typing.Optional[int] = None,
+        processing_method_id: typing.Optional[int] = None,
+    ) -> sa.Select:
+        """
+        Build a query ranking an observation's datasets by a statistic.
+
+        Parameters
+        ----------
+        observation_id : int
+            The observation (partition) to rank.
+        statistic : str, optional
+            Column to order by, one of :attr:`STATISTICS`. Defaults to
+            ``"rms"``.
+        fraction : float, optional
+            Only return this fraction of the ranked datasets, rounded up,
+            e.g. ``0.01`` for the top percent.
+        limit : int, optional
+            Only return this many datasets.
+        descending : bool, optional
+            Rank largest first instead of smallest first.
+        photometric_method_id, processing_method_id : int, optional
+            Only rank datasets of this photometry or processing.
+
+        Returns
+        -------
+        sa.Select
+            A select of :class:`DataSetStatistics` rows. Datasets without
+            a value for the statistic are excluded.
+
+        Raises
+        ------
+        ValueError
+            For an unknown statistic, or a fraction outside ``(0, 1]``.
+        """
+        if statistic not in cls.STATISTICS:
+            raise ValueError(f"Unknown statistic {statistic!r}")
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+
+        column = getattr(cls, statistic)
+        key = [getattr(cls, name) for name in KEY_COLUMNS]
+        criteria = [cls.observation_id == observation_id, column.is_not(None)]
+        if photometric_method_id is not None:
+            criteria.append(cls.photometric_method_id == photometric_method_id)
+        if processing_method_id is not None:
+            criteria.append(cls.processing_method_id == processing_method_id)
+
+        statement = (
+            sa.select(cls)
+            .where(*criteria)
+            .order_by(column.desc() if descending else column, *key)
+        )
+        if fraction is not None:
+            count = sa.select(sa.func.count()).where(*criteria)
+            cutoff = sa.cast(
+                sa.func.ceil(count.scalar_subquery() * fraction), sa.BigInteger
+            )
+            if limit is not None:
+                cutoff = sa.func.least(cutoff, limit)
+            statement = statement.limit(cutoff)
+        elif limit is not None:
+            statement = statement.limit(limit)
+        return statement
+
+    def __repr__(self) -> str:
+        return (
+            f"<DataSetStatistics(obs={self.observation_id}, "
+            f"target={self.target_id}, rms={self.rms}, "
+            f"median={self.median})>"
+        )
@@ -1,12 +1,21 @@
+import threading
 import uuid
-from typing import TYPE_CHECKING
+from collections.abc import Callable
+from itertools import compress
+from typing import TYPE_CHECKING, Optional
 
+import cachetools
 import numpy as np
 import sqlalchemy as sa
 from numpy import typing as npt
 from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
 
 from lightcurvedb.core.base_model import LCDBModel
+from lightcurvedb.core.bulk import copy_columns, copy_insert_ignore
+from lightcurvedb.util.barycentric import barycentric_julian_dates
+from lightcurvedb.util.cadence_grid import CadenceLookup, cadence_digest
+from lightcurvedb.util.iter import chunkify_aligned, chunkify_array
 
 if TYPE_CHECKING:
     from lightcurvedb.models.dataset import DataSet
@@ -15,6 +24,122 @@ if TYPE_CHECKING:
     from lightcurvedb.models.quality_flag import QualityFlagArray
     from lightcurvedb.models.target import Target
 
+# Cadence lookups by grid digest. Grids are immutable, so entries never go
+# stale and are only evicted for space.
+_CADENCE_LOOKUPS: cachetools.LRUCache = cachetools.LRUCache(maxsize=256)
+_CADENCE_LOOKUP_LOCK = threading.Lock()
+
+
+def _cadence_lookup(
+    digest: bytes, load: Callable[[], npt.NDArray[np.int64]]
+) -> CadenceLookup:
+    with _CADENCE_LOOKUP_LOCK:
+        lookup = _CADENCE_LOOKUPS.get(digest)
+    if lookup is None:
+        lookup = CadenceLookup(load())
+        with _CADENCE_LOOKUP_LOCK:
+            _CADENCE_LOOKUPS[digest] = lookup
+    return lookup
+
+
+def _cadence_range(column: str) -> sa.Computed:
+    # NULL arrays yield a NULL range, empty arrays an empty one
+    return sa.Computed(
+        f"CASE WHEN cardinality({column}) > 0 THEN "
+        f"int8range({column}[1], {column}[cardinality({column})], '[]') "
+        f"WHEN {column} IS NOT NULL THEN 'empty'::int8range END"
+    )
+
+
+class CadenceGrid(LCDBModel):
+    """
+    A cadence grid shared by observations, addressed by its contents.
+
+    Observations of one sector on different cameras and CCDs usually
+    record identical grids. Storing each distinct grid once keeps a single
+    copy in the database and lets every observation on it reuse one
+    in-process :class:`~lightcurvedb.util.cadence_grid.CadenceLookup`.
+
+    Attributes
+    ----------
+    digest : bytes
+        SHA-256 of the grid, see
+        :func:`~lightcurvedb.util.cadence_grid.cadence_digest`.
+    cadences : ndarray[int64]
+        The cadence grid.
+    cadence_range : Range[int]
+        Inclusive range of the first to last cadence, generated by the
+        database and GiST indexed.
+    observations : list[Observation]
+        Observations referencing this grid.
+
+    Examples
+    --------
+    >>> grid = CadenceGrid.intern(session, cadences)
+    >>> obs = Observation(cadence_grid=grid, instrument=camera_1)
+    """
+
+    __tablename__ = "cadence_grid"
+    __table_args__ = (
+        sa.Index(
+            "ix_cadence_grid_cadence_range",
+            "cadence_range",
+            postgresql_using="gist",
+        ),
+    )
+
+    digest: orm.Mapped[bytes] = orm.mapped_column(
+        sa.LargeBinary(32), primary_key=True
+    )
+    cadences: orm.Mapped[npt.NDArray[np.int64]]
+    cadence_range: orm.Mapped[postgresql.Range[int]] = orm.mapped_column(
+        postgresql.INT8RANGE, _cadence_range("cadences")
+    )
+
+    observations: orm.Mapped[list["Observation"]] = orm.relationship(
+        back_populates="cadence_grid"
+    )
+
+    @classmethod
+    def intern(
+        cls, session: orm.Session, cadences: npt.ArrayLike
+    ) -> "CadenceGrid":
+        """
+        Return the stored grid with these cadences, creating it if needed.
+
+        Safe under concurrent use; the grid is inserted with
+        ``ON CONFLICT DO NOTHING``.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        cadences : array-like of int
+            Monotonically increasing cadence grid.
+
+        Returns
+        -------
+        CadenceGrid
+            The persistent grid.
+        """
+        cadences = np.asarray(cadences, dtype=np.int64)
+        digest = cadence_digest(cadences)
+        grid = session.get(cls, digest)
+        if grid is None:
+            session.execute(
+                postgresql.insert(cls)
+                .values(digest=digest, cadences=cadences)
+                .on_conflict_do_nothing()
+            )
+            grid = session.get(cls, digest)
+        return grid
+
+    def __repr__(self) -> str:
+        return (
+            f"<CadenceGrid(digest={self.digest.hex()[:12]}, "
+            f"range={self.cadence_range})>"
+        )
+
 
 class Observation(LCDBModel):
     """
@@ -34,8 +159,14 @@ class Observation(LCDBModel):
         Primary key identifier
     type : str
         Polymorphic discriminator for subclass type
-    cadence_reference : ndarray[int64]
-        Array of cadence numbers for time ordering
+    cadence_reference : ndarray[int64], optional
+        Array of cadence numbers for time ordering, unless the grid is
+        shared through ``cadence_grid``
+    cadence_grid_digest : bytes, optional
+        Digest of the shared :class:`CadenceGrid` used instead of
+        ``cadence_reference``
+    cadence_grid : CadenceGrid, optional
+        The shared cadence grid
     instrument_id : uuid.UUID
         Foreign key to the instrument used
     instrument : Instrument
@@ -44,6 +175,12 @@ class Observation(LCDBModel):
         Processed versions of this observation
     target_specific_times : list[TargetSpecificTime]
         Target-specific time corrections
+    target_time_basis : TargetTimeBasis, optional
+        Shared basis of compressed target-specific times
+    cadence_range : Range[int], optional
+        Inclusive range of the first to last reference cadence, generated
+        by the database and GiST indexed for :meth:`overlapping`. Empty
+        for an empty ``cadence_reference`` and NULL for a shared grid.
 
     Examples
     --------
@@ -84,11 +221,29 @@ class Observation(LCDBModel):
                 sa.func.cardinality(sa.column("cadence_reference"))
             ],
         ),
+        sa.Index(
+            "ix_observation_cadence_range",
+            "cadence_range",
+            postgresql_using="gist",
+        ),
+        sa.CheckConstraint(
+            "cadence_reference IS NOT NULL "
+            "OR cadence_grid_digest IS NOT NULL",
+            name="observation_has_cadences",
+        ),
     )
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True)
     type: orm.Mapped[str] = orm.mapped_column(index=True)
-    cadence_reference: orm.Mapped[npt.NDArray[np.int64]]
+    cadence_reference: orm.Mapped[Optional[npt.NDArray[np.int64]]]
+    cadence_range: orm.Mapped[
+        Optional[postgresql.Range[int]]
+    ] = orm.mapped_column(
+        postgresql.INT8RANGE, _cadence_range("cadence_reference")
+    )
+    cadence_grid_digest: orm.Mapped[Optional[bytes]] = orm.mapped_column(
+        sa.LargeBinary(32), sa.ForeignKey("cadence_grid.digest"), index=True
+    )
     instrument_id: orm.Mapped[uuid.UUID] = orm.mapped_column(
         sa.ForeignKey("instrument.id", ondelete="CASCADE")
     )
@@ -96,6 +251,9 @@ class Observation(LCDBModel):
     instrument: orm.Mapped["Instrument"] = orm.relationship(
         "Instrument", back_populates="observations"
     )
+    cadence_grid: orm.Mapped[Optional[CadenceGrid]] = orm.relationship(
+        back_populates="observations"
+    )
 
     datasets: orm.Mapped[list["DataSet"]] = orm.relationship(
         "DataSet", back_populates="observation"
@@ -119,6 +277,13 @@ class Observation(LCDBModel):
     fits_images: orm.Mapped[list["FITSFrame"]] = orm.relationship(
         "FITSFrame", back_populates="observation"
     )
+    target_time_basis: orm.Mapped[
+        Optional["TargetTimeBasis"]
+    ] = orm.relationship(
+        back_populates="observation",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     def align_to_reference(
         self,
@@ -126,6 +291,7 @@ class Observation(LCDBModel):
         values: npt.NDArray,
         fill_value=np.nan,
         verify_subset: bool = False,
+        out: Optional[npt.NDArray] = None,
     ) -> npt.NDArray:
         """
         Align observed values to a reference sample grid.
@@ -141,14 +307,37 @@ class Observation(LCDBModel):
             Value for missing samples (default: np.nan).
         verify_subset : bool, optional
             If True, verify observed ⊂ reference (default: False).
+        out : ndarray, optional
+            Array of shape ``(len(reference),)`` to write the result into,
+            avoiding an allocation per call when aligning many series.
 
         Returns
         -------
         aligned : ndarray
             Values aligned to reference grid, shape (len(reference),).
+            ``out`` if given.
+
+        Raises
+        ------
+        ValueError
+            If ``verify_subset`` fails, or ``out`` has the wrong shape.
+
+        Notes
+        -----
+        Positions are found through :attr:`cadence_lookup`, which maps
+        cadences arithmetically on contiguous and strided grids.
+
+        Examples
+        --------
+        Align a batch of series, reusing one output row each:
+
+        >>> aligned = np.empty((len(batch), len(obs.cadences)))
+        >>> for row, (cadences, values) in zip(aligned, batch):
+        ...     obs.align_to_reference(cadences, values, out=row)
         """
-        reference = self.cadence_reference
-        indices = np.searchsorted(reference, observed)
+        lookup = self.cadence_lookup
+        reference = lookup.cadences
+        indices = lookup.searchsorted(observed)
 
         # Check which indices are within bounds
         in_bounds = indices < len(reference)
@@ -162,15 +351,250 @@ class Observation(LCDBModel):
             if not valid.all():
                 raise ValueError("observed contains values not in reference")
 
-        result = np.full(
-            len(reference),
-            fill_value,
-            dtype=np.result_type(values, fill_value),
-        )
+        if out is None:
+            out = np.full(
+                len(reference),
+                fill_value,
+                dtype=np.result_type(values, fill_value),
+            )
+        elif out.shape != (len(reference),):
+            raise ValueError(
+                f"out has shape {out.shape}, expected ({len(reference)},)"
+            )
+        else:
+            out.fill(fill_value)
+
         # Only assign values for in-bounds indices
-        result[indices[in_bounds]] = values[in_bounds]
+        if in_bounds.all():
+            out[indices] = values
+        else:
+            out[indices[in_bounds]] = values[in_bounds]
+
+        return out
+
+    @classmethod
+    def overlapping(
+        cls,
+        session: orm.Session,
+        start: int,
+        end: Optional[int] = None,
+    ) -> list["Observation"]:
+        """
+        Find observations whose cadences overlap a cadence range.
+
+        Answered from the GiST indexes on the ``cadence_range`` of
+        observations and of shared cadence grids, without loading any
+        cadence array.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        start : int
+            First cadence of the range.
+        end : int, optional
+            Last cadence of the range, inclusive. Defaults to ``start``,
+            finding the observations covering a single cadence.
+
+        Returns
+        -------
+        list[Observation]
+            Matching observations ordered by their first cadence. Queried
+            through a subclass, only observations of that type.
+
+        Raises
+        ------
+        ValueError
+            If ``end`` precedes ``start``.
+
+        Notes
+        -----
+        An observation spans its first to last reference cadence, so a
+        range falling within a gap of its cadence grid still overlaps it.
+        Use :meth:`cadence_slice` to test for cadences within the range.
+
+        Examples
+        --------
+        >>> Observation.overlapping(session, 120_000)
+        [<Observation(id=7, ...)>]
+        """
+        if end is None:
+            end = start
+        if end < start:
+            raise ValueError(f"end {end} precedes start {start}")
+
+        window = sa.func.int8range(int(start), int(end), "[]")
+        shared = sa.select(CadenceGrid.digest).where(
+            CadenceGrid.cadence_range.overlaps(window)
+        )
+        cadence_range = sa.func.coalesce(
+            cls.cadence_range, CadenceGrid.cadence_range
+        )
+        return session.scalars(
+            sa.select(cls)
+            .outerjoin(cls.cadence_grid)
+            .where(
+                sa.or_(
+                    cls.cadence_range.overlaps(window),
+                    cls.cadence_grid_digest.in_(shared),
+                )
+            )
+            .order_by(sa.func.lower(cadence_range), cls.id)
+        ).all()
+
+    @classmethod
+    def deduplicate_cadences(
+        cls,
+        session: orm.Session,
+        observation_ids: Optional[npt.ArrayLike] = None,
+        chunksize: int = 1000,
+    ) -> int:
+        """
+        Move inline cadence references into shared cadence grids.
+
+        Each distinct ``cadence_reference`` is stored once as a
+        :class:`CadenceGrid` and observations are rewritten, with a bulk
+        update by primary key, to reference it instead of their own copy.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_ids : array-like of int, optional
+            Only deduplicate these observations. By default all
+            observations with an inline ``cadence_reference``.
+        chunksize : int, optional
+            Number of observations loaded and rewritten per batch.
+
+        Returns
+        -------
+        int
+            The number of observations moved to a shared grid.
+
+        Notes
+        -----
+        Only identical grids are shared. Observations already loaded in
+        ``session`` are not refreshed.
+        """
+        criteria = [cls.cadence_reference.is_not(None)]
+        if observation_ids is not None:
+            ids = np.asarray(observation_ids, dtype=np.int64).tolist()
+            criteria.append(
+                cls.id
+                == sa.any_(sa.literal(ids, postgresql.ARRAY(sa.BigInteger)))
+            )
+
+        moved = 0
+        last_id = None
+        while True:
+            statement = (
+                sa.select(cls.id, cls.cadence_reference)
+                .where(*criteria)
+                .order_by(cls.id)
+                .limit(chunksize)
+            )
+            if last_id is not None:
+                statement = statement.where(cls.id > last_id)
+            rows = session.execute(statement).all()
+            if not rows:
+                return moved
+
+            grids = {}
+            parameters = []
+            for id_, cadences in rows:
+                digest = cadence_digest(cadences)
+                grids.setdefault(digest, cadences)
+                parameters.append(
+                    {
+                        "id": id_,
+                        "cadence_reference": None,
+                        "cadence_grid_digest": digest,
+                    }
+                )
+            session.execute(
+                postgresql.insert(CadenceGrid)
+                .values(
+                    [
+                        {"digest": digest, "cadences": cadences}
+                        for digest, cadences in grids.items()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+            session.execute(sa.update(Observation), parameters)
+            moved += len(rows)
+            last_id = rows[-1].id
+
+    @property
+    def cadences(self) -> npt.NDArray[np.int64]:
+        """
+        The cadence grid, whether stored inline or shared.
+        """
+        if self.cadence_reference is not None:
+            return self.cadence_reference
+        return self.cadence_lookup.cadences
+
+    @property
+    def cadence_lookup(self) -> CadenceLookup:
+        """
+        The cached :class:`~lightcurvedb.util.cadence_grid.CadenceLookup`
+        of this observation's cadence grid.
+
+        Lookups are cached per process by grid digest, so observations
+        sharing a grid, inline or through ``cadence_grid``, share one
+        lookup and a shared grid is loaded at most once. Each observation
+        also keeps its lookup until ``cadence_reference`` or
+        ``cadence_grid_digest`` is reassigned, so repeated alignments skip
+        hashing the grid. Modifying ``cadence_reference`` in place is not
+        detected.
+        """
+        source = self.cadence_reference
+        if source is None:
+            source = self.cadence_grid_digest
+            if source is None and self.cadence_grid is not None:
+                source = self.cadence_grid.digest
+            if source is None:
+                raise ValueError(f"{self!r} has no cadence grid")
+
+        cached = self.__dict__.get("_cadence_lookup")
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
+        if isinstance(source, bytes):
+            lookup = _cadence_lookup(
+                source, lambda: self.cadence_grid.cadences
+            )
+        else:
+            lookup = _cadence_lookup(cadence_digest(source), lambda: source)
+        self.__dict__["_cadence_lookup"] = (source, lookup)
+        return lookup
+
+    def cadence_slice(self, start: int, end: int) -> slice:
+        """
+        Map an inclusive cadence range to a slice of the reference grid.
+
+        Parameters
+        ----------
+        start, end : int
+            First and last cadence of the window, inclusive.
+
+        Returns
+        -------
+        slice
+            Positions of ``cadence_reference`` within the window, usable on
+            any array aligned to the reference grid. Empty if no cadence
+            of the observation falls within the window.
 
-        return result
+        See Also
+        --------
+        DataSet.cadence_window : Slices dataset arrays server-side with
+            these bounds.
+        """
+        reference = self.cadences
+        return slice(
+            int(np.searchsorted(reference, start, side="left")),
+            int(np.searchsorted(reference, end, side="right")),
+        )
 
     def __repr__(self) -> str:
         return (
@@ -184,6 +608,147 @@ class Observation(LCDBModel):
         yield "instrument", self.instrument_id
 
 
+class TargetTimeBasis(LCDBModel):
+    """
+    A shared time basis for the target-specific times of one observation.
+
+    Barycentric times of targets within one observation differ only by a
+    smooth, position dependent light travel offset which is linear in the
+    target's unit vector. Every target's times are therefore well
+    described by a common base vector plus a combination of a few shared
+    components, letting :class:`TargetSpecificTime` store a handful of
+    coefficients instead of a full array per target.
+
+    Attributes
+    ----------
+    observation_id : int
+        Primary key and foreign key to the observation
+    base : ndarray[float64]
+        Mean barycentric Julian dates across targets, one per cadence
+    components : ndarray[float64]
+        Orthonormal components of shape ``(rank, n_cadences)``
+    observation : Observation
+        The observation this basis describes
+
+    Notes
+    -----
+    The geometric barycentric correction spans at most three components,
+    so the default rank of 3 reconstructs times to floating point
+    precision. Targets that do not fit keep ``float32`` residuals.
+    """
+
+    __tablename__ = "target_time_basis"
+
+    observation_id: orm.Mapped[int] = orm.mapped_column(
+        sa.ForeignKey("observation.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    base: orm.Mapped[npt.NDArray[np.float64]]
+    components: orm.Mapped[npt.NDArray[np.float64]]
+
+    observation: orm.Mapped["Observation"] = orm.relationship(
+        back_populates="target_time_basis"
+    )
+
+    @classmethod
+    def fit(
+        cls,
+        observation_id: int,
+        dates: npt.ArrayLike,
+        rank: int = 3,
+        sample_size: int = 2048,
+    ) -> "TargetTimeBasis":
+        """
+        Derive a basis from a ``(n_targets, n_cadences)`` date matrix.
+
+        The components are the leading right singular vectors of the
+        mean-centered matrix. At most ``sample_size`` evenly spaced rows
+        are decomposed, which bounds the cost for sector-sized inputs.
+
+        Parameters
+        ----------
+        observation_id : int
+            The observation the basis describes.
+        dates : array-like of float
+            Barycentric Julian dates, one row per target.
+        rank : int, optional
+            Number of components to keep. Defaults to 3.
+        sample_size : int, optional
+            Maximum number of rows used to derive the basis.
+
+        Returns
+        -------
+        TargetTimeBasis
+            A new, transient basis.
+        """
+        dates = np.asarray(dates, dtype=np.float64)
+        if dates.ndim != 2 or len(dates) == 0:
+            raise ValueError("Expected a non-empty (n_targets, n_cadences)")
+        rows = np.unique(
+            np.linspace(0, len(dates) - 1, min(sample_size, len(dates)))
+            .round()
+            .astype(np.int64)
+        )
+        sample = dates[rows]
+        base = sample.mean(axis=0)
+        _, _, components = np.linalg.svd(sample - base, full_matrices=False)
+        return cls(
+            observation_id=observation_id,
+            base=base,
+            components=np.ascontiguousarray(components[:rank]),
+        )
+
+    def project(
+        self, dates: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Express date rows in this basis.
+
+        Returns
+        -------
+        coefficients : ndarray[float64]
+            Shape ``(n_targets, rank)``.
+        residuals : ndarray[float64]
+            What the coefficients fail to reconstruct, shaped like
+            ``dates``.
+        """
+        dates = np.atleast_2d(np.asarray(dates, dtype=np.float64))
+        coefficients = (dates - self.base) @ self.components.T
+        return coefficients, dates - self.reconstruct(coefficients)
+
+    def reconstruct(
+        self,
+        coefficients: npt.ArrayLike,
+        residuals: Optional[npt.ArrayLike] = None,
+    ) -> npt.NDArray[np.float64]:
+        """
+        Rebuild date rows from their coefficients with one matrix product.
+
+        Parameters
+        ----------
+        coefficients : array-like of float
+            Shape ``(n_targets, rank)``, or ``(rank,)`` for a single row.
+        residuals : array-like of float, optional
+            Residuals to add back, broadcastable to the output.
+
+        Returns
+        -------
+        ndarray[float64]
+            Shape ``(n_targets, n_cadences)``, or ``(n_cadences,)``.
+        """
+        dates = np.asarray(coefficients, dtype=np.float64) @ self.components
+        dates += self.base
+        if residuals is not None:
+            dates += residuals
+        return dates
+
+    def __repr__(self) -> str:
+        return (
+            f"<TargetTimeBasis(obs={self.observation_id!r}, "
+            f"rank={len(self.components)!r})>"
+        )
+
+
 class TargetSpecificTime(LCDBModel):
     """
     Time series data specific to a target-observation pair.
@@ -201,8 +766,14 @@ class TargetSpecificTime(LCDBModel):
         Foreign key to the observation (part of composite PK, partition key)
     target_id : int
         Foreign key to the target (part of composite PK)
-    barycentric_julian_dates : ndarray[float64]
-        Array of barycentric Julian dates corrected for target position
+    barycentric_julian_dates : ndarray[float64], optional
+        Array of barycentric Julian dates corrected for target position,
+        None once compressed. Read through :meth:`reconstruct_dates` or
+        :meth:`load_dates` rather than directly.
+    time_coefficients : ndarray[float64], optional
+        Coefficients in the observation's :class:`TargetTimeBasis`
+    time_residuals : ndarray[float32], optional
+        Residuals the basis fails to reconstruct, if above tolerance
     target : Target
         The astronomical target
     observation : Observation
@@ -213,6 +784,10 @@ class TargetSpecificTime(LCDBModel):
     Barycentric correction accounts for Earth's motion around the
     solar system barycenter, providing consistent timing for
     astronomical observations.
+
+    Times may be stored in full or, after :meth:`compress_observation`,
+    as coefficients of a shared per-observation basis. Use
+    :meth:`reconstruct_dates` or :meth:`load_dates` to read either form.
     """
 
     __tablename__ = "target_specific_time"
@@ -221,6 +796,11 @@ class TargetSpecificTime(LCDBModel):
         sa.PrimaryKeyConstraint(
             "observation_id", "target_id", name="pk_target_specific_time"
         ),
+        sa.CheckConstraint(
+            "barycentric_julian_dates IS NOT NULL "
+            "OR time_coefficients IS NOT NULL",
+            name="tst_has_times",
+        ),
         {"postgresql_partition_by": "LIST (observation_id)"},
     )
 
@@ -234,7 +814,13 @@ class TargetSpecificTime(LCDBModel):
         index=True,
     )
 
-    barycentric_julian_dates: orm.Mapped[npt.NDArray[np.float64]]
+    barycentric_julian_dates: orm.Mapped[
+        Optional[npt.NDArray[np.float64]]
+    ] = orm.mapped_column(
+        comment="NULL once compressed, read through load_dates",
+    )
+    time_coefficients: orm.Mapped[Optional[npt.NDArray[np.float64]]]
+    time_residuals: orm.Mapped[Optional[npt.NDArray[np.float32]]]
 
     # Relationships
     target: orm.Mapped["Target"] = orm.relationship(
@@ -244,6 +830,299 @@ class TargetSpecificTime(LCDBModel):
         back_populates="target_specific_times"
     )
 
+    @classmethod
+    def bulk_load_barycentric(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        target_ids: npt.ArrayLike,
+        mid_times: npt.ArrayLike,
+        positions: npt.ArrayLike,
+        ra: npt.ArrayLike,
+        dec: npt.ArrayLike,
+        chunksize: int = 10000,
+        skip_existing: bool = False,
+    ) -> int:
+        """
+        Compute and store barycentric times for every target of an
+        observation.
+
+        The ``(n_targets, n_cadences)`` BJD matrix is computed
+        ``chunksize`` targets at a time with
+        :func:`~lightcurvedb.util.barycentric.barycentric_julian_dates`
+        into a single reused buffer, and each chunk is streamed into
+        ``target_specific_time`` with ``COPY``, so memory stays bounded
+        regardless of the number of targets.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation the times belong to.
+        target_ids : array-like of int
+            Target ids, aligned with ``ra`` and ``dec``.
+        mid_times : array-like of float
+            Cadence mid-times as Julian dates in the TDB scale.
+        positions : array-like of float or Quantity
+            Barycentric spacecraft positions of shape ``(n_cadences, 3)``,
+            in kilometers unless given as a Quantity.
+        ra, dec : array-like of float
+            Target coordinates in degrees.
+        chunksize : int, optional
+            Number of targets computed and copied per batch.
+        skip_existing : bool, optional
+            Skip targets which already have times for this observation
+            instead of failing. Routes each chunk through a staging table.
+
+        Returns
+        -------
+        int
+            The number of rows stored.
+        """
+        columns = ["observation_id", "target_id", "barycentric_julian_dates"]
+        mid_times = np.asarray(mid_times, dtype=np.float64)
+        buffer = np.empty((chunksize, len(mid_times)), dtype=np.float64)
+
+        stored = 0
+        for ids, ra_chunk, dec_chunk in chunkify_aligned(
+            np.asarray(target_ids, dtype=np.int64),
+            ra,
+            dec,
+            chunksize=chunksize,
+        ):
+            dates = barycentric_julian_dates(
+                mid_times,
+                positions,
+                ra_chunk,
+                dec_chunk,
+                out=buffer[: len(ids)],
+            )
+            arrays = [np.full(len(ids), observation_id), ids, dates]
+            if skip_existing:
+                stored += copy_insert_ignore(
+                    session, cls.__tablename__, columns, arrays
+                )
+            else:
+                stored += copy_columns(
+                    session, cls.__tablename__, columns, arrays
+                )
+        return stored
+
+    def reconstruct_dates(self) -> npt.NDArray[np.float64]:
+        """
+        Return this target's barycentric Julian dates in either storage
+        form, loading the observation's basis if compressed.
+        """
+        if self.barycentric_julian_dates is not None:
+            return self.barycentric_julian_dates
+        return self.observation.target_time_basis.reconstruct(
+            self.time_coefficients, self.time_residuals
+        )
+
+    @classmethod
+    def compress_observation(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        rank: int = 3,
+        tolerance: float = 1e-9,
+        chunksize: int = 10000,
+    ) -> int:
+        """
+        Replace an observation's stored date arrays with basis coefficients.
+
+        A :class:`TargetTimeBasis` is fitted to a sample of the stored
+        arrays, unless the observation already has one. Every full array of
+        matching length is then projected onto it chunk by chunk and
+        rewritten with a bulk update by primary key.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation to compress.
+        rank : int, optional
+            Number of basis components for a newly fitted basis.
+        tolerance : float, optional
+            Largest reconstruction error, in days, accepted without also
+            storing ``float32`` residuals. Defaults to 1e-9 (~86 µs).
+        chunksize : int, optional
+            Number of targets projected per update batch.
+
+        Returns
+        -------
+        int
+            The number of targets compressed.
+        """
+        uncompressed = sa.select(cls.target_id).where(
+            cls.observation_id == observation_id,
+            cls.barycentric_julian_dates.is_not(None),
+        )
+        target_ids = np.array(
+            session.scalars(uncompressed.order_by(cls.target_id)).all(),
+            dtype=np.int64,
+        )
+        if len(target_ids) == 0:
+            return 0
+
+        def fetch(ids):
+            return session.execute(
+                sa.select(cls.target_id, cls.barycentric_julian_dates).where(
+                    cls.observation_id == observation_id,
+                    cls.target_id
+                    == sa.any_(
+                        sa.literal(
+                            ids.tolist(), postgresql.ARRAY(sa.BigInteger)
+                        )
+                    ),
+                )
+            ).all()
+
+        basis = session.get(TargetTimeBasis, observation_id)
+        if basis is None:
+            # Fit to evenly spaced targets sharing the most common length
+            step = max(1, len(target_ids) // 2048)
+            rows = fetch(target_ids[::step])
+            lengths = [len(dates) for _, dates in rows]
+            n_cadences = max(set(lengths), key=lengths.count)
+            basis = TargetTimeBasis.fit(
+                observation_id,
+                [dates for _, dates in rows if len(dates) == n_cadences],
+                rank=rank,
+            )
+            session.add(basis)
+            session.flush()
+        n_cadences = basis.components.shape[1]
+
+        compressed = 0
+        for ids in chunkify_array(target_ids, chunksize):
+            rows = [row for row in fetch(ids) if len(row[1]) == n_cadences]
+            if not rows:
+                continue
+            coefficients, residuals = basis.project(
+                np.stack([dates for _, dates in rows])
+            )
+            exceeds = np.abs(residuals).max(axis=1) > tolerance
+            parameters = []
+            for (target_id, _), row_coefficients, row_residuals, exceed in zip(
+                rows, coefficients, residuals, exceeds
+            ):
+                parameters.append(
+                    {
+                        "observation_id": observation_id,
+                        "target_id": target_id,
+                        "barycentric_julian_dates": None,
+                        "time_coefficients": row_coefficients,
+                        "time_residuals": (
+                            row_residuals.astype(np.float32)
+                            if exceed
+                            else None
+                        ),
+                    }
+                )
+            session.execute(sa.update(cls), parameters)
+            compressed += len(rows)
+        return compressed
+
+    @classmethod
+    def load_dates(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        target_ids: Optional[npt.ArrayLike] = None,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """
+        Fetch the barycentric dates of many targets as one matrix.
+
+        Compressed rows are reconstructed together with a single matrix
+        product against the observation's :class:`TargetTimeBasis`.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation to read.
+        target_ids : array-like of int, optional
+            Only read these targets. By default every target is read.
+
+        Returns
+        -------
+        target_ids : ndarray[int64]
+            The targets found, in ascending order.
+        dates : ndarray[float64]
+            Shape ``(len(target_ids), n_cadences)``.
+
+        Raises
+        ------
+        ValueError
+            If the stored arrays differ in length, or compressed rows lack
+            the observation's time basis.
+        """
+        statement = (
+            sa.select(
+                cls.target_id,
+                cls.barycentric_julian_dates,
+                cls.time_coefficients,
+                cls.time_residuals,
+            )
+            .where(cls.observation_id == observation_id)
+            .order_by(cls.target_id)
+        )
+        if target_ids is not None:
+            ids = np.asarray(target_ids, dtype=np.int64).tolist()
+            statement = statement.where(
+                cls.target_id
+                == sa.any_(sa.literal(ids, postgresql.ARRAY(sa.BigInteger)))
+            )
+        rows = session.execute(statement).all()
+        ids = np.array([row.target_id for row in rows], dtype=np.int64)
+        if not rows:
+            return ids, np.empty((0, 0), dtype=np.float64)
+
+        compressed = np.array(
+            [row.barycentric_julian_dates is None for row in rows]
+        )
+        if compressed.any():
+            basis = session.get(TargetTimeBasis, observation_id)
+            if basis is None:
+                raise ValueError(
+                    f"Observation {observation_id} has compressed target "
+                    "times but no time basis"
+                )
+            n_cadences = basis.components.shape[1]
+        else:
+            n_cadences = len(rows[0].barycentric_julian_dates)
+
+        lengths = {
+            len(row.barycentric_julian_dates)
+            for row in compress(rows, ~compressed)
+        }
+        if lengths - {n_cadences}:
+            raise ValueError(
+                f"Observation {observation_id} has target times of differing "
+                "lengths"
+            )
+
+        dates = np.empty((len(rows), n_cadences), dtype=np.float64)
+        if compressed.any():
+            dates[compressed] = basis.reconstruct(
+                np.stack(
+                    [
+                        row.time_coefficients
+                        for row in compress(rows, compressed)
+                    ]
+                )
+            )
+        for i, row in enumerate(rows):
+            if not compressed[i]:
+                dates[i] = row.barycentric_julian_dates
+            elif row.time_residuals is not None:
+                dates[i] += row.time_residuals
+        return ids, dates
+
     def __repr__(self) -> str:
         return (
             f"<TargetSpecificTime(obs={self.observation_id!r}, "
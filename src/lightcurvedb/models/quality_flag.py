@@ -1,17 +1,190 @@
-from typing import TYPE_CHECKING
+import threading
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, ClassVar, Optional, Union
 
 import numpy as np
 import sqlalchemy as sa
 from numpy import typing as npt
 from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.hybrid import hybrid_method
 
 from lightcurvedb.core.base_model import CreatedOnMixin, LCDBModel
+from lightcurvedb.util.iter import chunkify_array
+from lightcurvedb.util.run_length import RunLengthFlags, int32_mask
 
 if TYPE_CHECKING:
     from lightcurvedb.models.observation import Observation
     from lightcurvedb.models.target import Target
 
 
+class FlagBits:
+    """
+    Named bit positions of a quality flag word.
+
+    Parameters
+    ----------
+    definitions : mapping of str to int
+        Bit position, from 0 to 31, of each named quality condition.
+
+    Examples
+    --------
+    >>> bits = FlagBits({"cosmic_ray": 0, "saturated": 1, "anomaly": 4})
+    >>> bits.mask("cosmic_ray", "anomaly")
+    17
+    >>> planes = bits.planes(flag_matrix)  # name -> boolean matrix
+    >>> planes["saturated"].shape == flag_matrix.shape
+    True
+    >>> bits.counts(flag_matrix)["anomaly"]  # flagged cadences per row
+    """
+
+    __slots__ = ("names", "bits")
+
+    def __init__(self, definitions: Mapping[str, int]):
+        ordered = sorted(definitions.items(), key=lambda item: item[1])
+        positions = [int(bit) for _, bit in ordered]
+        if any(not 0 <= bit < 32 for bit in positions):
+            raise ValueError("Flag bits must be positions from 0 to 31")
+        if len(set(positions)) != len(positions):
+            raise ValueError("Flag bits must not share positions")
+        self.names: tuple[str, ...] = tuple(name for name, _ in ordered)
+        self.bits: tuple[int, ...] = tuple(positions)
+
+    def __repr__(self) -> str:
+        pairs = ", ".join(f"{n}={b}" for n, b in zip(self.names, self.bits))
+        return f"<FlagBits({pairs})>"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FlagBits):
+            return NotImplemented
+        return (self.names, self.bits) == (other.names, other.bits)
+
+    def __iter__(self):
+        return iter(zip(self.names, self.bits))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Structured dtype with one boolean field per named bit."""
+        return np.dtype([(name, np.bool_) for name in self.names])
+
+    def mask(self, *names: str) -> int:
+        """
+        Return the mask of the given bits, or of all bits by default.
+
+        Raises
+        ------
+        KeyError
+            If a name is not defined.
+        """
+        positions = dict(self)
+        return sum(1 << positions[name] for name in names or self.names)
+
+    def planes(self, flags: npt.ArrayLike) -> dict[str, npt.NDArray[np.bool_]]:
+        """
+        Split flag words into one boolean array per named bit.
+
+        Parameters
+        ----------
+        flags : array-like of int32
+            Flag words of any shape, e.g. ``(n_targets, n_cadences)``.
+
+        Returns
+        -------
+        dict[str, ndarray[bool]]
+            Boolean arrays shaped like ``flags``.
+        """
+        flags = np.asarray(flags, dtype=np.int32)
+        return {
+            name: (flags & np.int32(int32_mask(1 << bit))) != 0
+            for name, bit in self
+        }
+
+    def decode(self, flags: npt.ArrayLike) -> np.ndarray:
+        """
+        Decode flag words into a structured array of named booleans.
+
+        Parameters
+        ----------
+        flags : array-like of int32
+            Flag words of any shape.
+
+        Returns
+        -------
+        ndarray
+            Array of :attr:`dtype` shaped like ``flags``.
+        """
+        flags = np.asarray(flags, dtype=np.int32)
+        decoded = np.empty(flags.shape, dtype=self.dtype)
+        for name, bit in self:
+            np.not_equal(
+                flags & np.int32(int32_mask(1 << bit)), 0, out=decoded[name]
+            )
+        return decoded
+
+    def counts(
+        self, flags: npt.ArrayLike, axis: Optional[int] = -1
+    ) -> dict[str, Union[int, npt.NDArray[np.int64]]]:
+        """
+        Count the flagged elements of each named bit.
+
+        Parameters
+        ----------
+        flags : array-like of int32
+            Flag words of any shape.
+        axis : int or None, optional
+            Axis to count along, by default the last (cadence) axis so a
+            ``(n_targets, n_cadences)`` matrix gives counts per target.
+            None counts over all elements.
+
+        Returns
+        -------
+        dict[str, int or ndarray[int64]]
+        """
+        flags = np.asarray(flags, dtype=np.int32)
+        return {
+            name: np.count_nonzero(
+                flags & np.int32(int32_mask(1 << bit)), axis=axis
+            )
+            for name, bit in self
+        }
+
+
+_FLAG_BITS: dict[str, FlagBits] = {}
+_FLAG_BITS_LOCK = threading.Lock()
+
+
+def register_flag_bits(
+    type: str, definitions: Union[FlagBits, Mapping[str, int]]
+) -> FlagBits:
+    """
+    Register the bit definitions of a quality flag type.
+
+    Subclasses of :class:`QualityFlagArray` declaring ``bit_definitions``
+    are registered automatically under their polymorphic identity.
+
+    Parameters
+    ----------
+    type : str
+        The polymorphic ``type`` of the flag arrays.
+    definitions : FlagBits or mapping of str to int
+        Bit position of each named quality condition.
+
+    Returns
+    -------
+    FlagBits
+        The registered definitions.
+    """
+    if not isinstance(definitions, FlagBits):
+        definitions = FlagBits(definitions)
+    with _FLAG_BITS_LOCK:
+        _FLAG_BITS[type] = definitions
+    return definitions
+
+
 class QualityFlagArray(LCDBModel, CreatedOnMixin):
     """
     Stores quality flag arrays for astronomical observations.
@@ -33,8 +206,10 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
         Foreign key to the parent observation
     target_id : int, optional
         Foreign key to a specific target when flags are target-specific
-    quality_flags : ndarray[int32]
+    quality_flags : ndarray[int32], optional
         Array of 32-bit integers where each bit represents a quality condition
+    run_length_flags : RunLengthFlags, optional
+        Run-length encoded flags, stored instead of ``quality_flags``
 
     Attributes
     ----------
@@ -46,8 +221,12 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
         Reference to the parent observation
     target_id : int or None
         Reference to specific target (null for observation-wide flags)
-    quality_flags : ndarray[int32]
-        Bit-encoded quality flag array
+    quality_flags : ndarray[int32] or None
+        Bit-encoded quality flag array, None when stored run-length encoded
+    flag_run_values : ndarray[int32] or None
+        Flag word of each run of a run-length encoded array
+    flag_run_lengths : ndarray[int32] or None
+        Number of cadences in each run, aligned with ``flag_run_values``
     observation : Observation
         Parent observation relationship
     target : Target or None
@@ -77,8 +256,8 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
     >>> # Bit 0: Cosmic ray
     >>> # Bit 1: Saturation
     >>> # Bit 2: Bad pixel
-    >>> cosmic_ray_mask = (flags.quality_flags & 1) != 0
-    >>> saturated_mask = (flags.quality_flags & 2) != 0
+    >>> cosmic_ray_mask = (target_flags.flags & 1) != 0
+    >>> saturated_mask = (target_flags.flags & 2) != 0
 
     Extending with single-table inheritance (simple approach):
 
@@ -87,20 +266,23 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
     ...     __mapper_args__ = {
     ...         "polymorphic_identity": "tess_quality",
     ...     }
+    ...     bit_definitions = {
+    ...         "cosmic_ray": 0, "saturated": 1, "spacecraft_anomaly": 4
+    ...     }
     ...     @property
     ...     def cosmic_ray_events(self):
     ...         \"\"\"Return mask of cosmic ray events (bit 0).\"\"\"
-    ...         flags = np.array(self.quality_flags, dtype=np.int32)
+    ...         flags = self.flags
     ...         return (flags & 1) != 0
     ...     @property
     ...     def saturated_pixels(self):
     ...         \"\"\"Return mask of saturated pixels (bit 1).\"\"\"
-    ...         flags = np.array(self.quality_flags, dtype=np.int32)
+    ...         flags = self.flags
     ...         return (flags & 2) != 0
     ...     @property
     ...     def spacecraft_anomaly(self):
     ...         \"\"\"Return mask of spacecraft anomalies (bit 4).\"\"\"
-    ...         flags = np.array(self.quality_flags, dtype=np.int32)
+    ...         flags = self.flags
     ...         return (flags & 16) != 0
 
     Extending with joined-table inheritance (advanced approach)::
@@ -134,7 +316,7 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
             @property
             def wavelength_drift(self):
                 \"\"\"Return mask of wavelength drift (bit 8).\"\"\"
-                flags = np.array(self.quality_flags, dtype=np.int32)
+                flags = self.flags
                 return (flags & 256) != 0
 
         class PhotometricQualityFlags(QualityFlagArray):
@@ -162,6 +344,42 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
                 sa.types.Float, nullable=True
             )
 
+    Filtering and aggregating on flag bits in the database, without
+    loading the arrays:
+
+    >>> # Observation-wide arrays where no cadence has bit 4 set
+    >>> clean = session.scalars(
+    ...     sa.select(QualityFlagArray.observation_id).where(
+    ...         ~QualityFlagArray.any_flagged(1 << 4),
+    ...         QualityFlagArray.target_id.is_(None),
+    ...     )
+    ... ).all()
+    >>> # Fraction of cadences with bits 0 or 1 set, per target
+    >>> fractions = session.execute(
+    ...     sa.select(
+    ...         QualityFlagArray.target_id,
+    ...         QualityFlagArray.flagged_fraction(0b11),
+    ...     )
+    ... ).all()
+    >>> # Flagged cadences summed over an observation's arrays; without
+    >>> # any QualityFlagArray column or filter every array is counted
+    >>> total = session.scalar(
+    ...     sa.select(sa.func.sum(QualityFlagArray.flagged_count(1))).where(
+    ...         QualityFlagArray.observation_id == 12345
+    ...     )
+    ... )
+
+    Storing mostly-zero flags run-length encoded, and combining masks of
+    several arrays without expanding them:
+
+    >>> target_flags.compress()
+    >>> target_flags.quality_flags is None
+    True
+    >>> target_flags.flags  # decoded on access
+    array([0, 0, 2, 8], dtype=int32)
+    >>> either = obs_flags.run_length_flags | target_flags.run_length_flags
+    >>> QualityFlagArray.compress_observation(session, 12345)
+
     Polymorphic querying examples:
 
     >>> # Query all quality flags for an observation
@@ -205,9 +423,16 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
     quality flag array (with NULL target_id) is allowed per type and
     observation_id combination.
 
+    Either ``quality_flags`` or both run-length columns must be stored.
+    Code that may see compressed rows should read :attr:`flags` or
+    :attr:`run_length_flags` rather than ``quality_flags``; the bit mask
+    helpers and their SQL expressions handle both forms.
+
     Quality flag bit definitions are mission and type-specific. Subclasses
-    should document their specific bit meanings and may add helper methods
-    for flag interpretation.
+    declare them as ``bit_definitions``, a mapping of names to bit
+    positions, which registers them for their polymorphic type. Their
+    :class:`FlagBits`, from :meth:`flag_bits`, decode whole flag matrices
+    into named planes and count flagged cadences per bit.
 
     See Also
     --------
@@ -215,11 +440,21 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
     Target : Associated target for target-specific flags
     """
 
+    # Bit name to position; set on subclasses to register their bits
+    bit_definitions: ClassVar[Optional[Mapping[str, int]]] = None
+
     __tablename__ = "quality_flag_array"
     __mapper_args__ = {
         "polymorphic_identity": "base_quality_flag",
         "polymorphic_on": "type",
     }
+    __table_args__ = (
+        sa.CheckConstraint(
+            "quality_flags IS NOT NULL OR (flag_run_values IS NOT NULL "
+            "AND flag_run_lengths IS NOT NULL)",
+            name="qfa_has_flags",
+        ),
+    )
 
     # Primary key - uses BigInteger for large datasets
     id: orm.Mapped[int] = orm.mapped_column(sa.BigInteger, primary_key=True)
@@ -239,7 +474,11 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
 
     # Array of 32-bit integers where each bit represents a quality condition
     # Length should match the observation's cadence array length
-    quality_flags: orm.Mapped[npt.NDArray[np.int32]]
+    quality_flags: orm.Mapped[Optional[npt.NDArray[np.int32]]]
+
+    # Opt-in run-length encoding, replacing quality_flags when set
+    flag_run_values: orm.Mapped[Optional[npt.NDArray[np.int32]]]
+    flag_run_lengths: orm.Mapped[Optional[npt.NDArray[np.int32]]]
 
     observation: orm.Mapped["Observation"] = orm.relationship(
         "Observation", back_populates="quality_flag_arrays"
@@ -248,6 +487,14 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
         "Target", back_populates="quality_flag_arrays"
     )
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        definitions = cls.__dict__.get("bit_definitions")
+        if definitions is not None:
+            register_flag_bits(
+                cls.__mapper__.polymorphic_identity, definitions
+            )
+
     def __repr__(self) -> str:
         target_str = f", target={self.target_id!r}" if self.target_id else ""
         return (
@@ -262,6 +509,495 @@ class QualityFlagArray(LCDBModel, CreatedOnMixin):
         if self.target_id:
             yield "target", self.target_id
 
+    @classmethod
+    def flag_bits(cls, type: Optional[str] = None) -> FlagBits:
+        """
+        Return the registered bit definitions of a flag type.
+
+        Parameters
+        ----------
+        type : str, optional
+            Polymorphic type to look up, by default this class's own.
+
+        Returns
+        -------
+        FlagBits
+
+        Raises
+        ------
+        KeyError
+            If no bit definitions are registered for the type.
+        """
+        if type is None:
+            type = cls.__mapper__.polymorphic_identity
+        try:
+            return _FLAG_BITS[type]
+        except KeyError:
+            raise KeyError(
+                f"No bit definitions registered for flag type {type!r}"
+            ) from None
+
+    def flag_planes(self) -> dict[str, npt.NDArray[np.bool_]]:
+        """Return one boolean array per named bit of this array's type."""
+        return self.flag_bits(self.type).planes(self.flags)
+
+    @property
+    def is_compressed(self) -> bool:
+        """Return True if the flags are stored run-length encoded."""
+        return self.quality_flags is None and self.flag_run_values is not None
+
+    @property
+    def flags(self) -> npt.NDArray[np.int32]:
+        """One flag word per cadence, decoding run-length storage."""
+        if self.is_compressed:
+            return self.run_length_flags.decode()
+        return np.asarray(self._dense_flags(), dtype=np.int32)
+
+    @property
+    def run_length_flags(self) -> RunLengthFlags:
+        """The flags as :class:`~lightcurvedb.util.run_length.RunLengthFlags`.
+
+        Assigning an encoding stores it in place of ``quality_flags``.
+        Raises ValueError if neither representation is set.
+        """
+        if self.is_compressed:
+            return RunLengthFlags(self.flag_run_values, self.flag_run_lengths)
+        return RunLengthFlags.encode(self._dense_flags())
+
+    @run_length_flags.setter
+    def run_length_flags(self, runs: RunLengthFlags) -> None:
+        self.flag_run_values = runs.values
+        self.flag_run_lengths = runs.lengths
+        self.quality_flags = None
+
+    def compress(self) -> None:
+        """
+        Store the flags run-length encoded instead of one word each.
+
+        Raises
+        ------
+        ValueError
+            If neither ``quality_flags`` nor the run columns are set.
+        """
+        if not self.is_compressed:
+            self.run_length_flags = RunLengthFlags.encode(self._dense_flags())
+
+    def decompress(self) -> None:
+        """Store the flags as one ``int32`` word per cadence again."""
+        if self.is_compressed:
+            self.quality_flags = self.flags
+            self.flag_run_values = None
+            self.flag_run_lengths = None
+
+    @classmethod
+    def compress_observation(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        chunksize: int = 10000,
+    ) -> int:
+        """
+        Run-length encode the stored flag arrays of an observation.
+
+        Arrays are encoded chunk by chunk and rewritten with a bulk update
+        by primary key. Arrays whose encoding would not be smaller, i.e.
+        those with more than half as many runs as cadences, stay as they
+        are.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation whose flag arrays, observation-wide and
+            target-specific, are compressed.
+        chunksize : int, optional
+            Number of arrays encoded per update batch.
+
+        Returns
+        -------
+        int
+            The number of arrays compressed.
+        """
+        ids = np.array(
+            session.scalars(
+                sa.select(cls.id)
+                .where(
+                    cls.observation_id == observation_id,
+                    cls.quality_flags.is_not(None),
+                )
+                .order_by(cls.id)
+            ).all(),
+            dtype=np.int64,
+        )
+
+        compressed = 0
+        for chunk in chunkify_array(ids, chunksize):
+            rows = session.execute(
+                sa.select(cls.id, cls.quality_flags).where(
+                    cls.id
+                    == sa.any_(
+                        sa.literal(
+                            chunk.tolist(), postgresql.ARRAY(sa.BigInteger)
+                        )
+                    )
+                )
+            ).all()
+            parameters = []
+            for id_, flags in rows:
+                runs = RunLengthFlags.encode(flags)
+                if 2 * runs.n_runs > len(flags):
+                    continue
+                parameters.append(
+                    {
+                        "id": id_,
+                        "quality_flags": None,
+                        "flag_run_values": runs.values,
+                        "flag_run_lengths": runs.lengths,
+                    }
+                )
+            if parameters:
+                session.execute(sa.update(cls), parameters)
+                compressed += len(parameters)
+        return compressed
+
+    @classmethod
+    def effective_masks(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        target_ids: Optional[npt.ArrayLike] = None,
+        types: Optional[Iterable[str]] = None,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int32]]:
+        """
+        Combine observation-wide and target flags for many targets at once.
+
+        Every flag array of the observation is read with one query. The
+        target-specific arrays of each type are stacked into a matrix and
+        OR-ed together, then the OR of the observation-wide arrays is
+        broadcast across all rows.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation to read.
+        target_ids : array-like of int, optional
+            Targets to build masks for, including those without flags of
+            their own. By default every target with target-specific flags.
+        types : iterable of str, optional
+            Only combine flag arrays of these polymorphic types.
+
+        Returns
+        -------
+        target_ids : ndarray[int64]
+            The targets, in ascending order.
+        masks : ndarray[int32]
+            Effective flag words of shape ``(len(target_ids), n_cadences)``.
+
+        Raises
+        ------
+        ValueError
+            If the stored arrays differ in length, or the observation does
+            not exist.
+
+        Examples
+        --------
+        >>> ids, masks = QualityFlagArray.effective_masks(session, obs.id)
+        >>> usable = (masks & bad_bits) == 0
+        """
+        ids, masks, _ = cls._combine_flags(
+            session, observation_id, target_ids, types
+        )
+        return ids, masks
+
+    @classmethod
+    def observation_mask(
+        cls,
+        session: orm.Session,
+        observation_id: int,
+        types: Optional[Iterable[str]] = None,
+    ) -> npt.NDArray[np.int32]:
+        """
+        Combine the observation-wide flag arrays of an observation.
+
+        This is the effective mask of any target without flags of its own.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        observation_id : int
+            The observation to read.
+        types : iterable of str, optional
+            Only combine flag arrays of these polymorphic types.
+
+        Returns
+        -------
+        ndarray[int32]
+            One flag word per cadence.
+        """
+        _, _, base = cls._combine_flags(session, observation_id, [], types)
+        return base
+
+    @classmethod
+    def _combine_flags(cls, session, observation_id, target_ids, types):
+        statement = sa.select(
+            cls.type,
+            cls.target_id,
+            cls.quality_flags,
+            cls.flag_run_values,
+            cls.flag_run_lengths,
+        ).where(cls.observation_id == observation_id)
+        if types is not None:
+            statement = statement.where(cls.type.in_(list(types)))
+        if target_ids is not None:
+            ids = np.unique(np.asarray(target_ids, dtype=np.int64))
+            statement = statement.where(
+                sa.or_(
+                    cls.target_id.is_(None),
+                    cls.target_id
+                    == sa.any_(
+                        sa.literal(
+                            ids.tolist(), postgresql.ARRAY(sa.BigInteger)
+                        )
+                    ),
+                )
+            )
+        rows = session.execute(statement).all()
+
+        flags = [
+            (
+                np.asarray(row.quality_flags, dtype=np.int32)
+                if row.quality_flags is not None
+                else RunLengthFlags(
+                    row.flag_run_values, row.flag_run_lengths
+                ).decode()
+            )
+            for row in rows
+        ]
+        if target_ids is None:
+            ids = np.unique(
+                np.array(
+                    [
+                        row.target_id
+                        for row in rows
+                        if row.target_id is not None
+                    ],
+                    dtype=np.int64,
+                )
+            )
+
+        lengths = {len(row_flags) for row_flags in flags}
+        if len(lengths) > 1:
+            raise ValueError(
+                f"Observation {observation_id} has quality flags of "
+                "differing lengths"
+            )
+        if lengths:
+            n_cadences = lengths.pop()
+        else:
+            observation = cls.metadata.tables["observation"]
+            grid = cls.metadata.tables["cadence_grid"]
+            n_cadences = session.scalar(
+                sa.select(
+                    sa.func.cardinality(
+                        sa.func.coalesce(
+                            observation.c.cadence_reference, grid.c.cadences
+                        )
+                    )
+                )
+                .select_from(
+                    observation.outerjoin(
+                        grid,
+                        grid.c.digest == observation.c.cadence_grid_digest,
+                    )
+                )
+                .where(observation.c.id == observation_id)
+            )
+            if n_cadences is None:
+                raise ValueError(f"Unknown observation {observation_id}")
+
+        base = np.zeros(n_cadences, dtype=np.int32)
+        masks = np.zeros((len(ids), n_cadences), dtype=np.int32)
+        overrides = defaultdict(list)
+        for row, row_flags in zip(rows, flags):
+            if row.target_id is None:
+                base |= row_flags
+            else:
+                overrides[row.type].append((row.target_id, row_flags))
+        # Targets are unique within a type, so each stack is one scatter
+        for stack in overrides.values():
+            targets, stacked = zip(*stack)
+            masks[np.searchsorted(ids, targets)] |= np.stack(stacked)
+        masks |= base
+        return ids, masks, base
+
+    @hybrid_method
+    def flagged_count(self, mask: int) -> int:
+        """
+        Count the cadences with any bit of ``mask`` set.
+
+        Parameters
+        ----------
+        mask : int
+            Bit mask to test, e.g. ``1 << 4`` or ``0b101``.
+
+        Returns
+        -------
+        int
+            Number of cadences where ``flags & mask != 0``. On the class
+            this is a scalar subquery over the stored runs or array,
+            correlated to the enclosing query's ``quality_flag_array``.
+            If the enclosing query has no such FROM, the subquery spans
+            every stored array instead.
+        """
+        if self.is_compressed:
+            return self.run_length_flags.count(self._signed_mask(mask))
+        return int(np.count_nonzero(self._flag_hits(mask)))
+
+    @flagged_count.expression
+    def flagged_count(cls, mask: int):
+        """SQL expression counting cadences with ``mask`` bits set."""
+        runs = cls._flag_runs()
+        return (
+            cls._select_runs(
+                runs, sa.func.coalesce(sa.func.sum(cls._run_length(runs)), 0)
+            )
+            .where(cls._bits_set(runs, mask))
+            .scalar_subquery()
+        )
+
+    @hybrid_method
+    def any_flagged(self, mask: int) -> bool:
+        """
+        Return True if any cadence has a bit of ``mask`` set.
+
+        Parameters
+        ----------
+        mask : int
+            Bit mask to test.
+
+        Returns
+        -------
+        bool
+            On the class this is an ``EXISTS`` expression usable in
+            ``where()``; negate it to select arrays free of ``mask``.
+        """
+        return bool(self._flag_hits(mask).any())
+
+    @any_flagged.expression
+    def any_flagged(cls, mask: int):
+        """SQL expression testing whether any cadence has ``mask`` set."""
+        runs = cls._flag_runs()
+        return cls._select_runs(runs).where(cls._bits_set(runs, mask)).exists()
+
+    @hybrid_method
+    def all_flagged(self, mask: int) -> bool:
+        """
+        Return True if every cadence has a bit of ``mask`` set.
+
+        Parameters
+        ----------
+        mask : int
+            Bit mask to test.
+
+        Returns
+        -------
+        bool
+            True for empty arrays, matching :func:`numpy.all`.
+        """
+        return bool(self._flag_hits(mask).all())
+
+    @all_flagged.expression
+    def all_flagged(cls, mask: int):
+        """SQL expression testing whether every cadence has ``mask`` set."""
+        runs = cls._flag_runs()
+        return (
+            ~cls._select_runs(runs).where(~cls._bits_set(runs, mask)).exists()
+        )
+
+    @hybrid_method
+    def flagged_fraction(self, mask: int) -> Optional[float]:
+        """
+        Return the fraction of cadences with any bit of ``mask`` set.
+
+        Parameters
+        ----------
+        mask : int
+            Bit mask to test.
+
+        Returns
+        -------
+        float or None
+            Fraction in ``[0, 1]``, or None for an empty array.
+        """
+        hits = self._flag_hits(mask)
+        if hits.size == 0:
+            return None
+        return float(np.count_nonzero(hits)) / hits.size
+
+    @flagged_fraction.expression
+    def flagged_fraction(cls, mask: int):
+        """SQL expression for the fraction of cadences with ``mask`` set."""
+        runs = cls._flag_runs()
+        total = cls._select_runs(
+            runs, sa.func.sum(cls._run_length(runs))
+        ).scalar_subquery()
+        return sa.cast(cls.flagged_count(mask), sa.Float) / sa.func.nullif(
+            total, 0
+        )
+
+    def _dense_flags(self):
+        if self.quality_flags is None:
+            raise ValueError(
+                f"{self!r} has neither quality_flags nor run-length flags"
+            )
+        return self.quality_flags
+
+    @staticmethod
+    def _signed_mask(mask: int) -> int:
+        """Return ``mask`` as the signed int32 the array stores."""
+        if int(mask) == 0:
+            raise ValueError("Mask must have at least one bit set")
+        return int32_mask(mask)
+
+    def _flag_hits(self, mask: int) -> npt.NDArray[np.bool_]:
+        return (self.flags & np.int32(self._signed_mask(mask))) != 0
+
+    @classmethod
+    def _flag_runs(cls):
+        # Dense arrays unnest to runs of length NULL, i.e. one cadence
+        return (
+            sa.func.unnest(
+                sa.func.coalesce(cls.flag_run_values, cls.quality_flags),
+                cls.flag_run_lengths,
+            )
+            .table_valued(
+                sa.column("value", sa.Integer), sa.column("length", sa.Integer)
+            )
+            .render_derived(name="runs")
+        )
+
+    @classmethod
+    def _select_runs(cls, runs, *columns):
+        # Correlated to the enclosing query's flag arrays. Without one, the
+        # table stays in this FROM and the expression spans every array.
+        return (
+            sa.select(*columns or (sa.literal(1),))
+            .select_from(cls.__table__, runs)
+            .correlate(cls.__table__)
+        )
+
+    @staticmethod
+    def _run_length(runs):
+        return sa.func.coalesce(runs.c.length, 1)
+
+    @classmethod
+    def _bits_set(cls, runs, mask: int):
+        return runs.c.value.bitwise_and(cls._signed_mask(mask)) != 0
+
 
 # Create unique index that treats NULL target_id values as equal
 # This ensures only one quality flag array per (type, observation_id,
@@ -1,18 +1,24 @@
 import decimal
+import threading
 import uuid
-from functools import lru_cache
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
+import numpy as np
 import sqlalchemy as sa
 from astropy import time
 from astropy import units as u
+from numpy import typing as npt
 from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
 
 from lightcurvedb.core.base_model import (
     CreatedOnMixin,
     LCDBModel,
     NameAndDescriptionMixin,
 )
+from lightcurvedb.core.bulk import copy_columns, staging_table
 
 if TYPE_CHECKING:
     from lightcurvedb.models.dataset import DataSet
@@ -20,6 +26,40 @@ if TYPE_CHECKING:
     from lightcurvedb.models.quality_flag import QualityFlagArray
 
 
+_MISSION_TIME_FORMATS: dict[str, tuple[tuple, type[time.TimeFromEpoch]]] = {}
+_MISSION_TIME_FORMAT_LOCK = threading.Lock()
+
+
+def _mission_time_format(
+    name: str,
+    unit: str,
+    epoch: decimal.Decimal,
+    epoch_scale: str,
+    epoch_format: str,
+) -> type[time.TimeFromEpoch]:
+    definition = (unit, epoch, epoch_scale, epoch_format)
+    with _MISSION_TIME_FORMAT_LOCK:
+        registered = _MISSION_TIME_FORMATS.get(name)
+        if registered is not None and registered[0] == definition:
+            return registered[1]
+
+        # Subclassing registers the format with astropy under ``name``
+        MissionTime = type(
+            "MissionTime",
+            (time.TimeFromEpoch,),
+            {
+                "name": name,
+                "unit": (1 * getattr(u, unit)).to_value(u.day),
+                "epoch_val": epoch,
+                "epoch_val2": None,
+                "epoch_scale": epoch_scale,
+                "epoch_format": epoch_format,
+            },
+        )
+        _MISSION_TIME_FORMATS[name] = (definition, MissionTime)
+        return MissionTime
+
+
 class Mission(LCDBModel, NameAndDescriptionMixin, CreatedOnMixin):
     """
     Represents a space mission or survey program.
@@ -62,22 +102,60 @@ class Mission(LCDBModel, NameAndDescriptionMixin, CreatedOnMixin):
         primary_key=True, default=uuid.uuid4
     )
 
-    time_unit = orm.Mapped[str]
+    time_unit: orm.Mapped[str]
     time_epoch: orm.Mapped[decimal.Decimal] = orm.mapped_column()
     time_epoch_scale: orm.Mapped[str]
     time_epoch_format: orm.Mapped[str]
     time_format_name: orm.Mapped[str] = orm.mapped_column(unique=True)
 
-    @lru_cache
-    def register_mission_time_epoch(self):
-        class MissionTime(time.TimeEpochDate):
-            name = self.time_format_name
-            unit = 1 * getattr(u, self.time_unit)
-            epoch_val = self.time_epoch
-            epoch_scale = self.time_epoch_scale
-            epoch_format = self.time_epoch_format
+    def register_mission_time_epoch(self) -> type[time.TimeFromEpoch]:
+        """
+        Register this mission's time format with astropy.
 
-        return MissionTime
+        Formats are kept in a process-wide registry keyed by
+        ``time_format_name``, so every loaded copy of a mission shares one
+        astropy format class. A format is only rebuilt if the mission's
+        time definition has changed since it was registered.
+
+        Returns
+        -------
+        type[astropy.time.TimeFromEpoch]
+            The format class, usable as ``Time(values, format=name)``.
+        """
+        return _mission_time_format(
+            self.time_format_name,
+            self.time_unit,
+            self.time_epoch,
+            self.time_epoch_scale,
+            self.time_epoch_format,
+        )
+
+    def to_time(self, values: npt.ArrayLike) -> time.Time:
+        """
+        Interpret mission timestamps as an astropy ``Time``.
+
+        Parameters
+        ----------
+        values : array-like of float
+            Timestamps in this mission's time format, of any shape.
+
+        Returns
+        -------
+        astropy.time.Time
+            A single array-valued ``Time`` in the mission's epoch scale.
+            Convert with its scale attributes, e.g. ``.utc.jd``.
+        """
+        name = self.register_mission_time_epoch().name
+        return time.Time(
+            np.asarray(values, dtype=np.float64), format=name, copy=False
+        )
+
+    def from_time(self, times: time.Time) -> npt.NDArray[np.float64]:
+        """
+        Express an astropy ``Time`` as timestamps in this mission's format.
+        """
+        name = self.register_mission_time_epoch().name
+        return np.asarray(times.to_value(name), dtype=np.float64)
 
     # Relationships
     catalogs: orm.Mapped[list["MissionCatalog"]] = orm.relationship(
@@ -222,6 +300,218 @@ class Target(LCDBModel):
             link.target for link in self._alias_links_as_counterpart
         ]
 
+    @classmethod
+    def alias_loader_options(cls) -> tuple[orm.interfaces.LoaderOption, ...]:
+        """
+        Loader options eagerly fetching both alias positions.
+
+        Pass to ``select(Target).options(*Target.alias_loader_options())``
+        so that :attr:`aliases` and :attr:`aliased_targets` of every loaded
+        target are populated by a fixed number of additional queries
+        instead of two lazy loads per target plus one per counterpart.
+        """
+        return (
+            orm.selectinload(cls._alias_links_as_target).joinedload(
+                Alias.counterpart
+            ),
+            orm.selectinload(cls._alias_links_as_counterpart).joinedload(
+                Alias.target
+            ),
+        )
+
+    @classmethod
+    def load_aliases(
+        cls, session: orm.Session, targets: Iterable["Target"]
+    ) -> dict[int, list["Alias"]]:
+        """
+        Populate the aliases of already loaded targets in bulk.
+
+        Every alias row touching any of ``targets``, in either position, is
+        fetched by a single ``UNION ALL`` query. Counterpart targets not
+        yet in the session are fetched by one more query. Both relationship
+        collections of each target, and both sides of each alias, are then
+        set without further lazy loads.
+
+        Parameters
+        ----------
+        session : orm.Session
+            The session ``targets`` belong to.
+        targets : iterable of Target
+            Persistent targets whose aliases should be loaded.
+
+        Returns
+        -------
+        dict[int, list[Alias]]
+            The aliases of each target keyed by target id, as given by
+            :attr:`aliases`.
+        """
+        targets = list(targets)
+        if not targets:
+            return {}
+
+        ids = sa.literal(
+            sorted({target.id for target in targets}),
+            postgresql.ARRAY(sa.BigInteger),
+        )
+        links = (
+            session.scalars(
+                sa.select(Alias).from_statement(
+                    sa.union_all(
+                        sa.select(Alias).where(
+                            Alias.target_id == sa.any_(ids)
+                        ),
+                        sa.select(Alias).where(
+                            Alias.counterpart_id == sa.any_(ids)
+                        ),
+                    )
+                )
+            )
+            .unique()
+            .all()
+        )
+
+        by_id = {target.id: target for target in targets}
+        missing = {
+            member_id
+            for link in links
+            for member_id in (link.target_id, link.counterpart_id)
+            if member_id not in by_id
+        }
+        if missing:
+            others = session.scalars(
+                sa.select(cls).where(
+                    cls.id
+                    == sa.any_(
+                        sa.literal(
+                            sorted(missing), postgresql.ARRAY(sa.BigInteger)
+                        )
+                    )
+                )
+            )
+            by_id.update((other.id, other) for other in others)
+
+        as_target, as_counterpart = defaultdict(list), defaultdict(list)
+        for link in links:
+            as_target[link.target_id].append(link)
+            as_counterpart[link.counterpart_id].append(link)
+            orm.attributes.set_committed_value(
+                link, "target", by_id[link.target_id]
+            )
+            orm.attributes.set_committed_value(
+                link, "counterpart", by_id[link.counterpart_id]
+            )
+
+        for target in targets:
+            orm.attributes.set_committed_value(
+                target, "_alias_links_as_target", as_target[target.id]
+            )
+            orm.attributes.set_committed_value(
+                target,
+                "_alias_links_as_counterpart",
+                as_counterpart[target.id],
+            )
+        return {target.id: target.aliases for target in targets}
+
+    @classmethod
+    def bulk_get_or_create(
+        cls,
+        session: orm.Session,
+        catalog: MissionCatalog | int,
+        names: npt.ArrayLike,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Resolve catalog identifiers to target ids, creating missing targets.
+
+        Distinct names are inserted in one sorted ``INSERT ... SELECT
+        unnest(...) ON CONFLICT (catalog_id, name) DO NOTHING RETURNING``
+        and names which already existed are fetched by one follow-up
+        select. Concurrent callers skip rather than collide on each other's
+        rows, and the sorted insert order keeps overlapping loads from
+        deadlocking on the unique index.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        catalog : MissionCatalog or int
+            The catalog, or its id, the targets belong to.
+        names : array-like of int
+            Catalog identifiers (e.g. TIC ids), duplicates allowed.
+
+        Returns
+        -------
+        ndarray[int64]
+            Target ids aligned with ``names``.
+
+        Raises
+        ------
+        KeyError
+            If a name was neither inserted nor found afterwards, e.g.
+            because another transaction deleted it in between.
+
+        Notes
+        -----
+        Under the default ``READ COMMITTED`` isolation a name inserted by
+        another transaction in flight is waited on and then found by the
+        follow-up select. Under stricter isolation levels such a name may
+        instead raise a serialization error and the call should be retried.
+        Created targets are not added to the session's identity map.
+        """
+        if isinstance(catalog, MissionCatalog):
+            if catalog.id is None:
+                session.flush()
+            catalog = catalog.id
+        unique_names, inverse = np.unique(
+            np.asarray(names, dtype=np.int64), return_inverse=True
+        )
+        ids = np.full(len(unique_names), -1, dtype=np.int64)
+        if len(unique_names) == 0:
+            return ids
+
+        name_array = sa.literal(
+            unique_names.tolist(), postgresql.ARRAY(sa.BigInteger)
+        )
+        created = session.execute(
+            postgresql.insert(cls)
+            .from_select(
+                ["catalog_id", "name"],
+                sa.select(
+                    sa.literal(catalog, sa.Integer),
+                    sa.func.unnest(name_array),
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=["catalog_id", "name"])
+            .returning(cls.name, cls.id)
+        ).all()
+        pairs = np.array(created, dtype=np.int64).reshape(-1, 2)
+
+        if len(pairs) < len(unique_names):
+            existing = np.setdiff1d(unique_names, pairs[:, 0])
+            rows = session.execute(
+                sa.select(cls.name, cls.id).where(
+                    cls.catalog_id == catalog,
+                    cls.name
+                    == sa.any_(
+                        sa.literal(
+                            existing.tolist(), postgresql.ARRAY(sa.BigInteger)
+                        )
+                    ),
+                )
+            ).all()
+            pairs = np.concatenate(
+                [pairs, np.array(rows, dtype=np.int64).reshape(-1, 2)]
+            )
+
+        order = np.argsort(pairs[:, 0])
+        ids[np.searchsorted(unique_names, pairs[order, 0])] = pairs[order, 1]
+        unresolved = unique_names[ids == -1]
+        if len(unresolved):
+            raise KeyError(
+                f"Targets {unresolved.tolist()} of catalog {catalog} were "
+                "neither created nor found"
+            )
+        return ids[inverse.reshape(-1)]
+
     datasets: orm.Mapped[list["DataSet"]] = orm.relationship(
         back_populates="target"
     )
@@ -287,7 +577,9 @@ class Alias(LCDBModel):
     deterministic dedup key, not a meaningful order.
 
     To enumerate a target's aliases regardless of column, prefer
-    :attr:`Target.aliases` / :attr:`Target.aliased_targets`.
+    :attr:`Target.aliases` / :attr:`Target.aliased_targets`. When listing
+    aliases for many targets, load them in bulk with
+    :meth:`Target.load_aliases` or :meth:`Target.alias_loader_options`.
     """
 
     __tablename__ = "alias"
@@ -338,6 +630,93 @@ class Alias(LCDBModel):
             raise ValueError("a target cannot be aliased to itself")
         return cls(target=a, counterpart=b)
 
+    @staticmethod
+    def unique_pairs(
+        target_ids: npt.ArrayLike, counterpart_ids: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Reduce id pairs to distinct unordered pairs, dropping self-pairs.
+
+        Pairs are canonicalized with least/greatest, the same key used by
+        the ``uq_alias_unordered_pair`` index, so ``(a, b)`` and ``(b, a)``
+        collapse to one pair.
+
+        Returns
+        -------
+        tuple[ndarray[int64], ndarray[int64]]
+            The least and greatest id of every distinct pair.
+        """
+        a = np.asarray(target_ids, dtype=np.int64)
+        b = np.asarray(counterpart_ids, dtype=np.int64)
+        if a.shape != b.shape:
+            raise ValueError("Alias id arrays must be aligned")
+
+        keep = a != b
+        pairs = np.stack(
+            [np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])],
+            axis=1,
+        )
+        pairs = np.unique(pairs.reshape(-1, 2), axis=0)
+        return pairs[:, 0], pairs[:, 1]
+
+    @classmethod
+    def bulk_between(
+        cls,
+        session: orm.Session,
+        target_ids: npt.ArrayLike,
+        counterpart_ids: npt.ArrayLike,
+    ) -> int:
+        """
+        Alias many pairs of target ids at once.
+
+        A bulk counterpart to :meth:`between` for loading cross-match
+        results. Self-pairs and repeated unordered pairs are dropped in
+        NumPy, the remainder is streamed with ``COPY`` into a staging table
+        and inserted with ``ON CONFLICT DO NOTHING`` against the
+        least/greatest index, so pairs already stored are skipped instead
+        of failing the whole load.
+
+        Parameters
+        ----------
+        session : orm.Session
+            Active database session.
+        target_ids : array-like of int
+            Target ids of one side of each pairing.
+        counterpart_ids : array-like of int
+            Target ids of the other side, aligned with ``target_ids``.
+
+        Returns
+        -------
+        int
+            The number of new alias pairs stored.
+        """
+        least, greatest = cls.unique_pairs(target_ids, counterpart_ids)
+        if len(least) == 0:
+            return 0
+
+        columns = ["target_id", "counterpart_id"]
+        with staging_table(session, cls.__tablename__, columns) as name:
+            copy_columns(session, name, columns, [least, greatest])
+            staged = sa.table(name, *(sa.column(c) for c in columns))
+            table = cls.__table__
+            # A Core insert reports its rowcount, no ids are sent back
+            result = session.execute(
+                postgresql.insert(table)
+                .from_select(columns, sa.select(*staged.c))
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        sa.func.least(
+                            table.c.target_id, table.c.counterpart_id
+                        ),
+                        sa.func.greatest(
+                            table.c.target_id, table.c.counterpart_id
+                        ),
+                    ]
+                ),
+                execution_options={"preserve_rowcount": True},
+            )
+            return result.rowcount
+
     def __repr__(self) -> str:
         return (
             f"<Alias(id={self.id!r}, target={self.target_id!r}, "
@@ -0,0 +1,139 @@
+"""
+Vectorized barycentric time correction.
+
+Barycentric Julian dates are computed from the geometric (Rømer) light
+travel time between the spacecraft and the solar system barycenter along
+the direction of each target::
+
+    BJD = t + (r . n) / c
+
+where ``t`` is the cadence mid-time in the TDB scale, ``r`` the barycentric
+spacecraft position and ``n`` the unit vector towards the target. The
+correction for every target and cadence is a single matrix product, so
+whole sectors are corrected without a per-target loop. Shapiro and
+Einstein delays, both at the microsecond level, are neglected.
+"""
+
+from typing import Optional
+
+import numpy as np
+from astropy import constants
+from astropy import units as u
+from numpy import typing as npt
+
+SPEED_OF_LIGHT_KM_PER_DAY = constants.c.to_value(u.km / u.day)
+
+
+def sky_unit_vectors(
+    ra: npt.ArrayLike, dec: npt.ArrayLike
+) -> npt.NDArray[np.float64]:
+    """
+    Convert equatorial coordinates to cartesian unit vectors.
+
+    Parameters
+    ----------
+    ra : array-like of float
+        Right ascensions in degrees.
+    dec : array-like of float
+        Declinations in degrees, aligned with ``ra``.
+
+    Returns
+    -------
+    ndarray[float64]
+        Unit vectors of shape ``(n_targets, 3)``.
+    """
+    ra = np.radians(np.asarray(ra, dtype=np.float64))
+    dec = np.radians(np.asarray(dec, dtype=np.float64))
+    if ra.shape != dec.shape:
+        raise ValueError("ra and dec must be aligned")
+    cos_dec = np.cos(dec)
+    return np.stack(
+        [cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)], axis=-1
+    )
+
+
+def interpolate_positions(
+    ephemeris_times: npt.ArrayLike,
+    positions: npt.ArrayLike,
+    times: npt.ArrayLike,
+) -> npt.NDArray[np.float64]:
+    """
+    Linearly interpolate a position table onto new times.
+
+    Parameters
+    ----------
+    ephemeris_times : array-like of float
+        Monotonically increasing times at which ``positions`` are sampled.
+    positions : array-like of float
+        Positions of shape ``(len(ephemeris_times), 3)``.
+    times : array-like of float
+        Times to interpolate onto, in the same scale as
+        ``ephemeris_times``.
+
+    Returns
+    -------
+    ndarray[float64]
+        Positions of shape ``(len(times), 3)``.
+    """
+    ephemeris_times = np.asarray(ephemeris_times, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    return np.stack(
+        [
+            np.interp(times, ephemeris_times, positions[:, axis])
+            for axis in range(3)
+        ],
+        axis=-1,
+    )
+
+
+def barycentric_julian_dates(
+    mid_times: npt.ArrayLike,
+    positions: npt.ArrayLike,
+    ra: npt.ArrayLike,
+    dec: npt.ArrayLike,
+    out: Optional[npt.NDArray[np.float64]] = None,
+) -> npt.NDArray[np.float64]:
+    """
+    Compute barycentric Julian dates for many targets at once.
+
+    Parameters
+    ----------
+    mid_times : array-like of float
+        Cadence mid-times as Julian dates in the TDB scale.
+    positions : array-like of float or Quantity
+        Barycentric spacecraft positions at each cadence, of shape
+        ``(n_cadences, 3)``. Plain arrays are taken to be in kilometers.
+    ra : array-like of float
+        Target right ascensions in degrees.
+    dec : array-like of float
+        Target declinations in degrees, aligned with ``ra``.
+    out : ndarray[float64], optional
+        A ``(n_targets, n_cadences)`` buffer to write into, letting chunked
+        callers reuse one allocation.
+
+    Returns
+    -------
+    ndarray[float64]
+        Barycentric Julian dates (TDB) of shape ``(n_targets, n_cadences)``.
+
+    Raises
+    ------
+    ValueError
+        If ``positions`` is not aligned with ``mid_times``.
+    """
+    mid_times = np.asarray(mid_times, dtype=np.float64)
+    if isinstance(positions, u.Quantity):
+        positions = positions.to_value(u.km)
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.shape != (len(mid_times), 3):
+        raise ValueError(
+            "Expected one (x, y, z) spacecraft position per cadence"
+        )
+
+    directions = sky_unit_vectors(ra, dec)
+    out = np.matmul(
+        directions, positions.T / SPEED_OF_LIGHT_KM_PER_DAY, out=out
+    )
+    out += mid_times
+    return out
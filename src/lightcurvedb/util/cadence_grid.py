@@ -0,0 +1,139 @@
+"""
+Content-addressed cadence grids.
+
+Every camera and CCD of a sector shares one cadence grid. Grids are
+identified by a digest of their contents, so identical grids are stored
+and indexed once and lookup structures built for one observation serve
+all others on the same grid.
+"""
+
+import hashlib
+
+import numpy as np
+from numpy import typing as npt
+
+# A dense position table is built for irregular grids spanning at most
+# this many cadences per grid element, bounding its memory to a small
+# multiple of the grid itself.
+DENSE_SPAN_FACTOR = 4
+
+
+def cadence_digest(cadences: npt.ArrayLike) -> bytes:
+    """
+    Return the SHA-256 digest identifying a cadence grid.
+
+    Parameters
+    ----------
+    cadences : array-like of int
+        The cadence grid.
+
+    Returns
+    -------
+    bytes
+        32 byte digest of the grid as little-endian ``int64``.
+    """
+    array = np.ascontiguousarray(cadences, dtype="<i8")
+    return hashlib.sha256(array.tobytes()).digest()
+
+
+class CadenceLookup:
+    """
+    A sorted cadence grid with precomputed position lookup.
+
+    The grid's shape is detected once. Contiguous and evenly strided
+    grids, by far the most common, map a cadence to its position with
+    integer arithmetic. For irregular grids without large gaps, the
+    insertion position of every cadence between the first and last is
+    tabulated, so mapping cadences is a single gather. Only sparse
+    irregular grids fall back to a binary search per cadence.
+
+    Parameters
+    ----------
+    cadences : array-like of int
+        Monotonically increasing cadence grid. Copied and made read-only.
+
+    Attributes
+    ----------
+    cadences : ndarray[int64]
+        The read-only grid.
+    digest : bytes
+        The grid's :func:`cadence_digest`.
+    kind : str
+        ``"contiguous"``, ``"strided"`` or ``"irregular"``.
+    step : int or None
+        The spacing of a contiguous or strided grid.
+
+    Examples
+    --------
+    >>> lookup = CadenceLookup([10, 11, 12, 20])
+    >>> lookup.kind
+    'irregular'
+    >>> lookup.searchsorted([11, 20, 25])
+    array([1, 3, 4])
+    """
+
+    __slots__ = ("cadences", "digest", "kind", "step", "_table")
+
+    def __init__(self, cadences: npt.ArrayLike):
+        self.cadences = np.array(cadences, dtype=np.int64)
+        self.cadences.flags.writeable = False
+        self.digest = cadence_digest(self.cadences)
+        self.kind = "irregular"
+        self.step = None
+        self._table = None
+        if len(self.cadences) == 0:
+            return
+
+        steps = np.unique(np.diff(self.cadences))
+        if len(steps) == 0 or (len(steps) == 1 and steps[0] > 0):
+            self.step = int(steps[0]) if len(steps) else 1
+            self.kind = "contiguous" if self.step == 1 else "strided"
+            return
+
+        span = int(self.cadences[-1] - self.cadences[0]) + 1
+        if span <= DENSE_SPAN_FACTOR * len(self.cadences):
+            self._table = np.searchsorted(
+                self.cadences,
+                np.arange(self.cadences[0], self.cadences[-1] + 1),
+            )
+            self._table.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.cadences)
+
+    def __repr__(self) -> str:
+        return f"<CadenceLookup(n={len(self)}, kind={self.kind!r})>"
+
+    def searchsorted(self, observed: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """
+        Find grid positions of cadences.
+
+        Equivalent to ``numpy.searchsorted(cadences, observed)``.
+
+        Parameters
+        ----------
+        observed : array-like of int
+            Cadences to locate.
+
+        Returns
+        -------
+        ndarray[int64]
+            Position of each cadence in the grid, or where it would be
+            inserted if absent.
+        """
+        observed = np.asarray(observed, dtype=np.int64)
+        if self.step is not None:
+            offsets = observed - self.cadences[0]
+            if self.step != 1:
+                # Ceiling division, absent cadences insert after their
+                # preceding grid point
+                offsets = -(-offsets // self.step)
+            return np.clip(offsets, 0, len(self.cadences))
+        if self._table is None:
+            return np.searchsorted(self.cadences, observed)
+
+        offsets = observed - self.cadences[0]
+        positions = self._table[np.clip(offsets, 0, len(self._table) - 1)]
+        positions[offsets < 0] = 0
+        positions[offsets >= len(self._table)] = len(self.cadences)
+        return positions
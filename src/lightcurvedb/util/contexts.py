@@ -1,12 +1,21 @@
+import os
 import re
+from functools import lru_cache
+
+import numpy as np
+from numpy import typing as npt
 
 CONTEXTS = []
 
+_DEFAULT_EXTRACTOR = None
+
 
 def REGISTER(regex):
     """Registers the given regex to the CONTEXT array"""
-    global CONTEXTS
+    global _DEFAULT_EXTRACTOR
     CONTEXTS.append(re.compile(regex))
+    # Compiled extractors are snapshots, drop the stale default
+    _DEFAULT_EXTRACTOR = None
 
 
 def extract_pdo_path_context(path):
@@ -23,6 +32,229 @@ def extract_pdo_path_context(path):
     return found_contexts
 
 
+# An unescaped ``^``, ``$``, ``\A`` or ``\Z``. Negated character classes
+# are matched too, which only costs the pattern its memoization.
+_ANCHOR = re.compile(r"(?:^|[^\\])(?:\\\\)*(?:[\^$]|\\[AZ])")
+
+
+def _is_anchored(pattern):
+    return isinstance(pattern.pattern, str) and bool(
+        _ANCHOR.search(pattern.pattern)
+    )
+
+
+def _lookahead(pattern, marker):
+    return rf"(?:(?=[\s\S]*?(?:{pattern.pattern})(?P<{marker}>)))?"
+
+
+def _merge_patterns(patterns):
+    """
+    Fold consecutive compatible patterns into single-pass regexes.
+
+    Each pattern becomes an optional lookahead anchored at the start of the
+    string, which finds the same leftmost match as ``pattern.search``. An
+    empty marker group records whether the lookahead matched so that
+    patterns which matched with unset optional groups are still
+    distinguishable from patterns which did not match at all.
+
+    Returns a list of ``(compiled, members)`` segments where ``members``
+    holds ``(marker, group_names)`` for every merged pattern, in
+    registration order. Patterns that cannot be merged (bytes patterns,
+    unnamed groups or inline global flags) are kept as-is with ``members``
+    set to None. Differing flags or conflicting group names start a new
+    segment.
+    """
+    segments = []
+    parts, members, flags = [], [], None
+
+    def _flush():
+        nonlocal parts, members, flags
+        if parts:
+            segments.append((re.compile("".join(parts), flags), members))
+        parts, members, flags = [], [], None
+
+    for pattern in patterns:
+        group_names = tuple(pattern.groupindex)
+        if not isinstance(pattern.pattern, str) or pattern.groups != len(
+            group_names
+        ):
+            _flush()
+            segments.append((pattern, None))
+            continue
+
+        seen = {name for _, names in members for name in names}
+        if seen.intersection(group_names) or flags not in (
+            None,
+            pattern.flags,
+        ):
+            _flush()
+
+        part = _lookahead(pattern, f"_ctx_{len(members)}")
+        try:
+            re.compile("".join([*parts, part]), pattern.flags)
+        except re.error:
+            _flush()
+            segments.append((pattern, None))
+            continue
+
+        parts.append(part)
+        members.append((f"_ctx_{len(members)}", group_names))
+        flags = pattern.flags
+
+    _flush()
+    return segments
+
+
+class PathContextExtractor:
+    """
+    A compiled, single-pass version of :func:`extract_pdo_path_context`.
+
+    The registered patterns are folded into as few regexes as possible and
+    evaluated separately against a path's parent directory and its file
+    name. Directory results are memoized, so every file within a
+    ``ccdN`` directory resolves its orbit/sector/camera/ccd context once.
+
+    A pattern matching within the directory takes precedence over a match
+    within the file name, mirroring the leftmost-match behavior of
+    :func:`extract_pdo_path_context`. Patterns are expected not to span a
+    path separator. Anchored patterns, such as the ``$`` terminated
+    ``tic_id`` pattern, would match at the ends of either part and are
+    instead always evaluated against the full path.
+
+    Parameters
+    ----------
+    patterns : list[re.Pattern], optional
+        Patterns to compile. Defaults to a snapshot of the currently
+        registered ``CONTEXTS``.
+    cache_size : int, optional
+        Maximum number of directories to memoize. Defaults to 4096.
+
+    Examples
+    --------
+    >>> extractor = PathContextExtractor()
+    >>> extractor.extract("/pdo/orbit-9/ffi/cam1/ccd2/123.h5")["ccd"]
+    '2'
+    """
+
+    def __init__(self, patterns=None, cache_size=4096):
+        self.patterns = list(CONTEXTS if patterns is None else patterns)
+        anchored = [_is_anchored(pattern) for pattern in self.patterns]
+        self._segments = _merge_patterns(
+            [p for p, a in zip(self.patterns, anchored) if not a]
+        )
+        self._path_segments = _merge_patterns(
+            [p for p, a in zip(self.patterns, anchored) if a]
+        )
+        # (anchored, index within its group) in registration order
+        counts = [0, 0]
+        self._order = []
+        for is_anchored in anchored:
+            self._order.append((is_anchored, counts[is_anchored]))
+            counts[is_anchored] += 1
+        self._directory_matches = lru_cache(maxsize=cache_size)(
+            lambda directory: self._match(directory, self._segments)
+        )
+
+    @staticmethod
+    def _match(text, segments):
+        """
+        Return per-pattern group dictionaries, None where unmatched.
+        """
+        results = []
+        for compiled, members in segments:
+            if members is None:
+                match = compiled.search(text)
+                results.append(match.groupdict() if match else None)
+                continue
+
+            groups = compiled.match(text).groupdict()
+            for marker, group_names in members:
+                if groups[marker] is None:
+                    results.append(None)
+                else:
+                    results.append({key: groups[key] for key in group_names})
+        return tuple(results)
+
+    def extract(self, path):
+        """
+        Extract the registered contexts from the provided path.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path
+            The path to interpret.
+
+        Returns
+        -------
+        dict[str, str]
+            Named capture groups, updated in pattern registration order.
+        """
+        path = str(path)
+        directory, _, name = path.rpartition(os.sep)
+        directory_matches = self._directory_matches(directory)
+        name_matches = None
+        path_matches = self._match(path, self._path_segments)
+
+        found_contexts = {}
+        for anchored, i in self._order:
+            if anchored:
+                groups = path_matches[i]
+            else:
+                groups = directory_matches[i]
+                if groups is None:
+                    if name_matches is None:
+                        name_matches = self._match(name, self._segments)
+                    groups = name_matches[i]
+            if groups:
+                found_contexts.update(groups)
+        return found_contexts
+
+    def extract_many(self, paths) -> dict[str, npt.NDArray]:
+        """
+        Extract contexts for many paths into a columnar result.
+
+        Parameters
+        ----------
+        paths : iterable of str or pathlib.Path
+            The paths to interpret.
+
+        Returns
+        -------
+        dict[str, ndarray]
+            One object array per context key, aligned to ``paths``. Keys
+            not found for a given path are filled with ``None``. The result
+            may be passed directly to ``pandas.DataFrame``.
+        """
+        rows = [self.extract(path) for path in paths]
+        columns = {}
+        for row in rows:
+            for key in row:
+                columns.setdefault(key, None)
+
+        result = {}
+        for key in columns:
+            column = np.empty(len(rows), dtype=object)
+            column[:] = [row.get(key) for row in rows]
+            result[key] = column
+        return result
+
+    def clear_cache(self):
+        """Drop all memoized directory contexts."""
+        self._directory_matches.cache_clear()
+
+
+def compiled_extractor():
+    """
+    Return a shared :class:`PathContextExtractor` for the registered
+    contexts. The extractor is rebuilt after any subsequent
+    :func:`REGISTER` call.
+    """
+    global _DEFAULT_EXTRACTOR
+    if _DEFAULT_EXTRACTOR is None:
+        _DEFAULT_EXTRACTOR = PathContextExtractor()
+    return _DEFAULT_EXTRACTOR
+
+
 # Register basic pdo contexts
 REGISTER(r"orbit-(?P<orbit_number>[0-9]+)")
 REGISTER(r"sector-(?P<sector>[0-9]+)")
@@ -1,5 +1,8 @@
 from collections.abc import Generator, Iterable
-from typing import TypeVar
+from typing import Any, TypeVar
+
+import numpy as np
+from numpy import typing as npt
 
 T = TypeVar("T")
 
@@ -53,6 +56,111 @@ def chunkify(
         yield chunk
 
 
+def chunkify_array(
+    array: npt.ArrayLike, chunksize: int, fillvalue: Any = None
+) -> Generator[npt.NDArray, None, None]:
+    """
+    Chunkify an array into equal sized partitions along its first axis.
+
+    An array-native variant of :func:`chunkify`. Every full chunk is a
+    zero-copy view into ``array``; only the trailing chunk is copied, and
+    only when a ``fillvalue`` requires it to be padded.
+
+    Parameters
+    ----------
+    array
+        Some array-like to chunkify. Non-array inputs are converted with
+        ``np.asarray``.
+    chunksize
+        The size of the returned partitions. Must be greater than 0.
+    fillvalue
+        If the last partition has length < chunksize, right pad the
+        partition with the ``fillvalue`` until the wanted partition size
+        is reached.
+
+    Yields
+    ------
+    ndarray
+        A partition of ``array`` of length <= chunksize.
+
+    Raises
+    ------
+    ValueError
+        For chunksize < 1.
+    """
+    for (chunk,) in chunkify_aligned(
+        array, chunksize=chunksize, fillvalue=fillvalue
+    ):
+        yield chunk
+
+
+def chunkify_aligned(
+    *arrays: npt.ArrayLike, chunksize: int, fillvalue: Any = None
+) -> Generator[tuple[npt.NDArray, ...], None, None]:
+    """
+    Chunkify several aligned arrays together along their first axis.
+
+    Useful for walking parallel columns (e.g. target ids alongside their
+    observation ids) in lockstep. Each yielded tuple holds one zero-copy
+    view per input array. When a ``fillvalue`` is given, only the trailing
+    partial chunk is copied into a padded buffer.
+
+    Parameters
+    ----------
+    *arrays
+        Array-likes sharing the same length along the first axis.
+    chunksize
+        The size of the returned partitions. Must be greater than 0.
+    fillvalue
+        If the last partition has length < chunksize, right pad each
+        partition with the ``fillvalue`` until the wanted partition size
+        is reached.
+
+    Yields
+    ------
+    tuple[ndarray, ...]
+        A partition of each array, in the order given, of length
+        <= chunksize.
+
+    Raises
+    ------
+    ValueError
+        For chunksize < 1 or if the arrays differ in length.
+    """
+    if chunksize < 1:
+        raise ValueError("Chunkify command cannot have a chunksize < 1")
+
+    columns = tuple(np.asarray(array) for array in arrays)
+    if not columns:
+        return
+
+    length = len(columns[0])
+    if any(len(column) != length for column in columns):
+        raise ValueError("Aligned arrays must share the same length")
+
+    n_full, remainder = divmod(length, chunksize)
+    for start in range(0, n_full * chunksize, chunksize):
+        stop = start + chunksize
+        yield tuple(column[start:stop] for column in columns)
+
+    # Cleanup
+    if remainder > 0:
+        start = n_full * chunksize
+        if fillvalue is None:
+            yield tuple(column[start:] for column in columns)
+        else:
+            padded = []
+            for column in columns:
+                buffer = np.full(
+                    (chunksize, *column.shape[1:]),
+                    fillvalue,
+                    dtype=np.result_type(column, fillvalue),
+                )
+                buffer[:remainder] = column[start:]
+                padded.append(buffer)
+            yield tuple(padded)
+
+
 def eq_partitions(iterable: Iterable[T], n: int) -> tuple[list[T], ...]:
     """
     Create ``n`` partitions and distribute the iterable as equally as possible.
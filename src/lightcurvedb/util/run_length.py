@@ -0,0 +1,232 @@
+"""
+Run-length encoded quality flag arrays.
+
+Quality flags are almost always zero, with short runs of set bits around
+momentum dumps, scattered light and similar events. Storing one
+``(value, length)`` pair per run of identical flag words is far smaller
+than one ``int32`` per cadence, decodes with a single :func:`numpy.repeat`
+and lets masks of several arrays be combined run by run, without ever
+expanding them to full length.
+"""
+
+from functools import reduce
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+from numpy import typing as npt
+
+BitwiseOp = Callable[
+    [npt.NDArray[np.int32], npt.NDArray[np.int32]], npt.NDArray
+]
+
+
+def int32_mask(bits: int) -> int:
+    """
+    Return a 32-bit mask as the signed ``int32`` value flags are stored as.
+
+    Parameters
+    ----------
+    bits : int
+        Mask in ``[0, 2**32)``, e.g. ``1 << 31``.
+
+    Returns
+    -------
+    int
+        The mask in ``[-2**31, 2**31)``.
+
+    Raises
+    ------
+    ValueError
+        If ``bits`` does not fit in 32 bits.
+    """
+    bits = int(bits)
+    if not 0 <= bits < 1 << 32:
+        raise ValueError(f"Mask {bits!r} does not fit in 32 bits")
+    return bits - (1 << 32) if bits >= 1 << 31 else bits
+
+
+class RunLengthFlags:
+    """
+    A flag array stored as runs of identical ``int32`` words.
+
+    Runs are canonical: no run is empty and adjacent runs always differ,
+    so equal flag arrays have equal encodings.
+
+    Parameters
+    ----------
+    values : array-like of int32
+        The flag word of each run.
+    lengths : array-like of int
+        The number of cadences in each run, aligned with ``values``.
+
+    Examples
+    --------
+    >>> runs = RunLengthFlags.encode(np.array([0, 0, 4, 4, 0], np.int32))
+    >>> runs.values, runs.lengths
+    (array([0, 4, 0], dtype=int32), array([2, 2, 1], dtype=int32))
+    >>> combined = runs | RunLengthFlags.encode(other_flags)
+    >>> combined.decode()
+    """
+
+    __slots__ = ("values", "lengths")
+
+    def __init__(self, values: npt.ArrayLike, lengths: npt.ArrayLike):
+        values = np.asarray(values, dtype=np.int32)
+        lengths = np.asarray(lengths, dtype=np.int32)
+        if values.shape != lengths.shape or values.ndim != 1:
+            raise ValueError("values and lengths must be aligned 1D arrays")
+        if (lengths < 0).any():
+            raise ValueError("Run lengths may not be negative")
+        self.values, self.lengths = self._canonical(values, lengths)
+
+    @classmethod
+    def encode(cls, flags: npt.ArrayLike) -> "RunLengthFlags":
+        """
+        Run-length encode a flag array.
+
+        Parameters
+        ----------
+        flags : array-like of int32
+            One flag word per cadence.
+
+        Returns
+        -------
+        RunLengthFlags
+        """
+        flags = np.asarray(flags, dtype=np.int32).ravel()
+        if len(flags) == 0:
+            return cls([], [])
+        starts = np.flatnonzero(np.diff(flags)) + 1
+        starts = np.concatenate(([0], starts))
+        lengths = np.diff(np.append(starts, len(flags)))
+        return cls(flags[starts], lengths)
+
+    @classmethod
+    def combine(
+        cls,
+        runs: Iterable["RunLengthFlags"],
+        op: BitwiseOp = np.bitwise_or,
+    ) -> "RunLengthFlags":
+        """
+        Fold many equal length encodings together with a bitwise operator.
+
+        Parameters
+        ----------
+        runs : iterable of RunLengthFlags
+            Encodings covering the same cadences.
+        op : callable, optional
+            Element-wise operator, defaults to :func:`numpy.bitwise_or`.
+
+        Returns
+        -------
+        RunLengthFlags
+        """
+        return reduce(lambda left, right: left._merge(right, op), runs)
+
+    def __len__(self) -> int:
+        return int(self.lengths.sum(dtype=np.int64))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RunLengthFlags):
+            return NotImplemented
+        return bool(
+            np.array_equal(self.values, other.values)
+            and np.array_equal(self.lengths, other.lengths)
+        )
+
+    def __repr__(self) -> str:
+        return f"<RunLengthFlags(cadences={len(self)}, runs={self.n_runs})>"
+
+    def __and__(self, other: "RunLengthFlags") -> "RunLengthFlags":
+        return self._merge(other, np.bitwise_and)
+
+    def __or__(self, other: "RunLengthFlags") -> "RunLengthFlags":
+        return self._merge(other, np.bitwise_or)
+
+    @property
+    def n_runs(self) -> int:
+        """Number of stored runs."""
+        return len(self.values)
+
+    def decode(
+        self, out: Optional[npt.NDArray[np.int32]] = None
+    ) -> npt.NDArray[np.int32]:
+        """
+        Expand back to one ``int32`` flag word per cadence.
+
+        Parameters
+        ----------
+        out : ndarray[int32], optional
+            Buffer of ``len(self)`` elements to write into.
+
+        Returns
+        -------
+        ndarray[int32]
+        """
+        decoded = np.repeat(self.values, self.lengths)
+        if out is None:
+            return decoded
+        out[...] = decoded
+        return out
+
+    def mask(self, bits: int) -> "RunLengthFlags":
+        """
+        Keep only the given bits of every run.
+
+        Parameters
+        ----------
+        bits : int
+            Bit mask to keep.
+
+        Returns
+        -------
+        RunLengthFlags
+        """
+        return RunLengthFlags(
+            self.values & np.int32(int32_mask(bits)), self.lengths
+        )
+
+    def count(self, bits: int) -> int:
+        """
+        Count the cadences with any of ``bits`` set.
+
+        Parameters
+        ----------
+        bits : int
+            Bit mask to test.
+
+        Returns
+        -------
+        int
+        """
+        hits = (self.values & np.int32(int32_mask(bits))) != 0
+        return int(self.lengths[hits].sum(dtype=np.int64))
+
+    def _merge(self, other: "RunLengthFlags", op: BitwiseOp):
+        if len(self) != len(other):
+            raise ValueError(
+                f"Cannot combine {len(self)} and {len(other)} cadences"
+            )
+        if self.n_runs == 0:
+            return self
+        ends = np.cumsum(self.lengths, dtype=np.int64)
+        other_ends = np.cumsum(other.lengths, dtype=np.int64)
+        boundaries = np.union1d(ends, other_ends)
+        starts = np.concatenate(([0], boundaries[:-1]))
+        values = op(
+            self.values[np.searchsorted(ends, starts, side="right")],
+            other.values[np.searchsorted(other_ends, starts, side="right")],
+        )
+        return RunLengthFlags(values, np.diff(boundaries, prepend=0))
+
+    @staticmethod
+    def _canonical(values, lengths):
+        keep = lengths > 0
+        values, lengths = values[keep], lengths[keep]
+        if len(values) < 2:
+            return values, lengths
+        starts = np.concatenate(([True], values[1:] != values[:-1]))
+        if starts.all():
+            return values, lengths
+        first = np.flatnonzero(starts)
+        return values[first], np.add.reduceat(lengths, first)
@@ -9,6 +9,8 @@ from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
 from lightcurvedb.core.base_model import LCDBModel
+from lightcurvedb.core.reference_cache import invalidate_reference_tables
+from lightcurvedb.io.alias_graph import invalidate_alias_graph
 
 
 def get_test_database_name(request):
@@ -132,6 +134,10 @@ def v2_db(worker_database):
     # Create tables for this test
     LCDBModel.metadata.create_all(bind=engine, checkfirst=True)
 
+    # Tables are recreated under the same URL, drop per-database caches
+    invalidate_alias_graph()
+    invalidate_reference_tables()
+
     # Create default partition for the partitioned dataset table
     # This is required because the dataset table uses LIST partitioning
     with engine.connect() as conn:
@@ -153,6 +159,12 @@ def v2_db(worker_database):
                 "PARTITION OF datasethierarchy DEFAULT"
             )
         )
+        conn.execute(
+            sa.text(
+                "CREATE TABLE IF NOT EXISTS dataset_statistics_default "
+                "PARTITION OF dataset_statistics DEFAULT"
+            )
+        )
         conn.commit()
 
     Session = sessionmaker()
@@ -185,8 +197,3 @@ def v2_db(worker_database):
 def tempdir():
     with TemporaryDirectory() as _tmpdir:
         yield pathlib.Path(_tmpdir)
-
-
-def ensure_directory(path: pathlib.Path):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    return path
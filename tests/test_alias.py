@@ -8,13 +8,21 @@ without those others aliasing each other.
 
 import uuid
 
+import numpy as np
 import pytest
 from hypothesis import assume, given
-from sqlalchemy import delete, exc, orm
-
+from hypothesis import strategies as st
+from sqlalchemy import delete, exc, orm, select
+
+from lightcurvedb.io.alias_graph import (
+    AliasGraph,
+    alias_graph,
+    invalidate_alias_graph,
+)
 from lightcurvedb.models import Alias, Mission, MissionCatalog, Target
 
 from .strategies import tess as tess_st
+from .util import QueryCounter
 
 
 def _make_catalog(
@@ -265,3 +273,222 @@ class TestAliasSemantics:
         # Non-transitive: Y and Z never see each other.
         assert z.id not in {t.id for t in y.aliased_targets}
         assert y.id not in {t.id for t in z.aliased_targets}
+
+
+class TestAliasBulkBetween:
+    """Bulk loading of alias pairs from id arrays."""
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.integers(min_value=1, max_value=30),
+                st.integers(min_value=1, max_value=30),
+            ),
+            max_size=60,
+        )
+    )
+    def test_unique_pairs(self, pairs):
+        """Self-pairs vanish and both orderings collapse to one pair."""
+        a = [x for x, _ in pairs]
+        b = [y for _, y in pairs]
+
+        least, greatest = Alias.unique_pairs(a, b)
+
+        expected = {(min(x, y), max(x, y)) for x, y in pairs if x != y}
+        assert set(zip(least.tolist(), greatest.tolist())) == expected
+        assert len(least) == len(expected)
+
+    def test_bulk_between_reports_new_pairs(self, v2_db: orm.Session):
+        catalog = _make_catalog(v2_db, "BULK_MISSION")
+        targets = [_make_target(v2_db, catalog, 10000 + i) for i in range(4)]
+        ids = [t.id for t in targets]
+        v2_db.add(Alias.between(targets[0], targets[1]))
+        v2_db.commit()
+
+        created = Alias.bulk_between(
+            v2_db,
+            # (1, 0) already exists, (2, 2) is a self pair, (3, 2) repeats
+            [ids[1], ids[2], ids[2], ids[3]],
+            [ids[0], ids[2], ids[3], ids[2]],
+        )
+        v2_db.commit()
+
+        assert created == 1
+        assert v2_db.query(Alias).count() == 2
+
+    def test_bulk_between_invalidates_graph(self, v2_db: orm.Session):
+        invalidate_alias_graph()
+        catalog = _make_catalog(v2_db, "BULK_GRAPH_MISSION")
+        a = _make_target(v2_db, catalog, 11001)
+        b = _make_target(v2_db, catalog, 11002)
+        v2_db.commit()
+        assert len(alias_graph(v2_db)) == 0
+
+        Alias.bulk_between(v2_db, [a.id], [b.id])
+        v2_db.commit()
+
+        assert len(alias_graph(v2_db)) == 2
+
+    def test_bulk_between_empty(self, v2_db: orm.Session):
+        assert Alias.bulk_between(v2_db, [1, 2], [1, 2]) == 0
+
+
+class TestBatchAliasLoading:
+    """Constant-query alias loading for many targets."""
+
+    @pytest.fixture
+    def aliased_targets(self, v2_db: orm.Session) -> list[int]:
+        """Ten targets, each aliased to the next on alternating sides."""
+        catalog = _make_catalog(v2_db, "BATCH_MISSION")
+        targets = [_make_target(v2_db, catalog, 12000 + i) for i in range(10)]
+        for a, b in zip(targets, targets[1:]):
+            v2_db.add(
+                Alias.between(a, b) if a.name % 2 else Alias.between(b, a)
+            )
+        v2_db.commit()
+        ids = [t.id for t in targets]
+        v2_db.expunge_all()
+        return ids
+
+    def _expected(self, ids, target_id):
+        i = ids.index(target_id)
+        return {ids[j] for j in (i - 1, i + 1) if 0 <= j < len(ids)}
+
+    def test_load_aliases_is_constant_query(
+        self, v2_db: orm.Session, aliased_targets: list[int]
+    ):
+        ids = aliased_targets
+        # Only load every other target so counterparts must be fetched.
+        targets = v2_db.scalars(
+            select(Target).where(Target.id.in_(ids[::2]))
+        ).all()
+
+        with QueryCounter(v2_db) as counter:
+            loaded = Target.load_aliases(v2_db, targets)
+            resolved = {
+                t.id: {other.id for other in t.aliased_targets}
+                for t in targets
+            }
+
+        assert counter.count == 2
+        for target in targets:
+            assert resolved[target.id] == self._expected(ids, target.id)
+            assert len(loaded[target.id]) == len(resolved[target.id])
+
+    def test_loader_options(
+        self, v2_db: orm.Session, aliased_targets: list[int]
+    ):
+        ids = aliased_targets
+
+        with QueryCounter(v2_db) as counter:
+            targets = v2_db.scalars(
+                select(Target)
+                .where(Target.id.in_(ids))
+                .options(*Target.alias_loader_options())
+            ).all()
+            resolved = {
+                t.id: {other.id for other in t.aliased_targets}
+                for t in targets
+            }
+
+        assert counter.count == 3
+        for target_id in ids:
+            assert resolved[target_id] == self._expected(ids, target_id)
+
+    def test_load_aliases_empty(self, v2_db: orm.Session):
+        assert Target.load_aliases(v2_db, []) == {}
+
+
+class TestAliasGraph:
+    """Connected-component resolution over alias edges."""
+
+    def test_components_follow_chains(self):
+        """Transitive closure is what the graph adds over raw aliases."""
+        graph = AliasGraph([1, 2, 10], [2, 3, 11])
+
+        np.testing.assert_array_equal(
+            graph.component_of([1, 2, 3, 10, 11]), [1, 1, 1, 10, 10]
+        )
+        assert graph.n_components == 2
+
+    def test_unaliased_targets_map_to_themselves(self):
+        graph = AliasGraph([5], [7])
+        np.testing.assert_array_equal(
+            graph.component_of([1, 6, 99]), [1, 6, 99]
+        )
+        np.testing.assert_array_equal(graph.members(6), [6])
+
+    def test_empty_graph(self):
+        graph = AliasGraph([], [])
+        assert len(graph) == 0
+        np.testing.assert_array_equal(graph.component_of([3, 4]), [3, 4])
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.integers(min_value=1, max_value=50),
+                st.integers(min_value=1, max_value=50),
+            ),
+            max_size=60,
+        )
+    )
+    def test_members_share_a_representative(self, edges):
+        targets = [a for a, _ in edges]
+        counterparts = [b for _, b in edges]
+        graph = AliasGraph(targets, counterparts)
+
+        for a, b in edges:
+            ra, rb = graph.component_of([a, b])
+            assert ra == rb
+            assert ra == graph.members(a).min()
+
+
+class TestAliasGraphCache:
+    """The cached graph tracks alias changes made through the ORM."""
+
+    def test_cached_graph_resolves_split(self, v2_db: orm.Session):
+        invalidate_alias_graph()
+        catalog = _make_catalog(v2_db, "GRAPH_MISSION")
+        x = _make_target(v2_db, catalog, 9101)
+        y = _make_target(v2_db, catalog, 9102)
+        z = _make_target(v2_db, catalog, 9103)
+        v2_db.add_all([Alias.between(x, y), Alias.between(x, z)])
+        v2_db.commit()
+
+        graph = alias_graph(v2_db)
+
+        # Y and Z are not aliases of each other, but share a component.
+        ry, rz = graph.component_of([y.id, z.id])
+        assert ry == rz == min(x.id, y.id, z.id)
+        assert alias_graph(v2_db) is graph
+
+    def test_flush_invalidates(self, v2_db: orm.Session):
+        invalidate_alias_graph()
+        catalog = _make_catalog(v2_db, "GRAPH_FLUSH_MISSION")
+        a = _make_target(v2_db, catalog, 9201)
+        b = _make_target(v2_db, catalog, 9202)
+        v2_db.commit()
+
+        before = alias_graph(v2_db)
+        assert len(before) == 0
+
+        v2_db.add(Alias.between(a, b))
+        v2_db.commit()
+
+        after = alias_graph(v2_db)
+        assert after is not before
+        assert after.component_of([b.id])[0] == min(a.id, b.id)
+
+    def test_rollback_invalidates(self, v2_db: orm.Session):
+        invalidate_alias_graph()
+        catalog = _make_catalog(v2_db, "GRAPH_ROLLBACK_MISSION")
+        a = _make_target(v2_db, catalog, 9301)
+        b = _make_target(v2_db, catalog, 9302)
+        v2_db.commit()
+
+        v2_db.add(Alias.between(a, b))
+        v2_db.flush()
+        assert len(alias_graph(v2_db)) == 2
+        v2_db.rollback()
+
+        assert len(alias_graph(v2_db)) == 0
@@ -0,0 +1,181 @@
+"""Test server-side statistics over float8[] columns."""
+
+import uuid
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+from sqlalchemy import orm
+
+from lightcurvedb.core.array_functions import (
+    array_mad,
+    array_mean,
+    array_median,
+    array_nan_count,
+    array_percentile,
+    array_percentiles,
+    install_array_functions,
+)
+from lightcurvedb.models import (
+    DataSet,
+    DataSetStatistics,
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    Target,
+)
+
+
+def _evaluate(session, function, values, *args):
+    array = sa.literal(
+        np.asarray(values).tolist(), sa.ARRAY(sa.Float, as_tuple=False)
+    )
+    return session.scalar(sa.select(function(array, *args)))
+
+
+@pytest.fixture
+def datasets(v2_db: orm.Session):
+    """Three datasets of one observation."""
+    mission = Mission(
+        id=uuid.uuid4(),
+        name="ARRAY_FUNCTION_MISSION",
+        description="Mission for array functions",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="array_function_time",
+    )
+    catalog = MissionCatalog(
+        name="ARRAY_FUNCTION_CATALOG",
+        description="Catalog",
+        host_mission=mission,
+    )
+    observation = Observation(
+        cadence_reference=np.arange(5),
+        instrument=Instrument(name="Array Function Instrument", properties={}),
+    )
+    datasets = [
+        DataSet(
+            observation=observation,
+            target=Target(catalog=catalog, name=i),
+            values=values,
+        )
+        for i, values in enumerate(
+            [
+                np.array([1.0, 2.0, 3.0, 4.0, 100.0]),
+                np.array([np.nan, 2.0, np.inf, 4.0, np.nan]),
+                np.full(5, np.nan),
+            ]
+        )
+    ]
+    v2_db.add_all([mission, catalog, observation, *datasets])
+    v2_db.commit()
+    return datasets
+
+
+def test_statistics_of_dataset_values(v2_db: orm.Session, datasets):
+    rows = v2_db.execute(
+        sa.select(
+            array_mean(DataSet.values),
+            array_median(DataSet.values),
+            array_mad(DataSet.values),
+            array_percentile(DataSet.values, 0.25),
+            array_percentiles(DataSet.values, [0.0, 1.0]),
+            array_nan_count(DataSet.values),
+        )
+        .where(DataSet.observation_id == datasets[0].observation_id)
+        .order_by(DataSet.target_id)
+    ).all()
+
+    mean, median, mad, quartile, extremes, nans = rows[0]
+    assert mean == 22.0
+    assert median == 3.0
+    assert mad == 1.0
+    assert quartile == 2.0
+    np.testing.assert_array_equal(extremes, [1.0, 100.0])
+    assert nans == 0
+
+    mean, median, mad, quartile, extremes, nans = rows[1]
+    assert (mean, median, mad, quartile) == (3.0, 3.0, 1.0, 2.5)
+    np.testing.assert_array_equal(extremes, [2.0, 4.0])
+    assert nans == 2
+
+    mean, median, mad, quartile, extremes, nans = rows[2]
+    assert mean is None and median is None and mad is None
+    assert quartile is None and extremes is None
+    assert nans == 5
+
+
+def test_functions_match_persisted_statistics(v2_db: orm.Session, datasets):
+    DataSetStatistics.backfill(v2_db)
+    v2_db.commit()
+
+    mismatched = v2_db.scalar(
+        sa.select(sa.func.count())
+        .select_from(DataSet)
+        .join(DataSet.statistics)
+        .where(
+            sa.or_(
+                array_median(DataSet.values).is_distinct_from(
+                    DataSetStatistics.median
+                ),
+                array_mad(DataSet.values).is_distinct_from(
+                    DataSetStatistics.mad
+                ),
+            )
+        )
+    )
+
+    assert mismatched == 0
+
+
+def test_available_through_func_package(v2_db: orm.Session):
+    expression = sa.func.lcdb.array_median(sa.literal([1.0, 5.0, 9.0]))
+
+    assert isinstance(expression, array_median)
+    assert v2_db.scalar(sa.select(expression)) == 5.0
+
+
+def test_install_is_idempotent(v2_db: orm.Session):
+    install_array_functions(v2_db)
+    install_array_functions(v2_db)
+
+    assert _evaluate(v2_db, array_mean, [1.0, 3.0]) == 2.0
+
+
+@settings(
+    max_examples=25,
+    deadline=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture],
+)
+@given(
+    hnp.arrays(
+        np.float64,
+        st.integers(1, 32),
+        elements=st.one_of(st.floats(-1e6, 1e6), st.just(np.nan)),
+    ),
+    st.floats(0, 1),
+)
+def test_matches_numpy(v2_db: orm.Session, values, fraction):
+    finite = values[np.isfinite(values)]
+
+    assert _evaluate(v2_db, array_nan_count, values) == np.isnan(values).sum()
+    if len(finite) == 0:
+        assert _evaluate(v2_db, array_median, values) is None
+        return
+    np.testing.assert_allclose(
+        _evaluate(v2_db, array_mean, values), np.mean(finite), atol=1e-6
+    )
+    np.testing.assert_allclose(
+        _evaluate(v2_db, array_median, values), np.median(finite)
+    )
+    np.testing.assert_allclose(
+        _evaluate(v2_db, array_percentile, values, fraction),
+        np.quantile(finite, fraction),
+        atol=1e-6,
+    )
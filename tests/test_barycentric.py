@@ -0,0 +1,79 @@
+"""Test vectorized barycentric time correction."""
+
+import numpy as np
+import pytest
+from astropy import units as u
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+
+from lightcurvedb.util.barycentric import (
+    SPEED_OF_LIGHT_KM_PER_DAY,
+    barycentric_julian_dates,
+    interpolate_positions,
+    sky_unit_vectors,
+)
+
+AU_KM = (1 * u.au).to_value(u.km)
+
+
+def test_light_travel_along_line_of_sight():
+    """One AU towards or away from a target is about 499 seconds."""
+    positions = np.array([[AU_KM, 0.0, 0.0], [-AU_KM, 0.0, 0.0]])
+    mid_times = np.array([2458000.0, 2458000.5])
+
+    bjd = barycentric_julian_dates(
+        mid_times, positions, ra=[0.0, 90.0], dec=[0.0, 0.0]
+    )
+
+    delay = AU_KM / SPEED_OF_LIGHT_KM_PER_DAY * 86400
+    assert delay == pytest.approx(499.005, abs=1e-3)
+    np.testing.assert_allclose(
+        (bjd - mid_times) * 86400, [[delay, -delay], [0.0, 0.0]], atol=1e-6
+    )
+
+
+def test_quantity_positions():
+    positions = np.array([[1.0, 0.0, 0.0]]) * u.au
+    bjd = barycentric_julian_dates([0.0], positions, ra=[0.0], dec=[0.0])
+    assert bjd[0, 0] == pytest.approx(AU_KM / SPEED_OF_LIGHT_KM_PER_DAY)
+
+
+def test_rejects_misaligned_positions():
+    with pytest.raises(ValueError):
+        barycentric_julian_dates([0.0, 1.0], np.zeros((3, 3)), [0.0], [0.0])
+
+
+@given(
+    hnp.arrays(
+        np.float64,
+        (8, 3),
+        elements=st.floats(-2 * AU_KM, 2 * AU_KM),
+    ),
+    hnp.arrays(np.float64, 5, elements=st.floats(0, 360)),
+    hnp.arrays(np.float64, 5, elements=st.floats(-90, 90)),
+)
+def test_matrix_matches_per_target_loop(positions, ra, dec):
+    mid_times = 2458000.0 + np.arange(8) / 48
+
+    bjd = barycentric_julian_dates(mid_times, positions, ra, dec)
+
+    assert bjd.shape == (5, 8)
+    for i, direction in enumerate(sky_unit_vectors(ra, dec)):
+        expected = (
+            mid_times + positions @ direction / SPEED_OF_LIGHT_KM_PER_DAY
+        )
+        np.testing.assert_allclose(bjd[i], expected, rtol=0, atol=1e-9)
+
+
+def test_interpolate_positions():
+    ephemeris_times = np.array([0.0, 1.0])
+    positions = np.array([[0.0, 0.0, 0.0], [2.0, 4.0, -2.0]])
+
+    interpolated = interpolate_positions(
+        ephemeris_times, positions, [0.25, 0.5]
+    )
+
+    np.testing.assert_allclose(
+        interpolated, [[0.5, 1.0, -0.5], [1.0, 2.0, -1.0]]
+    )
@@ -0,0 +1,228 @@
+"""Test content-addressed cadence grids and their cached lookups."""
+
+import uuid
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+from sqlalchemy import exc, orm
+
+from lightcurvedb.models import (
+    CadenceGrid,
+    DataSet,
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    QualityFlagArray,
+    Target,
+)
+from lightcurvedb.util.cadence_grid import CadenceLookup, cadence_digest
+
+from .util import QueryCounter
+
+SECTOR = np.concatenate([np.arange(1000, 1500), np.arange(1600, 2000)])
+
+
+@st.composite
+def grids(draw):
+    """Sorted unique grids: contiguous, strided, dense or sparse."""
+    low, high = draw(st.sampled_from([(1, 1), (3, 3), (1, 2), (1, 50)]))
+    steps = draw(
+        hnp.arrays(
+            np.int64, st.integers(0, 50), elements=st.integers(low, high)
+        )
+    )
+    return np.cumsum(steps) + draw(st.integers(-100, 100))
+
+
+@pytest.mark.parametrize(
+    "cadences, kind, step",
+    [
+        (np.arange(10, 20), "contiguous", 1),
+        ([7], "contiguous", 1),
+        (np.arange(10, 40, 3), "strided", 3),
+        ([10, 11, 12, 20], "irregular", None),
+        ([], "irregular", None),
+    ],
+)
+def test_lookup_detects_grid_shape(cadences, kind, step):
+    lookup = CadenceLookup(cadences)
+
+    assert lookup.kind == kind
+    assert lookup.step == step
+
+
+@given(grids(), hnp.arrays(np.int64, 20, elements=st.integers(-200, 3000)))
+def test_lookup_matches_searchsorted(cadences, observed):
+    lookup = CadenceLookup(cadences)
+
+    np.testing.assert_array_equal(
+        lookup.searchsorted(observed), np.searchsorted(cadences, observed)
+    )
+
+
+@given(grids(), st.data())
+def test_align_into_out(cadences, data):
+    observation = Observation(cadence_reference=cadences)
+    observed = np.unique(
+        data.draw(st.lists(st.sampled_from(cadences))) if len(cadences) else []
+    ).astype(np.int64)
+    values = np.arange(len(observed), dtype=np.float64)
+    out = np.full(len(cadences), 7.0)
+
+    result = observation.align_to_reference(observed, values, out=out)
+
+    assert result is out
+    np.testing.assert_array_equal(
+        out, observation.align_to_reference(observed, values)
+    )
+
+
+def test_align_rejects_misshapen_out():
+    observation = Observation(cadence_reference=SECTOR)
+
+    with pytest.raises(ValueError):
+        observation.align_to_reference(
+            SECTOR[:2], np.ones(2), out=np.empty(len(SECTOR) - 1)
+        )
+
+
+def test_lookup_cached_on_observation():
+    observation = Observation(cadence_reference=SECTOR)
+    lookup = observation.cadence_lookup
+
+    assert observation.cadence_lookup is lookup
+    observation.cadence_reference = SECTOR[:10]
+    assert len(observation.cadence_lookup) == 10
+
+
+def test_lookup_is_read_only():
+    lookup = CadenceLookup(SECTOR)
+
+    assert lookup.digest == cadence_digest(list(SECTOR))
+    assert lookup.digest != cadence_digest(SECTOR[1:])
+    with pytest.raises(ValueError):
+        lookup.cadences[0] = 0
+
+
+@pytest.fixture
+def cameras(v2_db: orm.Session):
+    """Four observations of one sector and one of another grid."""
+    observations = [
+        Observation(
+            cadence_reference=SECTOR,
+            instrument=Instrument(name=f"Camera {i}", properties={}),
+        )
+        for i in range(4)
+    ]
+    observations.append(
+        Observation(
+            cadence_reference=np.arange(5000, 5010),
+            instrument=Instrument(name="Other Camera", properties={}),
+        )
+    )
+    v2_db.add_all(observations)
+    v2_db.commit()
+    return observations
+
+
+def test_intern(v2_db: orm.Session):
+    grid = CadenceGrid.intern(v2_db, SECTOR)
+    v2_db.commit()
+
+    assert CadenceGrid.intern(v2_db, SECTOR.tolist()) is grid
+    assert grid.digest == cadence_digest(SECTOR)
+    assert 1999 in grid.cadence_range
+    assert 2000 not in grid.cadence_range
+
+
+def test_deduplicate_cadences(v2_db: orm.Session, cameras):
+    moved = Observation.deduplicate_cadences(v2_db, chunksize=2)
+    v2_db.commit()
+    v2_db.expire_all()
+
+    assert moved == len(cameras)
+    assert v2_db.query(CadenceGrid).count() == 2
+    assert len({obs.cadence_grid_digest for obs in cameras[:4]}) == 1
+    for obs in cameras:
+        assert obs.cadence_reference is None
+        assert obs.cadence_range is None
+    np.testing.assert_array_equal(cameras[0].cadences, SECTOR)
+    assert Observation.deduplicate_cadences(v2_db) == 0
+
+
+def test_deduplicate_selected(v2_db: orm.Session, cameras):
+    moved = Observation.deduplicate_cadences(
+        v2_db, observation_ids=[cameras[0].id]
+    )
+    v2_db.commit()
+    v2_db.expire_all()
+
+    assert moved == 1
+    assert cameras[1].cadence_grid_digest is None
+
+
+def test_requires_cadences(v2_db: orm.Session):
+    v2_db.add(Observation(instrument=Instrument(name="None", properties={})))
+
+    with pytest.raises(exc.IntegrityError):
+        v2_db.commit()
+
+
+def test_shared_lookup_is_reused(v2_db: orm.Session, cameras):
+    Observation.deduplicate_cadences(v2_db)
+    v2_db.commit()
+    v2_db.expire_all()
+    observations = v2_db.query(Observation).order_by(Observation.id).all()
+    observed = SECTOR[::3]
+
+    expected = cameras[0].align_to_reference(observed, np.ones(len(observed)))
+    with QueryCounter(v2_db) as counter:
+        aligned = [
+            obs.align_to_reference(observed, np.ones(len(observed)))
+            for obs in observations[1:4]
+        ]
+
+    assert counter.count == 0
+    assert observations[0].cadence_lookup is observations[3].cadence_lookup
+    for result in aligned:
+        np.testing.assert_array_equal(result, expected)
+    assert np.isnan(expected[1])
+
+
+def test_queries_resolve_shared_grids(v2_db: orm.Session, cameras):
+    mission = Mission(
+        id=uuid.uuid4(),
+        name="GRID_MISSION",
+        description="Mission for shared grids",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="grid_time",
+    )
+    catalog = MissionCatalog(
+        name="GRID_CATALOG", description="Catalog", host_mission=mission
+    )
+    dataset = DataSet(
+        observation=cameras[1],
+        target=Target(catalog=catalog, name=1),
+        values=np.arange(len(SECTOR), dtype=np.float64),
+    )
+    v2_db.add_all([mission, catalog, dataset])
+    Observation.deduplicate_cadences(v2_db)
+    v2_db.commit()
+
+    assert Observation.overlapping(v2_db, 1550) == cameras[:4]
+    assert Observation.overlapping(v2_db, 5009, 6000) == [cameras[4]]
+    assert Observation.overlapping(v2_db, 2000, 4999) == []
+    row = v2_db.execute(DataSet.cadence_window(cameras[1], 1498, 1601)).one()
+    np.testing.assert_array_equal(row.cadences, [1498, 1499, 1600, 1601])
+    np.testing.assert_array_equal(row.values, [498.0, 499.0, 500.0, 501.0])
+    np.testing.assert_array_equal(
+        QualityFlagArray.observation_mask(v2_db, cameras[2].id),
+        np.zeros(len(SECTOR), dtype=np.int32),
+    )
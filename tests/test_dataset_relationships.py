@@ -582,6 +582,242 @@ class TestDataSetHierarchy:
         assert source2 in combined.source_datasets
 
 
+# -----------------------------------------------------------------------------
+# Recursive Lineage Tests
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture
+def lineage_chain(
+    v2_db: orm.Session,
+    sample_target: Target,
+    sample_observation: Observation,
+    sample_photometric_source: PhotometricSource,
+) -> list[DataSet]:
+    """Create a raw -> detrended -> stitched -> vetted dataset chain."""
+    methods = [
+        ProcessingMethod(id=140 + i, name=f"Chain{i}", description=f"{i}")
+        for i in range(4)
+    ]
+    v2_db.add_all(methods)
+    v2_db.flush()
+
+    datasets = [
+        DataSet(
+            values=np.random.normal(0, 1, 100),
+            target=sample_target,
+            observation=sample_observation,
+            photometry_source=sample_photometric_source,
+            processing_method=method,
+        )
+        for method in methods
+    ]
+    v2_db.add_all(datasets)
+    v2_db.flush()
+
+    for source, derived in zip(datasets, datasets[1:]):
+        source.add_derived_dataset(derived, v2_db)
+    v2_db.commit()
+    return datasets
+
+
+class TestDataSetLineage:
+    """Tests for the recursive lineage traversal."""
+
+    def test_descendants_with_depths(
+        self, v2_db: orm.Session, lineage_chain: list[DataSet]
+    ):
+        edges = lineage_chain[0].lineage(v2_db, "down")
+
+        assert [edge.depth for edge in edges] == [1, 2, 3]
+        children = [
+            (
+                edge.child_observation_id,
+                edge.child_target_id,
+                edge.child_photometric_method_id,
+                edge.child_processing_method_id,
+            )
+            for edge in edges
+        ]
+        assert children == [ds.key for ds in lineage_chain[1:]]
+
+    def test_ancestors_with_depths(
+        self, v2_db: orm.Session, lineage_chain: list[DataSet]
+    ):
+        edges = lineage_chain[-1].lineage(v2_db, "up")
+
+        assert [edge.depth for edge in edges] == [1, 2, 3]
+        assert [edge.source_processing_method_id for edge in edges] == [
+            ds.processing_method_id for ds in reversed(lineage_chain[:-1])
+        ]
+
+    def test_max_depth(self, v2_db: orm.Session, lineage_chain: list[DataSet]):
+        edges = lineage_chain[0].lineage(v2_db, "down", max_depth=2)
+        assert [edge.depth for edge in edges] == [1, 2]
+
+    def test_leaf_has_no_descendants(
+        self, v2_db: orm.Session, lineage_chain: list[DataSet]
+    ):
+        assert lineage_chain[-1].lineage(v2_db, "down") == []
+
+    def test_cycle_terminates(
+        self, v2_db: orm.Session, lineage_chain: list[DataSet]
+    ):
+        lineage_chain[-1].add_derived_dataset(lineage_chain[0], v2_db)
+        v2_db.commit()
+
+        edges = lineage_chain[0].lineage(v2_db, "down")
+        assert len(edges) == len(lineage_chain) - 1
+
+    def test_diamonds_report_each_edge_once(
+        self,
+        v2_db: orm.Session,
+        sample_target: Target,
+        sample_observation: Observation,
+        sample_photometric_source: PhotometricSource,
+    ):
+        # Four stacked diamonds, 16 paths from top to bottom
+        n_diamonds = 4
+        methods = [
+            ProcessingMethod(id=160 + i, name=f"Diamond{i}", description="")
+            for i in range(3 * n_diamonds + 1)
+        ]
+        v2_db.add_all(methods)
+        v2_db.flush()
+        datasets = [
+            DataSet(
+                values=np.zeros(4),
+                target=sample_target,
+                observation=sample_observation,
+                photometry_source=sample_photometric_source,
+                processing_method=method,
+            )
+            for method in methods
+        ]
+        v2_db.add_all(datasets)
+        v2_db.flush()
+        for i in range(0, 3 * n_diamonds, 3):
+            top, left, right, bottom = datasets[slice(i, i + 4)]
+            for source, derived in [
+                (top, left),
+                (top, right),
+                (left, bottom),
+                (right, bottom),
+            ]:
+                source.add_derived_dataset(derived, v2_db)
+        v2_db.commit()
+
+        down = datasets[0].lineage(v2_db, "down")
+        up = datasets[-1].lineage(v2_db, "up")
+
+        assert len(down) == len(up) == 4 * n_diamonds
+        assert [edge.depth for edge in down][-2:] == [2 * n_diamonds] * 2
+
+    def test_bulk_lineage_labels_roots(
+        self, v2_db: orm.Session, lineage_chain: list[DataSet]
+    ):
+        roots = [lineage_chain[0].key, lineage_chain[2].key]
+
+        edges = DataSet.bulk_lineage(v2_db, roots, "down")
+
+        depths = {}
+        for edge in edges:
+            root = (
+                edge.root_observation_id,
+                edge.root_target_id,
+                edge.root_photometric_method_id,
+                edge.root_processing_method_id,
+            )
+            depths.setdefault(root, []).append(edge.depth)
+        assert depths == {roots[0]: [1, 2, 3], roots[1]: [1]}
+
+    def test_unknown_direction(self, lineage_chain: list[DataSet]):
+        with pytest.raises(ValueError):
+            DataSet.lineage_query([lineage_chain[0].key], "sideways")
+
+
+class TestLinkDatasets:
+    """Tests for bulk hierarchy link creation."""
+
+    @pytest.fixture
+    def raw_and_detrended(
+        self,
+        v2_db: orm.Session,
+        sample_catalog: MissionCatalog,
+        sample_observation: Observation,
+        sample_processing_method: ProcessingMethod,
+    ) -> tuple[list[DataSet], list[DataSet]]:
+        targets = [Target(catalog=sample_catalog, name=i) for i in range(10)]
+        v2_db.add_all(targets)
+        v2_db.flush()
+
+        raw = [
+            DataSet(
+                values=np.zeros(10),
+                target=target,
+                observation=sample_observation,
+            )
+            for target in targets
+        ]
+        detrended = [
+            DataSet(
+                values=np.zeros(10),
+                target=target,
+                observation=sample_observation,
+                processing_method=sample_processing_method,
+            )
+            for target in targets
+        ]
+        v2_db.add_all(raw + detrended)
+        v2_db.flush()
+        return raw, detrended
+
+    def test_link_datasets(
+        self,
+        v2_db: orm.Session,
+        raw_and_detrended: tuple[list[DataSet], list[DataSet]],
+    ):
+        raw, detrended = raw_and_detrended
+
+        created = DataSetHierarchy.link_datasets(
+            v2_db, [ds.key for ds in raw], [ds.key for ds in detrended]
+        )
+        v2_db.commit()
+
+        assert created == len(raw)
+        for source, derived in zip(raw, detrended):
+            v2_db.refresh(source)
+            assert source.derived_datasets == [derived]
+
+    def test_link_datasets_skips_duplicates(
+        self,
+        v2_db: orm.Session,
+        raw_and_detrended: tuple[list[DataSet], list[DataSet]],
+    ):
+        raw, detrended = raw_and_detrended
+        raw[0].add_derived_dataset(detrended[0], v2_db)
+        v2_db.flush()
+
+        sources = [ds.key for ds in raw] + [raw[1].key]
+        children = [ds.key for ds in detrended] + [detrended[1].key]
+        created = DataSetHierarchy.link_datasets(v2_db, sources, children)
+        v2_db.commit()
+
+        assert created == len(raw) - 1
+        assert v2_db.scalar(
+            sa.select(sa.func.count()).select_from(DataSetHierarchy)
+        ) == len(raw)
+
+    def test_link_datasets_rejects_misaligned(self, v2_db: orm.Session):
+        with pytest.raises(ValueError):
+            DataSetHierarchy.link_datasets(
+                v2_db, [(1, 2, 0, 0)], [(1, 2, 0, 0), (1, 3, 0, 0)]
+            )
+
+    def test_link_datasets_empty(self, v2_db: orm.Session):
+        assert DataSetHierarchy.link_datasets(v2_db, [], []) == 0
+
+
 # -----------------------------------------------------------------------------
 # Relationship Retrieval Tests
 # -----------------------------------------------------------------------------
@@ -0,0 +1,188 @@
+"""Test persisted per-dataset summary statistics."""
+
+import uuid
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+from sqlalchemy import orm
+
+from lightcurvedb.models import (
+    DataSet,
+    DataSetStatistics,
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    Target,
+)
+
+from .util import QueryCounter
+
+
+@pytest.fixture
+def datasets(v2_db: orm.Session):
+    """Twenty datasets of one observation with increasing scatter."""
+    mission = Mission(
+        id=uuid.uuid4(),
+        name="STATISTICS_MISSION",
+        description="Mission for dataset statistics",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="statistics_time",
+    )
+    catalog = MissionCatalog(
+        name="STATISTICS_CATALOG", description="Catalog", host_mission=mission
+    )
+    observation = Observation(
+        cadence_reference=np.arange(64),
+        instrument=Instrument(name="Statistics Instrument", properties={}),
+    )
+    noise = np.random.default_rng(42).standard_normal(64)
+    datasets = [
+        DataSet(
+            observation=observation,
+            target=Target(catalog=catalog, name=i),
+            values=100.0 + (i + 1) * noise,
+        )
+        for i in range(20)
+    ]
+    datasets[3].values[::4] = np.nan
+    v2_db.add_all([mission, catalog, observation, *datasets])
+    v2_db.commit()
+    return observation, datasets
+
+
+@given(
+    hnp.arrays(
+        np.float64,
+        st.tuples(st.integers(1, 5), st.integers(0, 16)),
+        elements=st.one_of(
+            st.floats(-1e6, 1e6), st.just(np.nan), st.just(np.inf)
+        ),
+    )
+)
+def test_compute_matches_per_row(matrix):
+    statistics = DataSetStatistics.compute(matrix)
+
+    for i, row in enumerate(matrix):
+        finite = row[np.isfinite(row)]
+        assert statistics["n_points"][i] == len(finite)
+        if len(finite) == 0:
+            assert np.isnan(statistics["median"][i])
+            continue
+        np.testing.assert_allclose(statistics["median"][i], np.median(finite))
+        np.testing.assert_allclose(
+            statistics["rms"][i], np.std(finite), atol=1e-6
+        )
+        np.testing.assert_allclose(
+            statistics["mad"][i],
+            np.median(np.abs(finite - np.median(finite))),
+        )
+
+
+def test_compute_groups_by_length():
+    values = [np.arange(5.0), np.array([1.0, np.nan]), np.arange(5.0) * 2]
+
+    statistics = DataSetStatistics.compute(values)
+
+    np.testing.assert_array_equal(statistics["n_points"], [5, 1, 5])
+    np.testing.assert_array_equal(statistics["median"], [2.0, 1.0, 4.0])
+    np.testing.assert_array_equal(statistics["nan_fraction"], [0, 0.5, 0])
+    np.testing.assert_array_equal(
+        statistics["p2p_scatter"], [1.0, np.nan, 2.0]
+    )
+
+
+def test_bulk_load_upserts(v2_db: orm.Session, datasets):
+    _, rows = datasets
+    keys = [dataset.key for dataset in rows[:2]]
+
+    DataSetStatistics.bulk_load(v2_db, keys, [[1.0, 2.0, 3.0], [np.nan]])
+    written = DataSetStatistics.bulk_load(
+        v2_db, keys, [[1.0, 3.0, 5.0], [np.nan]]
+    )
+    v2_db.commit()
+
+    assert written == 2
+    first = v2_db.get(DataSetStatistics, keys[0])
+    assert first.median == 3.0
+    assert first.p2p_scatter == 2.0
+    empty = v2_db.get(DataSetStatistics, keys[1])
+    assert empty.n_points == 0
+    assert empty.nan_fraction == 1.0
+    assert empty.median is None
+    assert rows[0].statistics is first
+
+
+def test_backfill(v2_db: orm.Session, datasets):
+    observation, rows = datasets
+    DataSetStatistics.bulk_load(v2_db, [rows[0].key], [[0.0]])
+
+    with QueryCounter(v2_db) as counter:
+        filled = DataSetStatistics.backfill(
+            v2_db, observation_id=observation.id, chunksize=8
+        )
+    v2_db.commit()
+
+    assert filled == len(rows) - 1
+    # Three pages of datasets plus the final empty page
+    assert counter.count < 20
+    assert v2_db.get(DataSetStatistics, rows[0].key).median == 0.0
+    noisy = v2_db.get(DataSetStatistics, rows[3].key)
+    assert noisy.n_points == 48
+    assert noisy.nan_fraction == 0.25
+
+    assert DataSetStatistics.backfill(v2_db) == 0
+    assert DataSetStatistics.backfill(v2_db, recompute=True) == len(rows)
+    assert v2_db.get(DataSetStatistics, rows[0].key).median != 0.0
+
+
+def test_ranked(v2_db: orm.Session, datasets):
+    observation, rows = datasets
+    DataSetStatistics.backfill(v2_db)
+    v2_db.commit()
+
+    quietest = v2_db.scalars(
+        DataSetStatistics.ranked(observation.id, "rms", fraction=0.1)
+    ).all()
+    noisiest = v2_db.scalars(
+        DataSetStatistics.ranked(observation.id, "rms", descending=True)
+    ).all()
+    capped = v2_db.scalars(
+        DataSetStatistics.ranked(observation.id, fraction=0.5, limit=3)
+    ).all()
+
+    assert [stats.target_id for stats in quietest] == [
+        rows[0].target_id,
+        rows[1].target_id,
+    ]
+    assert noisiest[0].target_id == rows[-1].target_id
+    assert [stats.rms for stats in noisiest] == sorted(
+        (stats.rms for stats in noisiest), reverse=True
+    )
+    assert len(capped) == 3
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"statistic": "values"}, {"fraction": 0}, {"fraction": 1.5}]
+)
+def test_ranked_rejects_arguments(kwargs):
+    with pytest.raises(ValueError):
+        DataSetStatistics.ranked(1, **kwargs)
+
+
+def test_cascades_with_dataset(v2_db: orm.Session, datasets):
+    _, rows = datasets
+    DataSetStatistics.backfill(v2_db)
+    v2_db.commit()
+
+    v2_db.delete(rows[0])
+    v2_db.commit()
+
+    assert v2_db.get(DataSetStatistics, rows[1].key) is not None
+    assert v2_db.query(DataSetStatistics).count() == len(rows) - 1
@@ -0,0 +1,166 @@
+"""Test server-side cadence and time window slicing of dataset arrays."""
+
+import uuid
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from hypothesis import given
+from hypothesis import strategies as st
+from sqlalchemy import orm
+
+from lightcurvedb.models import (
+    DataSet,
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    Target,
+    TargetSpecificTime,
+)
+
+# A cadence grid with a gap between 104 and 110
+CADENCES = np.concatenate([np.arange(100, 105), np.arange(110, 115)])
+
+
+@pytest.fixture
+def windowed(v2_db: orm.Session):
+    """Three datasets aligned to a gapped grid, two with stored times."""
+    mission = Mission(
+        id=uuid.uuid4(),
+        name="WINDOW_MISSION",
+        description="Mission for windowed queries",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="window_time",
+    )
+    catalog = MissionCatalog(
+        name="WINDOW_CATALOG", description="Catalog", host_mission=mission
+    )
+    targets = [Target(catalog=catalog, name=i) for i in range(3)]
+    observation = Observation(
+        cadence_reference=CADENCES,
+        instrument=Instrument(name="Window Instrument", properties={}),
+    )
+    datasets = [
+        DataSet(
+            observation=observation,
+            target=target,
+            values=np.arange(10.0) + 100 * i,
+            errors=None if i == 2 else np.full(10, 0.1 * (i + 1)),
+        )
+        for i, target in enumerate(targets)
+    ]
+    times = [
+        TargetSpecificTime(
+            observation=observation,
+            target=target,
+            barycentric_julian_dates=CADENCES / 10.0 + 0.001 * i,
+        )
+        for i, target in enumerate(targets[:2])
+    ]
+    v2_db.add_all([mission, catalog, observation, *datasets, *times])
+    v2_db.commit()
+    return observation, datasets
+
+
+def test_cadence_window(v2_db: orm.Session, windowed):
+    observation, datasets = windowed
+
+    rows = v2_db.execute(DataSet.cadence_window(observation, 103, 111)).all()
+
+    assert [row.target_id for row in rows] == [d.target_id for d in datasets]
+    np.testing.assert_array_equal(rows[0].cadences, [103, 104, 110, 111])
+    np.testing.assert_array_equal(rows[0].values, [3.0, 4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(rows[1].values, [103.0, 104.0, 105.0, 106.0])
+    np.testing.assert_array_equal(rows[1].errors, [0.2] * 4)
+    assert rows[2].errors is None
+
+
+def test_cadence_window_filters(v2_db: orm.Session, windowed):
+    observation, datasets = windowed
+
+    rows = v2_db.execute(
+        DataSet.cadence_window(
+            observation,
+            105,
+            109,
+            target_ids=[datasets[1].target_id],
+            processing_method_id=0,
+        )
+    ).all()
+
+    assert len(rows) == 1
+    assert rows[0].target_id == datasets[1].target_id
+    assert len(rows[0].cadences) == 0
+    assert len(rows[0].values) == 0
+
+
+@given(st.integers(90, 120), st.integers(0, 15))
+def test_cadence_slice_matches_reference(start, width):
+    observation = Observation(cadence_reference=CADENCES)
+
+    window = observation.cadence_slice(start, start + width)
+
+    np.testing.assert_array_equal(
+        CADENCES[window],
+        CADENCES[(CADENCES >= start) & (CADENCES <= start + width)],
+    )
+
+
+def test_cadence_window_matches_cadence_slice(v2_db: orm.Session, windowed):
+    observation, datasets = windowed
+
+    for start, end in [(0, 99), (90, 102), (104, 110), (112, 200)]:
+        window = observation.cadence_slice(start, end)
+        row = v2_db.execute(
+            DataSet.cadence_window(
+                observation, start, end, target_ids=[datasets[0].target_id]
+            )
+        ).one()
+        np.testing.assert_array_equal(row.values, datasets[0].values[window])
+
+
+def test_time_window(v2_db: orm.Session, windowed):
+    observation, datasets = windowed
+
+    rows = v2_db.execute(
+        DataSet.time_window(observation.id, 10.4005, 11.1005)
+    ).all()
+
+    # Target 2 has no stored times
+    assert [row.target_id for row in rows] == [
+        d.target_id for d in datasets[:2]
+    ]
+    # Target 1 is observed 0.001 days later than target 0
+    np.testing.assert_array_equal(rows[0].cadences, [110, 111])
+    np.testing.assert_array_equal(rows[0].values, [5.0, 6.0])
+    np.testing.assert_array_equal(rows[1].cadences, [104, 110])
+    np.testing.assert_array_equal(rows[1].values, [104.0, 105.0])
+    np.testing.assert_allclose(
+        rows[1].barycentric_julian_dates, [10.401, 11.001]
+    )
+
+
+def test_window_transfers_only_the_window(v2_db: orm.Session, windowed):
+    observation, _ = windowed
+
+    statement = DataSet.cadence_window(observation, 100, 100)
+    sizes = v2_db.execute(
+        sa.select(sa.func.cardinality(statement.subquery().c["values"]))
+    ).scalars()
+
+    assert set(sizes) == {1}
+
+
+def test_cadence_window_bounds_are_literals(v2_db: orm.Session, windowed):
+    observation, _ = windowed
+
+    statement = DataSet.cadence_window(observation, 103, 111)
+    sql = str(statement.compile(dialect=v2_db.get_bind().dialect))
+
+    # The grid is searched once in Python, not per row in the query
+    assert "unnest" not in sql
+    assert "JOIN" not in sql
@@ -1,9 +1,16 @@
 from itertools import chain
 
+import numpy as np
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
-from lightcurvedb.util.iter import chunkify, eq_partitions
+from lightcurvedb.util.iter import (
+    chunkify,
+    chunkify_aligned,
+    chunkify_array,
+    eq_partitions,
+)
 
 
 @given(st.iterables(st.integers()), st.integers(min_value=1))
@@ -47,6 +54,72 @@ def test_chunkify_with_fillvalue(iterable, chunksize):
         assert all(len(chunk) == chunksize for chunk in chunks)
 
 
+@given(
+    st.lists(st.integers(min_value=-(2**31), max_value=2**31 - 1)),
+    st.integers(min_value=1, max_value=50),
+)
+def test_chunkify_array_matches_chunkify(items, chunksize):
+    """
+    The array variant partitions identically to the list-based chunkify
+    and yields views into the source array.
+    """
+    array = np.array(items, dtype=np.int64)
+
+    chunks = list(chunkify_array(array, chunksize))
+    expected = list(chunkify(items, chunksize))
+
+    assert [chunk.tolist() for chunk in chunks] == expected
+    assert all(np.shares_memory(chunk, array) for chunk in chunks)
+
+
+@given(
+    st.lists(st.integers(min_value=0, max_value=1000), max_size=100),
+    st.integers(min_value=1, max_value=50),
+)
+def test_chunkify_array_with_fillvalue(items, chunksize):
+    """
+    Only the padded trailing chunk is a copy, every chunk is full length.
+    """
+    array = np.array(items, dtype=np.int32)
+
+    chunks = list(chunkify_array(array, chunksize, fillvalue=-999))
+    expected = list(chunkify(items, chunksize, fillvalue=-999))
+
+    assert [chunk.tolist() for chunk in chunks] == expected
+    assert all(len(chunk) == chunksize for chunk in chunks)
+    assert all(chunk.dtype == np.int32 for chunk in chunks)
+    if len(items) % chunksize:
+        assert not np.shares_memory(chunks[-1], array)
+
+
+@given(
+    st.integers(min_value=0, max_value=200),
+    st.integers(min_value=1, max_value=50),
+)
+def test_chunkify_aligned_keeps_columns_in_lockstep(length, chunksize):
+    ids = np.arange(length, dtype=np.int64)
+    values = ids.astype(np.float64) * 2
+
+    for id_chunk, value_chunk in chunkify_aligned(
+        ids, values, chunksize=chunksize, fillvalue=np.nan
+    ):
+        assert len(id_chunk) == len(value_chunk) == chunksize
+        filled = ~np.isnan(value_chunk)
+        np.testing.assert_array_equal(
+            id_chunk[filled] * 2, value_chunk[filled]
+        )
+
+
+def test_chunkify_aligned_rejects_misaligned():
+    with pytest.raises(ValueError):
+        list(chunkify_aligned(np.arange(3), np.arange(4), chunksize=2))
+
+
+def test_chunkify_array_rejects_bad_chunksize():
+    with pytest.raises(ValueError):
+        list(chunkify_array(np.arange(3), 0))
+
+
 @given(st.iterables(st.integers()), st.integers(min_value=1, max_value=100))
 def test_partition_eq_splitting(iterable, n_partitions):
     """
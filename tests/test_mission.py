@@ -448,7 +448,7 @@ class TestMissionTimeEpoch:
         assert TimeClass.epoch_format == "jd"
 
     def test_register_time_class_inherits_correctly(self, v2_db: orm.Session):
-        """Test that the created class inherits from TimeEpochDate."""
+        """Test that the created class is an epoch offset format."""
         from decimal import Decimal
 
         from astropy import time
@@ -469,10 +469,10 @@ class TestMissionTimeEpoch:
         TimeClass = mission.register_mission_time_epoch()
 
         # Verify inheritance
-        assert issubclass(TimeClass, time.TimeEpochDate)
+        assert issubclass(TimeClass, time.TimeFromEpoch)
 
     def test_register_lru_cache_returns_same_class(self, v2_db: orm.Session):
-        """Test that @lru_cache returns the same class instance."""
+        """Test that repeated registration returns the same class."""
         from decimal import Decimal
 
         mission = Mission(
@@ -493,7 +493,7 @@ class TestMissionTimeEpoch:
         TimeClass2 = mission.register_mission_time_epoch()
         TimeClass3 = mission.register_mission_time_epoch()
 
-        # All should be the exact same object due to lru_cache
+        # All should be the exact same object from the registry
         assert TimeClass1 is TimeClass2
         assert TimeClass2 is TimeClass3
 
@@ -555,5 +555,96 @@ class TestMissionTimeEpoch:
 
         TimeClass = mission.register_mission_time_epoch()
 
-        # Verify unit is 1 day
-        assert TimeClass.unit == 1 * u.day
+        # Verify unit is 1 day, expressed in days as astropy expects
+        assert TimeClass.unit == (1 * u.day).to_value(u.day)
+
+    def test_register_shared_across_loaded_copies(self, v2_db: orm.Session):
+        """Separately loaded copies of a mission share one time class."""
+        from decimal import Decimal
+
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="SHARED_TIME_MISSION",
+            description="Test registry keyed by format name",
+            time_unit="day",
+            time_epoch=Decimal("2457000.0"),
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="shared_btjd",
+        )
+        v2_db.add(mission)
+        v2_db.commit()
+        TimeClass = mission.register_mission_time_epoch()
+
+        with orm.Session(v2_db.get_bind()) as other:
+            copy = other.get(Mission, mission.id)
+            assert copy is not mission
+            assert copy.register_mission_time_epoch() is TimeClass
+
+    def test_register_rebuilds_changed_definition(self, v2_db: orm.Session):
+        """Changing a mission's time definition rebuilds its time class."""
+        from decimal import Decimal
+
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="CHANGED_TIME_MISSION",
+            description="Test registry rebuild",
+            time_unit="day",
+            time_epoch=Decimal("2457000.0"),
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="changed_btjd",
+        )
+        before = mission.register_mission_time_epoch()
+        mission.time_epoch = Decimal("2458000.0")
+        after = mission.register_mission_time_epoch()
+
+        assert after is not before
+        assert mission.to_time([0.0]).jd[0] == 2458000.0
+
+    def test_to_time_vectorized(self, v2_db: orm.Session):
+        """Mission timestamps of any shape convert in one Time object."""
+        from decimal import Decimal
+
+        import numpy as np
+
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="TO_TIME_MISSION",
+            description="Test vectorized conversion",
+            time_unit="day",
+            time_epoch=Decimal("2457000.0"),
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="to_time_btjd",
+        )
+        values = np.arange(6, dtype=np.float64).reshape(2, 3) * 0.5
+
+        times = mission.to_time(values)
+
+        assert times.shape == values.shape
+        assert times.scale == "tdb"
+        np.testing.assert_allclose(times.jd, values + 2457000.0)
+        np.testing.assert_allclose(
+            mission.from_time(times.utc), values, atol=1e-9
+        )
+
+    def test_to_time_respects_unit(self, v2_db: orm.Session):
+        """Non-day mission units are honoured."""
+        from decimal import Decimal
+
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="SECONDS_MISSION",
+            description="Test second units",
+            time_unit="second",
+            time_epoch=Decimal("50000.0"),
+            time_epoch_scale="utc",
+            time_epoch_format="mjd",
+            time_format_name="seconds_test",
+        )
+
+        times = mission.to_time([86400.0, 43200.0])
+
+        assert times.scale == "utc"
+        assert times.mjd.tolist() == [50001.0, 50000.5]
@@ -7,7 +7,7 @@ import pytest
 from hypothesis import assume, given
 from hypothesis import strategies as st
 from hypothesis.extra import numpy as np_st
-from sqlalchemy import delete, exc, orm
+from sqlalchemy import delete, exc, orm, text
 
 from lightcurvedb.models import (
     Instrument,
@@ -784,6 +784,67 @@ class TestObservationQueries:
         assert obs_without_flags not in obs_with_qf
 
 
+class TestObservationOverlapping:
+    """Test cadence range overlap queries."""
+
+    @pytest.fixture
+    def observations(self, v2_db: orm.Session):
+        instrument = Instrument(name="Overlap Instrument", properties={})
+        observations = [
+            Observation(instrument=instrument, cadence_reference=cadences)
+            for cadences in (
+                np.arange(100, 200, dtype=np.int64),
+                np.array([150, 160, 300], dtype=np.int64),
+                np.arange(400, 500, dtype=np.int64),
+                np.array([], dtype=np.int64),
+            )
+        ]
+        v2_db.add_all(observations)
+        v2_db.commit()
+        return observations
+
+    def test_generated_cadence_range(self, v2_db: orm.Session, observations):
+        first, gapped, _, empty = observations
+
+        assert (first.cadence_range.lower, first.cadence_range.upper) == (
+            100,
+            200,
+        )
+        assert 300 in gapped.cadence_range
+        assert empty.cadence_range.isempty
+
+    def test_single_cadence(self, v2_db: orm.Session, observations):
+        first, gapped, last, _ = observations
+
+        assert Observation.overlapping(v2_db, 150) == [first, gapped]
+        assert Observation.overlapping(v2_db, 199) == [first, gapped]
+        assert Observation.overlapping(v2_db, 200) == [gapped]
+        assert Observation.overlapping(v2_db, 400) == [last]
+        assert Observation.overlapping(v2_db, 50) == []
+
+    def test_range(self, v2_db: orm.Session, observations):
+        first, gapped, last, _ = observations
+
+        assert Observation.overlapping(v2_db, 0, 100) == [first]
+        assert Observation.overlapping(v2_db, 310, 399) == []
+        assert Observation.overlapping(v2_db, 250, 450) == [gapped, last]
+
+    def test_rejects_reversed_range(self, v2_db: orm.Session):
+        with pytest.raises(ValueError):
+            Observation.overlapping(v2_db, 10, 5)
+
+    def test_uses_range_index(self, v2_db: orm.Session, observations):
+        v2_db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = v2_db.scalars(
+            text(
+                "EXPLAIN SELECT id FROM observation "
+                "WHERE cadence_range && int8range(150, 150, '[]')"
+            )
+        ).all()
+
+        assert any("ix_observation_cadence_range" in line for line in plan)
+
+
 class TestAlignToReferenceProperties:
     """Property-based tests for Observation.align_to_reference."""
 
@@ -4,6 +4,7 @@ import uuid
 
 import numpy as np
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import exc, orm
 
 from lightcurvedb.models import (
@@ -14,6 +15,14 @@ from lightcurvedb.models import (
     QualityFlagArray,
     Target,
 )
+from lightcurvedb.models.quality_flag import FlagBits, register_flag_bits
+
+
+class DefinedBitFlags(QualityFlagArray):
+    """Flag type with registered bit definitions."""
+
+    __mapper_args__ = {"polymorphic_identity": "defined_bits"}
+    bit_definitions = {"cosmic_ray": 0, "saturated": 1, "anomaly": 31}
 
 
 class TestQualityFlagArrayBasics:
@@ -365,6 +374,226 @@ class TestQualityFlagArrayBitOperations:
         assert quality_flags.quality_flags[0] == max_int32
 
 
+class TestQualityFlagArrayBitmaskQueries:
+    """Test server-side bit predicates over stored flag arrays."""
+
+    FLAGS = {
+        "clean": [0, 0, 0, 0],
+        "cosmic": [0, 1, 0, 1],
+        "saturated": [2, 3, 2, 2],
+        "sign_bit": [np.iinfo(np.int32).min, 0, 0, 0],
+    }
+
+    @pytest.fixture
+    def flag_arrays(self, v2_db: orm.Session):
+        instrument = Instrument(name="Bitmask Instrument", properties={})
+        arrays = {
+            name: QualityFlagArray(
+                observation=Observation(
+                    cadence_reference=np.arange(4), instrument=instrument
+                ),
+                quality_flags=np.array(flags, dtype=np.int32),
+            )
+            for name, flags in self.FLAGS.items()
+        }
+        v2_db.add_all([instrument, *arrays.values()])
+        v2_db.commit()
+        return arrays
+
+    @pytest.mark.parametrize("mask", [1, 2, 3, 1 << 31])
+    def test_expressions_match_instances(
+        self, v2_db: orm.Session, flag_arrays, mask
+    ):
+        rows = v2_db.execute(
+            sa.select(
+                QualityFlagArray.id,
+                QualityFlagArray.flagged_count(mask),
+                QualityFlagArray.any_flagged(mask),
+                QualityFlagArray.all_flagged(mask),
+                QualityFlagArray.flagged_fraction(mask),
+            )
+        ).all()
+
+        assert len(rows) == len(flag_arrays)
+        for id_, count, any_, all_, fraction in rows:
+            flags = v2_db.get(QualityFlagArray, id_)
+            assert count == flags.flagged_count(mask)
+            assert any_ == flags.any_flagged(mask)
+            assert all_ == flags.all_flagged(mask)
+            assert fraction == pytest.approx(flags.flagged_fraction(mask))
+
+    def test_filter_without_loading_arrays(
+        self, v2_db: orm.Session, flag_arrays
+    ):
+        names = {flags.id: name for name, flags in flag_arrays.items()}
+
+        clean = v2_db.scalars(
+            sa.select(QualityFlagArray.id).where(
+                ~QualityFlagArray.any_flagged(0b11)
+            )
+        ).all()
+        assert sorted(names[id_] for id_ in clean) == ["clean", "sign_bit"]
+
+        saturated = v2_db.scalars(
+            sa.select(QualityFlagArray.id).where(
+                QualityFlagArray.all_flagged(2)
+            )
+        ).all()
+        assert [names[id_] for id_ in saturated] == ["saturated"]
+
+    def test_aggregate_expressions(self, v2_db: orm.Session, flag_arrays):
+        expected = sum(
+            flags.flagged_count(1) for flags in flag_arrays.values()
+        )
+        cosmic = flag_arrays["cosmic"]
+
+        total = v2_db.scalar(
+            sa.select(sa.func.sum(QualityFlagArray.flagged_count(1)))
+        )
+        uncorrelated = v2_db.scalar(
+            sa.select(QualityFlagArray.flagged_count(1))
+        )
+        filtered = v2_db.scalar(
+            sa.select(sa.func.sum(QualityFlagArray.flagged_count(1))).where(
+                QualityFlagArray.observation_id == cosmic.observation_id
+            )
+        )
+        fraction = v2_db.scalar(
+            sa.select(sa.func.avg(QualityFlagArray.flagged_fraction(1)))
+        )
+
+        assert total == uncorrelated == expected
+        assert filtered == cosmic.flagged_count(1)
+        assert fraction == pytest.approx(
+            np.mean([f.flagged_fraction(1) for f in flag_arrays.values()])
+        )
+        assert v2_db.scalar(sa.select(QualityFlagArray.any_flagged(1 << 31)))
+        assert not v2_db.scalar(sa.select(QualityFlagArray.all_flagged(2)))
+
+    def test_instance_values(self, flag_arrays):
+        cosmic = flag_arrays["cosmic"]
+        assert cosmic.flagged_count(1) == 2
+        assert cosmic.flagged_fraction(1) == 0.5
+        assert flag_arrays["sign_bit"].any_flagged(1 << 31)
+
+    @pytest.mark.parametrize("mask", [0, -1, 1 << 32])
+    def test_rejects_invalid_masks(self, flag_arrays, mask):
+        with pytest.raises(ValueError):
+            flag_arrays["clean"].any_flagged(mask)
+        with pytest.raises(ValueError):
+            QualityFlagArray.flagged_count(mask)
+
+
+class TestQualityFlagArrayRunLength:
+    """Test opt-in run-length encoded flag storage."""
+
+    @pytest.fixture
+    def observation(self, v2_db: orm.Session):
+        instrument = Instrument(name="Run Length Instrument", properties={})
+        observation = Observation(
+            cadence_reference=np.arange(8), instrument=instrument
+        )
+        v2_db.add_all([instrument, observation])
+        v2_db.flush()
+        return observation
+
+    def test_compress_round_trip(self, v2_db: orm.Session, observation):
+        flags = np.array([0, 0, 0, 4, 4, 0, 0, 1], dtype=np.int32)
+        array = QualityFlagArray(observation=observation, quality_flags=flags)
+        array.compress()
+        v2_db.add(array)
+        v2_db.commit()
+        v2_db.expire_all()
+
+        loaded = v2_db.get(QualityFlagArray, array.id)
+        assert loaded.is_compressed
+        assert loaded.quality_flags is None
+        np.testing.assert_array_equal(loaded.flag_run_lengths, [3, 2, 2, 1])
+        np.testing.assert_array_equal(loaded.flags, flags)
+
+        loaded.decompress()
+        v2_db.commit()
+        np.testing.assert_array_equal(loaded.quality_flags, flags)
+        assert loaded.flag_run_values is None
+
+    def test_missing_flags_raise(self, observation):
+        array = QualityFlagArray(observation=observation)
+
+        with pytest.raises(ValueError, match="neither quality_flags"):
+            array.compress()
+        with pytest.raises(ValueError, match="neither quality_flags"):
+            array.run_length_flags
+        with pytest.raises(ValueError, match="neither quality_flags"):
+            array.flags
+
+    def test_compress_observation(self, v2_db: orm.Session, observation):
+        sparse = np.zeros(8, dtype=np.int32)
+        sparse[2:4] = 2
+        noisy = np.arange(8, dtype=np.int32)
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="RUN_LENGTH_MISSION",
+            description="Run Length Mission",
+            time_unit="day",
+            time_epoch=0.0,
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="run_length_time",
+        )
+        catalog = MissionCatalog(
+            name="RUN_LENGTH_CATALOG",
+            description="Run Length Catalog",
+            host_mission=mission,
+        )
+        other = Observation(
+            cadence_reference=np.arange(8),
+            instrument=observation.instrument,
+        )
+        arrays = [
+            QualityFlagArray(observation=observation, quality_flags=sparse),
+            QualityFlagArray(
+                observation=observation,
+                target=Target(name=1, catalog=catalog),
+                quality_flags=noisy,
+            ),
+            QualityFlagArray(observation=other, quality_flags=sparse),
+        ]
+        v2_db.add_all(arrays)
+        v2_db.commit()
+
+        compressed = QualityFlagArray.compress_observation(
+            v2_db, observation.id
+        )
+        v2_db.commit()
+        v2_db.expire_all()
+
+        # Encoding the noisy array would not save space
+        assert compressed == 1
+        assert arrays[0].is_compressed
+        assert not arrays[1].is_compressed
+        assert not arrays[2].is_compressed
+        np.testing.assert_array_equal(arrays[0].flags, sparse)
+
+        counts = v2_db.execute(
+            sa.select(
+                QualityFlagArray.id,
+                QualityFlagArray.flagged_count(2),
+                QualityFlagArray.all_flagged(2),
+                QualityFlagArray.flagged_fraction(2),
+            ).order_by(QualityFlagArray.id)
+        ).all()
+        assert [tuple(row[1:]) for row in counts] == [
+            (2, False, 0.25),
+            (4, False, 0.5),
+            (2, False, 0.25),
+        ]
+
+    def test_requires_some_flags(self, v2_db: orm.Session, observation):
+        v2_db.add(QualityFlagArray(observation=observation))
+        with pytest.raises(exc.IntegrityError):
+            v2_db.flush()
+
+
 class TestQualityFlagArrayPolymorphism:
     """Test polymorphic behavior of QualityFlagArray."""
 
@@ -474,3 +703,82 @@ class TestQualityFlagArrayPolymorphism:
         # Test custom properties
         assert np.array_equal(loaded.cosmic_ray_events, [False, True, True])
         assert np.array_equal(loaded.saturated_pixels, [False, False, True])
+
+
+class TestQualityFlagBits:
+    """Test the bit-definition registry and vectorized decoding."""
+
+    FLAGS = np.array(
+        [[0, 1, 3, np.iinfo(np.int32).min], [2, 0, 0, 1]], dtype=np.int32
+    )
+
+    def test_subclass_registers_definitions(self):
+        bits = DefinedBitFlags.flag_bits()
+
+        assert bits is QualityFlagArray.flag_bits("defined_bits")
+        assert bits.names == ("cosmic_ray", "saturated", "anomaly")
+        assert bits.mask("cosmic_ray", "anomaly") == 1 | 1 << 31
+        assert bits.mask() == 3 | 1 << 31
+        with pytest.raises(KeyError):
+            QualityFlagArray.flag_bits()
+
+    def test_planes(self):
+        planes = DefinedBitFlags.flag_bits().planes(self.FLAGS)
+
+        assert list(planes) == ["cosmic_ray", "saturated", "anomaly"]
+        np.testing.assert_array_equal(
+            planes["cosmic_ray"], [[0, 1, 1, 0], [0, 0, 0, 1]]
+        )
+        np.testing.assert_array_equal(
+            planes["anomaly"], [[0, 0, 0, 1], [0, 0, 0, 0]]
+        )
+
+    def test_structured_decode_matches_planes(self):
+        bits = DefinedBitFlags.flag_bits()
+
+        decoded = bits.decode(self.FLAGS)
+
+        assert decoded.shape == self.FLAGS.shape
+        assert decoded.dtype.names == bits.names
+        for name, plane in bits.planes(self.FLAGS).items():
+            np.testing.assert_array_equal(decoded[name], plane)
+
+    def test_counts(self):
+        bits = DefinedBitFlags.flag_bits()
+
+        per_target = bits.counts(self.FLAGS)
+        total = bits.counts(self.FLAGS, axis=None)
+
+        np.testing.assert_array_equal(per_target["cosmic_ray"], [2, 1])
+        np.testing.assert_array_equal(per_target["saturated"], [1, 1])
+        assert total == {"cosmic_ray": 3, "saturated": 2, "anomaly": 1}
+
+    def test_instance_planes(self, v2_db: orm.Session):
+        instrument = Instrument(name="Bit Registry Instrument", properties={})
+        flags = DefinedBitFlags(
+            observation=Observation(
+                cadence_reference=np.arange(4), instrument=instrument
+            ),
+            quality_flags=self.FLAGS[0],
+        )
+        v2_db.add_all([instrument, flags])
+        v2_db.commit()
+        v2_db.expire_all()
+
+        loaded = v2_db.get(QualityFlagArray, flags.id)
+        planes = loaded.flag_planes()
+        np.testing.assert_array_equal(planes["saturated"], [0, 0, 1, 0])
+
+    def test_register_flag_bits(self):
+        bits = register_flag_bits("registered_bits", {"b": 3, "a": 2})
+
+        assert QualityFlagArray.flag_bits("registered_bits") == bits
+        assert bits == FlagBits({"a": 2, "b": 3})
+        assert list(bits) == [("a", 2), ("b", 3)]
+
+    @pytest.mark.parametrize(
+        "definitions", [{"a": 32}, {"a": -1}, {"a": 1, "b": 1}]
+    )
+    def test_rejects_invalid_definitions(self, definitions):
+        with pytest.raises(ValueError):
+            FlagBits(definitions)
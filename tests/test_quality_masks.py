@@ -0,0 +1,218 @@
+"""Test effective quality mask materialization and its cache."""
+
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import orm
+
+from lightcurvedb.io.quality_masks import QualityMaskCache
+from lightcurvedb.models import (
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    QualityFlagArray,
+    Target,
+)
+
+from .util import QueryCounter
+
+
+class ScatteredLightFlags(QualityFlagArray):
+    __mapper_args__ = {"polymorphic_identity": "scattered_light"}
+
+
+@pytest.fixture
+def flagged(v2_db: orm.Session):
+    """An observation with two flag types, three targets and one spare."""
+    mission = Mission(
+        id=uuid.uuid4(),
+        name="MASK_MISSION",
+        description="Mission for effective masks",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="mask_time",
+    )
+    catalog = MissionCatalog(
+        name="MASK_CATALOG", description="Catalog", host_mission=mission
+    )
+    targets = [Target(name=name, catalog=catalog) for name in range(4)]
+    observation = Observation(
+        cadence_reference=np.arange(4),
+        instrument=Instrument(name="Mask Instrument", properties={}),
+    )
+    v2_db.add_all([mission, catalog, observation, *targets])
+    v2_db.flush()
+
+    def flags(*words):
+        return np.array(words, dtype=np.int32)
+
+    v2_db.add_all(
+        [
+            QualityFlagArray(
+                observation=observation, quality_flags=flags(1, 0, 0, 0)
+            ),
+            ScatteredLightFlags(
+                observation=observation, quality_flags=flags(0, 0, 0, 8)
+            ),
+            QualityFlagArray(
+                observation=observation,
+                target=targets[0],
+                quality_flags=flags(0, 2, 0, 0),
+            ),
+            ScatteredLightFlags(
+                observation=observation,
+                target=targets[0],
+                quality_flags=flags(0, 0, 4, 0),
+            ),
+            ScatteredLightFlags(
+                observation=observation,
+                target=targets[2],
+                quality_flags=flags(0, 16, 16, 0),
+            ),
+        ]
+    )
+    v2_db.commit()
+    return observation, [target.id for target in targets]
+
+
+def test_effective_masks(v2_db: orm.Session, flagged):
+    observation, target_ids = flagged
+
+    ids, masks = QualityFlagArray.effective_masks(v2_db, observation.id)
+
+    np.testing.assert_array_equal(ids, [target_ids[0], target_ids[2]])
+    np.testing.assert_array_equal(masks, [[1, 2, 4, 8], [1, 16, 16, 8]])
+
+
+def test_effective_masks_of_requested_targets(v2_db: orm.Session, flagged):
+    observation, target_ids = flagged
+
+    ids, masks = QualityFlagArray.effective_masks(
+        v2_db, observation.id, target_ids=target_ids[::-1]
+    )
+
+    np.testing.assert_array_equal(ids, sorted(target_ids))
+    np.testing.assert_array_equal(
+        masks,
+        [[1, 2, 4, 8], [1, 0, 0, 8], [1, 16, 16, 8], [1, 0, 0, 8]],
+    )
+
+
+def test_effective_masks_by_type(v2_db: orm.Session, flagged):
+    observation, target_ids = flagged
+
+    ids, masks = QualityFlagArray.effective_masks(
+        v2_db, observation.id, types=["base_quality_flag"]
+    )
+
+    np.testing.assert_array_equal(ids, [target_ids[0]])
+    np.testing.assert_array_equal(masks, [[1, 2, 0, 0]])
+    np.testing.assert_array_equal(
+        QualityFlagArray.observation_mask(
+            v2_db, observation.id, types=["scattered_light"]
+        ),
+        [0, 0, 0, 8],
+    )
+
+
+def test_effective_masks_decode_compressed(v2_db: orm.Session, flagged):
+    observation, _ = flagged
+    expected = QualityFlagArray.effective_masks(v2_db, observation.id)
+
+    QualityFlagArray.compress_observation(v2_db, observation.id)
+    ids, masks = QualityFlagArray.effective_masks(v2_db, observation.id)
+
+    np.testing.assert_array_equal(ids, expected[0])
+    np.testing.assert_array_equal(masks, expected[1])
+
+
+def test_effective_masks_without_flags(v2_db: orm.Session):
+    observation = Observation(
+        cadence_reference=np.arange(3),
+        instrument=Instrument(name="Unflagged Instrument", properties={}),
+    )
+    v2_db.add(observation)
+    v2_db.commit()
+
+    ids, masks = QualityFlagArray.effective_masks(
+        v2_db, observation.id, target_ids=[7]
+    )
+
+    np.testing.assert_array_equal(ids, [7])
+    np.testing.assert_array_equal(masks, [[0, 0, 0]])
+    with pytest.raises(ValueError):
+        QualityFlagArray.effective_masks(v2_db, observation.id + 1)
+
+
+class TestQualityMaskCache:
+    def test_caches_observation(self, v2_db: orm.Session, flagged):
+        observation, target_ids = flagged
+        observation_id = observation.id
+        cache = QualityMaskCache()
+
+        with QueryCounter(v2_db) as load:
+            ids, masks = cache.get(v2_db, observation_id)
+        with QueryCounter(v2_db) as counter:
+            requested, subset = cache.get(
+                v2_db, observation.id, target_ids=target_ids[1:3]
+            )
+
+        assert load.count == 1
+        assert counter.count == 0
+        assert not masks.flags.writeable
+        assert not subset.flags.writeable
+        np.testing.assert_array_equal(ids, [target_ids[0], target_ids[2]])
+        np.testing.assert_array_equal(requested, target_ids[1:3])
+        np.testing.assert_array_equal(subset, [[1, 0, 0, 8], [1, 16, 16, 8]])
+
+    def test_types_are_cached_separately(self, v2_db: orm.Session, flagged):
+        observation, _ = flagged
+        cache = QualityMaskCache()
+
+        cache.get(v2_db, observation.id)
+        _, masks = cache.get(v2_db, observation.id, types=["scattered_light"])
+
+        assert len(cache) == 2
+        np.testing.assert_array_equal(masks, [[0, 0, 4, 8], [0, 16, 16, 8]])
+
+    def test_invalidate(self, v2_db: orm.Session, flagged):
+        observation, _ = flagged
+        cache = QualityMaskCache()
+        cache.get(v2_db, observation.id)
+        cache.get(v2_db, observation.id, types=["scattered_light"])
+
+        cache.invalidate(observation.id + 1)
+        assert len(cache) == 2
+        cache.invalidate(observation.id)
+        assert len(cache) == 0
+
+    def test_flushed_flags_invalidate(self, v2_db: orm.Session, flagged):
+        observation, target_ids = flagged
+        cache = QualityMaskCache()
+        cache.get(v2_db, observation.id)
+
+        v2_db.add(
+            QualityFlagArray(
+                observation_id=observation.id,
+                target_id=target_ids[1],
+                quality_flags=np.array([32, 0, 0, 0], dtype=np.int32),
+            )
+        )
+        v2_db.commit()
+        ids, masks = cache.get(v2_db, observation.id)
+
+        np.testing.assert_array_equal(ids, target_ids[:3])
+        np.testing.assert_array_equal(masks[1], [33, 0, 0, 8])
+
+    def test_bulk_statements_invalidate(self, v2_db: orm.Session, flagged):
+        observation, _ = flagged
+        cache = QualityMaskCache()
+        cache.get(v2_db, observation.id)
+
+        QualityFlagArray.compress_observation(v2_db, observation.id)
+
+        assert len(cache) == 0
@@ -0,0 +1,128 @@
+"""Test process-wide caching of reference tables."""
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from lightcurvedb.core.reference_cache import (
+    ReferenceRow,
+    ReferenceTable,
+    invalidate_reference_tables,
+    reference_id,
+    reference_table,
+)
+from lightcurvedb.models import PhotometricSource, ProcessingMethod
+
+from .util import QueryCounter
+
+
+def test_duplicate_names_prefer_smallest_id():
+    table = ReferenceTable(
+        [
+            ReferenceRow(5, "Aperture", ""),
+            ReferenceRow(2, "Aperture", ""),
+            ReferenceRow(3, "PSF", ""),
+        ]
+    )
+    assert table.id_of("Aperture") == 2
+    assert table.name_of(5) == "Aperture"
+    assert table.ids_of(["PSF", "Aperture"]).tolist() == [3, 2]
+    with pytest.raises(KeyError):
+        table.id_of("Missing")
+
+
+@pytest.mark.parametrize("model", [PhotometricSource, ProcessingMethod])
+def test_sentinel_lookup_skips_insert(v2_db: orm.Session, model):
+    model.get_or_create_unspecified(v2_db)
+    engine = v2_db.get_bind()
+
+    with orm.Session(engine) as session:
+        with QueryCounter(session) as counter:
+            sentinel = model.get_or_create_unspecified(session)
+            assert sentinel.name == "Unspecified"
+            assert sentinel in session
+            assert model.get_or_create_unspecified(session) is sentinel
+        # A single primary key load, no snapshot or insert round trips
+        assert counter.count == 1
+
+
+def test_sentinel_deleted_elsewhere_is_recreated(v2_db: orm.Session):
+    ProcessingMethod.get_or_create_unspecified(v2_db)
+    v2_db.commit()
+    engine = v2_db.get_bind()
+
+    # Deleted outside any ORM session, the snapshot is still cached
+    with engine.begin() as connection:
+        connection.execute(sa.text("DELETE FROM processing_method"))
+
+    with orm.Session(engine) as session:
+        sentinel = ProcessingMethod.get_or_create_unspecified(session)
+        session.commit()
+        assert sentinel.id == ProcessingMethod.UNSPECIFIED_ID
+
+    assert v2_db.scalar(sa.select(sa.func.count(ProcessingMethod.id))) == 1
+
+
+def test_sentinel_created_elsewhere_is_found(v2_db: orm.Session):
+    v2_db.commit()
+    engine = v2_db.get_bind()
+    with engine.begin() as connection:
+        connection.execute(sa.text("DELETE FROM processing_method"))
+
+    with orm.Session(engine) as session:
+        # Snapshot cached before the sentinel exists
+        assert ProcessingMethod.UNSPECIFIED_ID not in (
+            reference_table(session, ProcessingMethod).rows
+        )
+        with engine.begin() as connection:
+            connection.execute(
+                sa.insert(ProcessingMethod).values(
+                    id=ProcessingMethod.UNSPECIFIED_ID,
+                    name="Unspecified",
+                    description="No processing method applied (raw data)",
+                )
+            )
+
+        sentinel = ProcessingMethod.get_or_create_unspecified(session)
+        session.commit()
+        assert sentinel.id == ProcessingMethod.UNSPECIFIED_ID
+
+    assert v2_db.scalar(sa.select(sa.func.count(ProcessingMethod.id))) == 1
+
+
+def test_sentinel_recreated_after_invalidation(v2_db: orm.Session):
+    v2_db.execute(sa.delete(ProcessingMethod))
+    invalidate_reference_tables(v2_db, ProcessingMethod)
+
+    sentinel = ProcessingMethod.get_or_create_unspecified(v2_db)
+    assert sentinel.id == ProcessingMethod.UNSPECIFIED_ID
+    assert v2_db.get(ProcessingMethod, sentinel.id) is sentinel
+
+
+def test_flushed_rows_invalidate(v2_db: orm.Session):
+    reference_table(v2_db, ProcessingMethod)
+    v2_db.add(ProcessingMethod(id=1, name="PDC-SAP", description="PDC"))
+    v2_db.flush()
+
+    with QueryCounter(v2_db) as counter:
+        assert reference_id(v2_db, ProcessingMethod, "PDC-SAP") == 1
+        assert reference_id(v2_db, ProcessingMethod, "PDC-SAP") == 1
+    assert counter.count == 1
+
+    v2_db.rollback()
+    with pytest.raises(KeyError):
+        reference_id(v2_db, ProcessingMethod, "PDC-SAP")
+
+
+def test_external_rows_found_on_miss(v2_db: orm.Session):
+    reference_table(v2_db, PhotometricSource)
+    with orm.Session(v2_db.get_bind()) as other:
+        other.execute(
+            sa.insert(PhotometricSource).values(
+                id=7, name="Aperture_2px", description="2 pixel aperture"
+            )
+        )
+        other.commit()
+
+    assert reference_id(v2_db, PhotometricSource, "Aperture_2px") == 7
+    assert 7 in reference_table(v2_db, PhotometricSource)
@@ -0,0 +1,92 @@
+"""Test run-length encoded quality flags."""
+
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra import numpy as hnp
+
+from lightcurvedb.util.run_length import RunLengthFlags, int32_mask
+
+# Mostly zero flags drawn from a few words, so runs actually form
+flag_words = st.sampled_from([0, 0, 0, 1, 4, 5, np.iinfo(np.int32).min])
+
+
+def flag_arrays(size=st.integers(0, 64)):
+    return size.flatmap(lambda n: hnp.arrays(np.int32, n, elements=flag_words))
+
+
+@given(flag_arrays())
+def test_encode_decode_round_trip(flags):
+    runs = RunLengthFlags.encode(flags)
+
+    decoded = runs.decode()
+    assert decoded.dtype == np.int32
+    np.testing.assert_array_equal(decoded, flags)
+    assert len(runs) == len(flags)
+    # Canonical: no empty runs and no equal neighbours
+    assert (runs.lengths > 0).all()
+    assert (runs.values[1:] != runs.values[:-1]).all()
+
+
+@given(
+    st.integers(0, 64).flatmap(
+        lambda n: st.tuples(
+            hnp.arrays(np.int32, n, elements=flag_words),
+            hnp.arrays(np.int32, n, elements=flag_words),
+            hnp.arrays(np.int32, n, elements=flag_words),
+        )
+    )
+)
+def test_bitwise_ops_match_dense(arrays):
+    first, second, third = arrays
+    a, b, c = (RunLengthFlags.encode(flags) for flags in arrays)
+
+    assert a & b == RunLengthFlags.encode(first & second)
+    assert a | b == RunLengthFlags.encode(first | second)
+    combined = RunLengthFlags.combine([a, b, c])
+    np.testing.assert_array_equal(combined.decode(), first | second | third)
+
+
+def test_count_and_mask():
+    runs = RunLengthFlags.encode([0, 0, 5, 5, 5, 1, 0, 4])
+
+    assert runs.n_runs == 5
+    assert runs.count(1) == 4
+    assert runs.count(4) == 4
+    assert runs.mask(4) == RunLengthFlags.encode([0, 0, 4, 4, 4, 0, 0, 4])
+
+
+def test_constructor_merges_runs():
+    runs = RunLengthFlags([0, 0, 3, 3, 0], [2, 1, 0, 4, 1])
+
+    np.testing.assert_array_equal(runs.values, [0, 3, 0])
+    np.testing.assert_array_equal(runs.lengths, [3, 4, 1])
+
+
+def test_decode_into_buffer():
+    runs = RunLengthFlags.encode([0, 2, 2])
+    out = np.full(3, -1, dtype=np.int32)
+
+    assert runs.decode(out=out) is out
+    np.testing.assert_array_equal(out, [0, 2, 2])
+
+
+def test_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        RunLengthFlags.encode([0, 1]) | RunLengthFlags.encode([0, 1, 2])
+    with pytest.raises(ValueError):
+        RunLengthFlags([0, 1], [1])
+
+
+@pytest.mark.parametrize(
+    "bits, expected", [(0, 0), (5, 5), (1 << 31, -(1 << 31))]
+)
+def test_int32_mask(bits, expected):
+    assert int32_mask(bits) == expected
+
+
+@pytest.mark.parametrize("bits", [-1, 1 << 32])
+def test_int32_mask_out_of_range(bits):
+    with pytest.raises(ValueError):
+        int32_mask(bits)
@@ -0,0 +1,184 @@
+"""Test incremental PDO tree scanning."""
+
+import os
+import uuid
+
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from lightcurvedb.io.scanner import (
+    ScanManifest,
+    scan_directory,
+    scan_for_changes,
+)
+
+from .strategies import tess as tess_st
+from .util import ensure_directory
+
+
+def _populate(root, orbit, cam, ccd, tic_ids):
+    paths = []
+    for tic_id in tic_ids:
+        path = ensure_directory(
+            root
+            / f"orbit-{orbit}"
+            / "ffi"
+            / f"cam{cam}"
+            / f"ccd{ccd}"
+            / "LC"
+            / f"{tic_id}.h5"
+        )
+        path.write_bytes(b"lightcurve")
+        paths.append(path)
+    return paths
+
+
+@settings(suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(
+    tess_st.orbits(),
+    tess_st.cameras(),
+    tess_st.ccds(),
+    st.sets(tess_st.tic_ids(), min_size=1, max_size=20),
+)
+def test_scan_directory_finds_contexts(tempdir, orbit, cam, ccd, tic_ids):
+    # The tempdir fixture is shared across examples, isolate each one
+    root = tempdir / uuid.uuid4().hex
+    paths = _populate(root, orbit, cam, ccd, tic_ids)
+    (root / "notes.txt").write_text("ignored")
+
+    entries = {entry.path: entry for entry in scan_directory(root)}
+
+    assert set(entries) == {str(path) for path in paths}
+    for entry in entries.values():
+        assert entry.context["orbit_number"] == str(orbit)
+        assert entry.context["camera"] == str(cam)
+        assert entry.context["ccd"] == str(ccd)
+        assert entry.size == len(b"lightcurve")
+
+
+def test_rescan_yields_nothing(tempdir):
+    paths = _populate(tempdir / "pdo", 9, 1, 1, range(1, 6))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        first = list(scan_for_changes(tempdir / "pdo", manifest))
+        second = list(scan_for_changes(tempdir / "pdo", manifest))
+
+        assert len(first) == len(paths)
+        assert second == []
+        assert len(manifest) == len(paths)
+
+
+def test_rescan_yields_new_and_changed(tempdir):
+    paths = _populate(tempdir / "pdo", 9, 1, 1, range(1, 6))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        list(scan_for_changes(tempdir / "pdo", manifest))
+
+        (new_path,) = _populate(tempdir / "pdo", 9, 1, 2, [100])
+        paths[0].write_bytes(b"a longer lightcurve")
+
+        changed = {
+            entry.path for entry in scan_for_changes(tempdir / "pdo", manifest)
+        }
+
+    assert changed == {str(new_path), str(paths[0])}
+
+
+def test_manifest_persists_between_sessions(tempdir):
+    _populate(tempdir / "pdo", 9, 2, 3, range(1, 4))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        list(scan_for_changes(tempdir / "pdo", manifest))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        assert list(scan_for_changes(tempdir / "pdo", manifest)) == []
+        entry = manifest.get(next(iter(manifest.signatures())))
+        assert entry.context["camera"] == "2"
+
+
+def test_deferred_recording(tempdir):
+    _populate(tempdir / "pdo", 9, 1, 1, range(1, 4))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        pending = list(
+            scan_for_changes(tempdir / "pdo", manifest, record=False)
+        )
+        assert len(manifest) == 0
+
+        manifest.update(pending)
+        assert list(scan_for_changes(tempdir / "pdo", manifest)) == []
+
+        manifest.forget([pending[0].path])
+        assert [
+            entry.path for entry in scan_for_changes(tempdir / "pdo", manifest)
+        ] == [pending[0].path]
+
+
+def test_early_exit_records_consumed_entries(tempdir):
+    paths = _populate(tempdir / "pdo", 9, 1, 1, range(1, 6))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        consumed = []
+        for entry in scan_for_changes(tempdir / "pdo", manifest):
+            if len(consumed) == 2:
+                break
+            consumed.append(entry.path)
+
+        assert set(manifest.signatures()) == set(consumed)
+        rest = {
+            entry.path for entry in scan_for_changes(tempdir / "pdo", manifest)
+        }
+
+    assert rest == {str(path) for path in paths} - set(consumed)
+
+
+def test_deleted_files_are_forgotten(tempdir):
+    paths = _populate(tempdir / "pdo", 9, 1, 1, range(1, 4))
+    (other,) = _populate(tempdir / "other", 9, 1, 1, [7])
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        list(scan_for_changes(tempdir / "pdo", manifest))
+        list(scan_for_changes(tempdir / "other", manifest))
+
+        paths[0].unlink()
+        assert list(scan_for_changes(tempdir / "pdo", manifest)) == []
+
+        assert str(paths[0]) not in manifest
+        assert str(paths[1]) in manifest
+        assert str(other) in manifest
+
+
+def test_missing_root_yields_nothing(tempdir):
+    assert list(scan_directory(os.path.join(tempdir, "missing"))) == []
+
+
+def test_failed_walk_keeps_manifest(tempdir):
+    paths = _populate(tempdir / "pdo", 9, 1, 1, range(1, 4))
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        list(scan_for_changes(tempdir / "pdo", manifest))
+        (tempdir / "pdo").rename(tempdir / "unmounted")
+
+        assert list(scan_for_changes(tempdir / "pdo", manifest)) == []
+        assert set(manifest.signatures()) == {str(path) for path in paths}
+
+
+def test_scan_directory_reports_errors(tempdir):
+    errors = []
+    missing = tempdir / "missing"
+
+    assert list(scan_directory(missing, onerror=errors.append)) == []
+    assert [error.filename for error in errors] == [str(missing)]
+
+
+def test_relative_roots_share_entries(tempdir, monkeypatch):
+    _populate(tempdir / "pdo", 9, 1, 1, range(1, 4))
+    monkeypatch.chdir(tempdir)
+
+    with ScanManifest(tempdir / "manifest.db") as manifest:
+        first = list(scan_for_changes("pdo", manifest))
+
+        assert all(os.path.isabs(entry.path) for entry in first)
+        assert list(scan_for_changes(tempdir / "pdo", manifest)) == []
+        assert list(scan_for_changes("./pdo/", manifest)) == []
+        assert len(manifest) == len(first) == 3
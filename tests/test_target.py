@@ -1,9 +1,11 @@
 """Test Target model functionality."""
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
+import sqlalchemy as sa
 from sqlalchemy import delete, exc, orm
 
 from lightcurvedb.models import (
@@ -679,3 +681,101 @@ class TestTargetQueries:
         assert len(targets_with_observations) == 1
         assert target_with_obs in targets_with_observations
         assert target_without_obs not in targets_with_observations
+
+
+class TestTargetBulkGetOrCreate:
+    """Test Target.bulk_get_or_create."""
+
+    @pytest.fixture
+    def catalog(self, v2_db: orm.Session) -> MissionCatalog:
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="BULK_MISSION",
+            description="Mission for bulk creation",
+            time_unit="day",
+            time_epoch=0.0,
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="bulk",
+        )
+        catalog = MissionCatalog(
+            host_mission=mission, name="BULK", description="Bulk catalog"
+        )
+        v2_db.add_all([mission, catalog])
+        v2_db.commit()
+        return catalog
+
+    def test_ids_align_with_input(self, v2_db: orm.Session, catalog):
+        existing = Target(catalog=catalog, name=20)
+        v2_db.add(existing)
+        v2_db.flush()
+
+        names = np.array([30, 20, 10, 30, 20])
+        ids = Target.bulk_get_or_create(v2_db, catalog, names)
+
+        stored = dict(
+            v2_db.query(Target.name, Target.id).filter_by(
+                catalog_id=catalog.id
+            )
+        )
+        assert len(stored) == 3
+        assert stored[20] == existing.id
+        np.testing.assert_array_equal(ids, [stored[n] for n in names])
+
+    def test_idempotent(self, v2_db: orm.Session, catalog):
+        first = Target.bulk_get_or_create(v2_db, catalog.id, [1, 2, 3])
+        second = Target.bulk_get_or_create(v2_db, catalog.id, [3, 2, 1])
+        np.testing.assert_array_equal(first, second[::-1])
+        assert (
+            v2_db.query(Target).filter_by(catalog_id=catalog.id).count() == 3
+        )
+
+    def test_empty(self, v2_db: orm.Session, catalog):
+        assert len(Target.bulk_get_or_create(v2_db, catalog, [])) == 0
+
+    def test_unresolved_names_raise(self, v2_db: orm.Session, catalog):
+        # Silently drop one insert, as if it were deleted concurrently
+        v2_db.execute(
+            sa.text(
+                "CREATE FUNCTION skip_target() RETURNS trigger AS $$ "
+                "BEGIN IF NEW.name = 99 THEN RETURN NULL; END IF; "
+                "RETURN NEW; END $$ LANGUAGE plpgsql"
+            )
+        )
+        v2_db.execute(
+            sa.text(
+                "CREATE TRIGGER skip_target BEFORE INSERT ON target "
+                "FOR EACH ROW EXECUTE FUNCTION skip_target()"
+            )
+        )
+        try:
+            with pytest.raises(KeyError, match=r"\[99\]"):
+                Target.bulk_get_or_create(v2_db, catalog.id, [1, 99, 2])
+        finally:
+            v2_db.rollback()
+
+    def test_concurrent_workers(self, v2_db: orm.Session, catalog):
+        """Overlapping loads from separate sessions agree on every id."""
+        engine = v2_db.get_bind()
+        catalog_id = catalog.id
+        batches = [
+            np.arange(start, start + 200) for start in range(0, 400, 50)
+        ]
+
+        def load(names):
+            with orm.Session(engine) as session:
+                ids = Target.bulk_get_or_create(session, catalog_id, names)
+                session.commit()
+            return dict(zip(names.tolist(), ids.tolist()))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(load, batches))
+
+        stored = dict(
+            v2_db.query(Target.name, Target.id).filter_by(
+                catalog_id=catalog.id
+            )
+        )
+        assert len(stored) == 550
+        for result in results:
+            assert all(stored[name] == id_ for name, id_ in result.items())
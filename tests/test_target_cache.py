@@ -0,0 +1,127 @@
+"""Test catalog-scoped target name to id resolution."""
+
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import orm
+
+from lightcurvedb.io.target_cache import TargetIdCache
+from lightcurvedb.models import Mission, MissionCatalog, Target
+
+from .util import QueryCounter
+
+
+def _make_catalog(session: orm.Session, name: str) -> MissionCatalog:
+    mission = Mission(
+        id=uuid.uuid4(),
+        name=name,
+        description="Target cache test mission",
+        time_unit="day",
+        time_epoch=0.0,
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name=name,
+    )
+    catalog = MissionCatalog(
+        host_mission=mission, name=f"{name}_CAT", description="Catalog"
+    )
+    session.add_all([mission, catalog])
+    session.flush()
+    return catalog
+
+
+@pytest.fixture
+def catalog_targets(v2_db: orm.Session):
+    """Two catalogs sharing target names but not target ids."""
+    first = _make_catalog(v2_db, "CACHE_A")
+    second = _make_catalog(v2_db, "CACHE_B")
+    names = [50, 10, 40, 20, 30]
+    targets = {
+        catalog.id: [Target(catalog=catalog, name=name) for name in names]
+        for catalog in (first, second)
+    }
+    v2_db.add_all([t for group in targets.values() for t in group])
+    v2_db.flush()
+    expected = {
+        catalog_id: {t.name: t.id for t in group}
+        for catalog_id, group in targets.items()
+    }
+    return first, second, expected
+
+
+def test_preloaded_resolution_is_query_free(v2_db, catalog_targets):
+    first, second, expected = catalog_targets
+    cache = TargetIdCache()
+    assert cache.preload(v2_db, first) == 5
+    assert first in cache
+    assert second not in cache
+
+    names = [30, 10, 10, 50]
+    with QueryCounter(v2_db) as counter:
+        ids = cache.resolve(v2_db, first, names)
+
+    assert counter.count == 0
+    np.testing.assert_array_equal(
+        ids, [expected[first.id][name] for name in names]
+    )
+
+
+def test_partial_resolution_is_cached(v2_db, catalog_targets):
+    first, second, expected = catalog_targets
+    cache = TargetIdCache()
+
+    with QueryCounter(v2_db) as counter:
+        ids = cache.resolve(v2_db, second.id, [20, 40, 999])
+        again = cache.resolve(v2_db, second.id, [40, 20])
+
+    assert counter.count == 1
+    np.testing.assert_array_equal(
+        ids, [expected[second.id][20], expected[second.id][40], -1]
+    )
+    np.testing.assert_array_equal(
+        again, [expected[second.id][40], expected[second.id][20]]
+    )
+
+
+def test_missing_names_are_refetched(v2_db, catalog_targets):
+    first, _, _ = catalog_targets
+    cache = TargetIdCache()
+    cache.preload(v2_db, first)
+    assert cache.resolve(None, first, [60]).tolist() == [-1]
+
+    target = Target(catalog=first, name=60)
+    v2_db.add(target)
+    v2_db.flush()
+
+    assert cache.resolve(v2_db, first, [60, 10], missing=0)[0] == target.id
+
+
+def test_lru_eviction(v2_db, catalog_targets):
+    first, _, expected = catalog_targets
+    cache = TargetIdCache(maxsize=2)
+    cache.resolve(v2_db, first, [10, 20, 30])
+
+    with QueryCounter(v2_db) as counter:
+        ids = cache.resolve(v2_db, first, [10, 20, 30])
+
+    assert counter.count == 1
+    np.testing.assert_array_equal(
+        ids, [expected[first.id][name] for name in (10, 20, 30)]
+    )
+
+
+def test_invalidate(v2_db, catalog_targets):
+    first, second, expected = catalog_targets
+    cache = TargetIdCache()
+    cache.preload(v2_db, first)
+    cache.resolve(v2_db, second, [10])
+
+    cache.invalidate(first)
+    assert first not in cache
+    assert cache.resolve(None, second, [10]).tolist() == [
+        expected[second.id][10]
+    ]
+
+    cache.invalidate()
+    assert cache.resolve(None, second, [10]).tolist() == [-1]
@@ -3,6 +3,7 @@
 import uuid
 
 import numpy as np
+import psycopg
 import pytest
 from sqlalchemy import exc, orm
 
@@ -935,3 +936,234 @@ class TestTargetSpecificTimeQueries:
         assert (
             len(targets_with_obs) == 3
         )  # Only first 3 targets have observations
+
+
+class TestTargetSpecificTimeBulkLoad:
+    """Test batch barycentric correction and loading."""
+
+    @pytest.fixture
+    def sector(self, v2_db: orm.Session):
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="TESS",
+            description="Transiting Exoplanet Survey Satellite",
+            time_unit="day",
+            time_epoch=2457000.0,
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="btjd",
+        )
+        catalog = MissionCatalog(
+            host_mission=mission, name="TIC", description="TESS Input Catalog"
+        )
+        targets = [Target(catalog=catalog, name=name) for name in range(5)]
+        observation = Observation(
+            instrument=Instrument(name="Camera", properties={}),
+            cadence_reference=np.arange(4, dtype=np.int64),
+        )
+        v2_db.add_all([catalog, observation, *targets])
+        v2_db.flush()
+        return observation, [target.id for target in targets]
+
+    def test_bulk_load_barycentric(self, v2_db: orm.Session, sector):
+        from lightcurvedb.util.barycentric import barycentric_julian_dates
+
+        observation, target_ids = sector
+        mid_times = 2458000.0 + np.arange(4) / 48
+        positions = np.linspace(-1.5e8, 1.5e8, 12).reshape(4, 3)
+        ra = np.linspace(0, 300, 5)
+        dec = np.linspace(-80, 80, 5)
+
+        stored = TargetSpecificTime.bulk_load_barycentric(
+            v2_db,
+            observation.id,
+            target_ids,
+            mid_times,
+            positions,
+            ra,
+            dec,
+            chunksize=2,
+        )
+
+        assert stored == 5
+        expected = barycentric_julian_dates(mid_times, positions, ra, dec)
+        rows = dict(
+            v2_db.query(
+                TargetSpecificTime.target_id,
+                TargetSpecificTime.barycentric_julian_dates,
+            ).filter_by(observation_id=observation.id)
+        )
+        for target_id, bjd in zip(target_ids, expected):
+            np.testing.assert_array_equal(rows[target_id], bjd)
+
+    def test_bulk_load_staged_chunks(self, v2_db: orm.Session, sector):
+        from lightcurvedb.util.barycentric import barycentric_julian_dates
+
+        observation, target_ids = sector
+        mid_times = 2458000.0 + np.arange(4) / 48
+        positions = np.linspace(-1.5e8, 1.5e8, 12).reshape(4, 3)
+        ra = np.linspace(0, 300, 5)
+        dec = np.linspace(-80, 80, 5)
+        args = (observation.id, target_ids, mid_times, positions, ra, dec)
+        TargetSpecificTime.bulk_load_barycentric(
+            v2_db, observation.id, target_ids[:1], *args[2:4], ra[:1], dec[:1]
+        )
+
+        # Three chunks through the staging table, one row already present
+        stored = TargetSpecificTime.bulk_load_barycentric(
+            v2_db, *args, chunksize=2, skip_existing=True
+        )
+
+        assert stored == 4
+        expected = barycentric_julian_dates(mid_times, positions, ra, dec)
+        rows = dict(
+            v2_db.query(
+                TargetSpecificTime.target_id,
+                TargetSpecificTime.barycentric_julian_dates,
+            ).filter_by(observation_id=observation.id)
+        )
+        assert len(rows) == 5
+        for target_id, bjd in zip(target_ids, expected):
+            np.testing.assert_array_equal(rows[target_id], bjd)
+
+    def test_bulk_load_skip_existing(self, v2_db: orm.Session, sector):
+        observation, target_ids = sector
+        args = (
+            observation.id,
+            target_ids[:3],
+            [2458000.0],
+            np.zeros((1, 3)),
+            [0.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0],
+        )
+        TargetSpecificTime.bulk_load_barycentric(v2_db, *args)
+
+        assert (
+            TargetSpecificTime.bulk_load_barycentric(
+                v2_db, *args, skip_existing=True
+            )
+            == 0
+        )
+        # COPY runs on the driver connection, errors are not wrapped
+        with pytest.raises(psycopg.errors.UniqueViolation):
+            TargetSpecificTime.bulk_load_barycentric(v2_db, *args)
+
+
+class TestTargetSpecificTimeCompression:
+    """Test shared-basis compression of target-specific times."""
+
+    @pytest.fixture
+    def loaded(self, v2_db: orm.Session):
+        mission = Mission(
+            id=uuid.uuid4(),
+            name="TESS",
+            description="Transiting Exoplanet Survey Satellite",
+            time_unit="day",
+            time_epoch=2457000.0,
+            time_epoch_scale="tdb",
+            time_epoch_format="jd",
+            time_format_name="btjd",
+        )
+        catalog = MissionCatalog(
+            host_mission=mission, name="TIC", description="TESS Input Catalog"
+        )
+        targets = [Target(catalog=catalog, name=name) for name in range(40)]
+        observation = Observation(
+            instrument=Instrument(name="Camera", properties={}),
+            cadence_reference=np.arange(200, dtype=np.int64),
+        )
+        v2_db.add_all([catalog, observation, *targets])
+        v2_db.flush()
+
+        # A month of a roughly 1 AU barycentric orbit
+        mid_times = 2458000.0 + np.arange(200) / 7
+        phase = 2 * np.pi * (mid_times - 2458000.0) / 365.25
+        positions = 1.496e8 * np.stack(
+            [np.cos(phase), np.sin(phase), 0.4 * np.sin(phase)], axis=-1
+        )
+        rng = np.random.default_rng(0)
+        target_ids = np.array([t.id for t in targets])
+        ra = rng.uniform(0, 360, len(targets))
+        dec = rng.uniform(-90, 90, len(targets))
+        TargetSpecificTime.bulk_load_barycentric(
+            v2_db, observation.id, target_ids, mid_times, positions, ra, dec
+        )
+        _, dates = TargetSpecificTime.load_dates(v2_db, observation.id)
+        return observation, target_ids, dates
+
+    def test_round_trip(self, v2_db: orm.Session, loaded):
+        from lightcurvedb.models import TargetTimeBasis
+
+        observation, target_ids, original = loaded
+
+        compressed = TargetSpecificTime.compress_observation(
+            v2_db, observation.id, chunksize=16
+        )
+        assert compressed == len(target_ids)
+        assert v2_db.get(TargetTimeBasis, observation.id).components.shape == (
+            3,
+            200,
+        )
+
+        ids, dates = TargetSpecificTime.load_dates(v2_db, observation.id)
+        np.testing.assert_array_equal(ids, target_ids)
+        np.testing.assert_allclose(dates, original, rtol=0, atol=1e-9)
+
+        stored = (
+            v2_db.query(TargetSpecificTime)
+            .filter_by(observation_id=observation.id)
+            .all()
+        )
+        for tst in stored:
+            assert tst.barycentric_julian_dates is None
+            assert tst.time_residuals is None
+            assert len(tst.time_coefficients) == 3
+        np.testing.assert_allclose(
+            stored[0].reconstruct_dates(), original[0], rtol=0, atol=1e-9
+        )
+
+    def test_nonconforming_rows_keep_residuals(
+        self, v2_db: orm.Session, loaded
+    ):
+        observation, target_ids, original = loaded
+        TargetSpecificTime.compress_observation(v2_db, observation.id)
+
+        # A late target whose times do not follow the shared geometry
+        catalog_id = v2_db.get(Target, int(target_ids[0])).catalog_id
+        odd = Target(catalog_id=catalog_id, name=1000)
+        v2_db.add(odd)
+        v2_db.flush()
+        jitter = np.random.default_rng(1).normal(0, 1e-4, 200)
+        odd_dates = original[0] + jitter
+        v2_db.add(
+            TargetSpecificTime(
+                observation_id=observation.id,
+                target_id=odd.id,
+                barycentric_julian_dates=odd_dates,
+            )
+        )
+        v2_db.flush()
+
+        assert (
+            TargetSpecificTime.compress_observation(v2_db, observation.id) == 1
+        )
+        stored = v2_db.get(TargetSpecificTime, (observation.id, odd.id))
+        v2_db.refresh(stored)
+        assert stored.time_residuals.dtype == np.float32
+        _, dates = TargetSpecificTime.load_dates(
+            v2_db, observation.id, [odd.id]
+        )
+        np.testing.assert_allclose(dates[0], odd_dates, rtol=0, atol=1e-9)
+
+    def test_requires_some_times(self, v2_db: orm.Session, loaded):
+        observation, target_ids, _ = loaded
+        v2_db.query(TargetSpecificTime).filter_by(
+            target_id=int(target_ids[0])
+        ).delete()
+        v2_db.add(
+            TargetSpecificTime(
+                observation_id=observation.id, target_id=int(target_ids[0])
+            )
+        )
+        with pytest.raises(exc.IntegrityError):
+            v2_db.flush()
@@ -0,0 +1,187 @@
+"""Test vectorized time scale conversion and its per-series cache."""
+
+import uuid
+from decimal import Decimal
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from astropy import time
+from sqlalchemy import orm
+
+from lightcurvedb.io.time_conversion import TargetTimeCache, convert_times
+from lightcurvedb.models import (
+    Instrument,
+    Mission,
+    MissionCatalog,
+    Observation,
+    Target,
+    TargetSpecificTime,
+    TargetTimeBasis,
+)
+
+from .util import QueryCounter
+
+
+def _mission() -> Mission:
+    return Mission(
+        id=uuid.uuid4(),
+        name="CONVERSION_MISSION",
+        description="Mission for time conversion",
+        time_unit="day",
+        time_epoch=Decimal("2457000.0"),
+        time_epoch_scale="tdb",
+        time_epoch_format="jd",
+        time_format_name="conversion_btjd",
+    )
+
+
+def test_convert_bjd_batch_matches_astropy():
+    bjd = 2458000.0 + np.arange(12, dtype=np.float64).reshape(3, 4) / 48
+
+    utc = convert_times(bjd)
+
+    assert utc.shape == bjd.shape
+    expected = time.Time(bjd.ravel(), format="jd", scale="tdb").utc.jd
+    np.testing.assert_array_equal(utc.ravel(), expected)
+
+
+def test_convert_mission_times():
+    mission = _mission()
+    btjd = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+    tdb = convert_times(btjd, mission=mission, scale="tdb")
+    round_trip = convert_times(tdb, format="conversion_btjd", scale="tdb")
+
+    np.testing.assert_allclose(tdb, btjd + 2457000.0)
+    np.testing.assert_allclose(round_trip, btjd, atol=1e-9)
+
+
+class TestTargetTimeCache:
+    @pytest.fixture
+    def series(self, v2_db: orm.Session):
+        """Three target times across two observations of differing length."""
+        catalog = MissionCatalog(
+            host_mission=_mission(), name="TIC", description="Catalog"
+        )
+        instrument = Instrument(name="Camera", properties={})
+        observations = [
+            Observation(
+                instrument=instrument,
+                cadence_reference=np.arange(length, dtype=np.int64),
+            )
+            for length in (4, 2)
+        ]
+        targets = [Target(catalog=catalog, name=name) for name in (1, 2, 3)]
+        v2_db.add_all([catalog, *observations, *targets])
+        v2_db.flush()
+
+        dates = {}
+        pairs = zip((0, 0, 1), targets)
+        for observation, target in ((observations[i], t) for i, t in pairs):
+            length = len(observation.cadence_reference)
+            bjd = 2458000.0 + np.arange(length, dtype=np.float64)
+            v2_db.add(
+                TargetSpecificTime(
+                    observation=observation,
+                    target=target,
+                    barycentric_julian_dates=bjd,
+                )
+            )
+            dates[(observation.id, target.id)] = bjd
+        v2_db.commit()
+        return dates
+
+    def test_converts_and_caches(self, v2_db: orm.Session, series):
+        cache = TargetTimeCache()
+        keys = [*series, (-1, -1)]
+
+        first = cache.get(v2_db, keys)
+        with QueryCounter(v2_db) as counter:
+            second = cache.get(v2_db, series)
+
+        assert counter.count == 0
+        assert set(first) == set(series)
+        for key, bjd in series.items():
+            np.testing.assert_array_equal(first[key], convert_times(bjd))
+            assert second[key] is first[key]
+            assert not first[key].flags.writeable
+            # Cached series own their data instead of viewing a batch
+            assert first[key].base is None
+
+    def test_scale_and_format_are_keyed(self, v2_db: orm.Session, series):
+        cache = TargetTimeCache()
+        key = next(iter(series))
+
+        utc = cache.get(v2_db, [key])[key]
+        mjd = cache.get(v2_db, [key], scale="tt", format="mjd")[key]
+
+        assert len(cache) == 2
+        np.testing.assert_allclose(
+            mjd, convert_times(series[key], scale="tt", format="mjd")
+        )
+        assert not np.allclose(utc, mjd)
+
+    def test_invalidate(self, v2_db: orm.Session, series):
+        cache = TargetTimeCache(maxsize=8)
+        cache.get(v2_db, series)
+        first, *_, last = sorted({key[0] for key in series})
+
+        cache.invalidate(last)
+        assert len(cache) == 2
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_compressed_rows(self, v2_db: orm.Session, series):
+        keys = [key for key in series if len(series[key]) == 4]
+        TargetSpecificTime.compress_observation(v2_db, keys[0][0], rank=1)
+
+        converted = TargetTimeCache().get(v2_db, keys)
+
+        for key in keys:
+            np.testing.assert_allclose(
+                converted[key], convert_times(series[key]), rtol=0, atol=1e-9
+            )
+
+    def test_misses_load_in_one_query(self, v2_db: orm.Session, series):
+        cache = TargetTimeCache()
+
+        with QueryCounter(v2_db) as counter:
+            converted = cache.get(v2_db, series)
+
+        assert len({key[0] for key in series}) == 2
+        assert counter.count == 1
+        assert set(converted) == set(series)
+
+    def test_compressed_misses_load_bases_once(
+        self, v2_db: orm.Session, series
+    ):
+        for observation_id in {key[0] for key in series}:
+            TargetSpecificTime.compress_observation(
+                v2_db, observation_id, rank=1
+            )
+        v2_db.expire_all()
+
+        with QueryCounter(v2_db) as counter:
+            converted = TargetTimeCache().get(v2_db, series)
+
+        # One query for the rows, one for every observation's basis
+        assert counter.count == 2
+        for key, bjd in series.items():
+            np.testing.assert_allclose(
+                converted[key], convert_times(bjd), rtol=0, atol=1e-9
+            )
+
+    def test_compressed_rows_without_basis_raise(
+        self, v2_db: orm.Session, series
+    ):
+        keys = [key for key in series if len(series[key]) == 4]
+        TargetSpecificTime.compress_observation(v2_db, keys[0][0], rank=1)
+        v2_db.execute(
+            sa.delete(TargetTimeBasis).where(
+                TargetTimeBasis.observation_id == keys[0][0]
+            )
+        )
+
+        with pytest.raises(ValueError, match="no time basis"):
+            TargetTimeCache().get(v2_db, keys)
@@ -1,3 +1,5 @@
+import re
+
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -15,3 +17,78 @@ def test_path_context_extraction(prefix, suffix, orbit, cam, ccd):
     assert str(orbit) == context["orbit_number"]
     assert str(cam) == context["camera"]
     assert str(ccd) == context["ccd"]
+
+
+@given(
+    st.text(), st.text(), tess_st.orbits(), tess_st.cameras(), tess_st.ccds()
+)
+def test_compiled_extractor_matches_reference(prefix, suffix, orbit, cam, ccd):
+    template = f"{prefix}/orbit-{orbit}/ffi/cam{cam}/ccd{ccd}/{suffix}"
+    extractor = contexts.PathContextExtractor()
+    context = extractor.extract(template)
+    assert str(orbit) == context["orbit_number"]
+    assert str(cam) == context["camera"]
+    assert str(ccd) == context["ccd"]
+
+
+@given(tess_st.orbits(), tess_st.cameras(), tess_st.ccds(), tess_st.tic_ids())
+def test_compiled_extractor_equivalence(orbit, cam, ccd, tic_id):
+    path = f"/pdo/orbit-{orbit}/ffi/cam{cam}/ccd{ccd}/LC/{tic_id}.h5"
+    extractor = contexts.compiled_extractor()
+    assert extractor.extract(path) == contexts.extract_pdo_path_context(path)
+
+
+def test_compiled_extractor_memoizes_directories():
+    extractor = contexts.PathContextExtractor()
+    paths = [f"/pdo/orbit-9/ffi/cam1/ccd2/LC/{tic}.h5" for tic in range(10)]
+    for path in paths:
+        extractor.extract(path)
+    info = extractor._directory_matches.cache_info()
+    assert info.misses == 1
+    assert info.hits == len(paths) - 1
+
+
+def test_compiled_extractor_keeps_conflicting_patterns_ordered():
+    patterns = [
+        re.compile(r"cam(?P<camera>[1-4])"),
+        re.compile(r"camera-(?P<camera>[0-9]+)"),
+    ]
+    extractor = contexts.PathContextExtractor(patterns)
+    assert len(extractor._segments) == 2
+    context = extractor.extract("/pdo/cam1/camera-12/1.h5")
+    assert context == {"camera": "12"}
+
+
+def test_extract_many_is_columnar():
+    extractor = contexts.PathContextExtractor()
+    result = extractor.extract_many(
+        ["/pdo/sector-3/cam2/ccd1/9.h5", "/pdo/notes.txt"]
+    )
+    assert list(result["sector"]) == ["3", None]
+    assert list(result["tic_id"]) == ["9", None]
+    assert all(len(column) == 2 for column in result.values())
+
+
+def test_anchored_patterns_match_full_path():
+    patterns = [
+        re.compile(r"orbit-(?P<orbit_number>[0-9]+)"),
+        re.compile(r"tic_(?P<tic_id>\d+)$"),
+        re.compile(r"^/(?P<root>[a-z]+)"),
+    ]
+    extractor = contexts.PathContextExtractor(patterns)
+    paths = [
+        "/pdo/orbit-9/tic_123/file.h5",
+        "/pdo/orbit-9/tic_123",
+        "pdo/orbit-9/tic_123/file.h5",
+    ]
+    for path in paths:
+        expected = {}
+        for pattern in patterns:
+            match = pattern.search(path)
+            if match:
+                expected.update(match.groupdict())
+        assert extractor.extract(path) == expected
+
+    path = "/pdo/orbit-9/ffi/cam1/ccd2/tic_123/file.h5"
+    extractor = contexts.compiled_extractor()
+    assert extractor.extract(path) == contexts.extract_pdo_path_context(path)
@@ -6,7 +6,7 @@ from tempfile import TemporaryDirectory
 from typing import Generator
 
 import sqlalchemy as sa
-from sqlalchemy import pool
+from sqlalchemy import event, orm, pool
 
 from lightcurvedb.core.base_model import LCDBModel
 from lightcurvedb.core.connection import LCDB_Session
@@ -18,6 +18,11 @@ def import_lc_prereqs(db, lightcurves):
         db.merge(lc.lightcurve_type)
 
 
+def ensure_directory(path: pathlib.Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def mk_db_config(path: pathlib.Path, **data) -> pathlib.Path:
     config = configparser.ConfigParser()
     config["Credentials"] = data
@@ -86,3 +91,21 @@ def isolated_database() -> Generator[sa.orm.Session, None, None]:
             isolation_level="AUTOCOMMIT"
         ) as conn:
             conn.execute(sa.text(f"DROP DATABASE {db_name}"))
+
+
+class QueryCounter:
+    """Count SQL statements issued through a session's engine."""
+
+    def __init__(self, session: orm.Session):
+        self.engine = session.get_bind()
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._count)